@@ -0,0 +1,572 @@
+"""
+Cluster Cache - Informer-backed in-memory view of pods, nodes, events and deployments
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .k8s_client import get_k8s_client_factory
+
+def _object_key(obj) -> str:
+    """Store key for a Kubernetes object: namespace/name for namespaced objects, name otherwise"""
+    metadata = obj.metadata
+    if metadata.namespace:
+        return f"{metadata.namespace}/{metadata.name}"
+    return metadata.name
+
+def _resource_version(obj) -> Optional[str]:
+    """Extract resourceVersion from a model object or a raw dict (bookmark events)"""
+    if isinstance(obj, dict):
+        return obj.get('metadata', {}).get('resourceVersion')
+    metadata = getattr(obj, 'metadata', None)
+    return getattr(metadata, 'resource_version', None) if metadata else None
+
+def _index_namespace(obj) -> List[str]:
+    return [obj.metadata.namespace] if obj.metadata.namespace else []
+
+def _index_labels(obj) -> List[str]:
+    return [f"{key}={value}" for key, value in (obj.metadata.labels or {}).items()]
+
+def _index_node(obj) -> List[str]:
+    node_name = obj.spec.node_name if obj.spec else None
+    return [node_name] if node_name else []
+
+def _index_involved_object(obj) -> List[str]:
+    involved = obj.involved_object
+    if not involved or not involved.name:
+        return []
+    return [f"{involved.namespace or obj.metadata.namespace}/{involved.name}"]
+
+def _count_pod_phase(obj) -> Optional[str]:
+    return obj.status.phase if obj.status else None
+
+def _count_node_ready(obj) -> str:
+    for condition in (obj.status.conditions if obj.status else None) or []:
+        if condition.type == 'Ready':
+            return 'Ready' if condition.status == 'True' else 'NotReady'
+    return 'Unknown'
+
+def parse_label_selector(selector: str) -> List[tuple]:
+    """
+    Parse an equality/existence label selector into (key, operator, value) requirements
+
+    Supported forms: key=value, key==value, key!=value, key, !key
+    """
+    requirements = []
+
+    for term in (selector or '').split(','):
+        term = term.strip()
+        if not term:
+            continue
+
+        if '!=' in term:
+            key, value = term.split('!=', 1)
+            requirements.append((key.strip(), '!=', value.strip()))
+        elif '==' in term:
+            key, value = term.split('==', 1)
+            requirements.append((key.strip(), '=', value.strip()))
+        elif '=' in term:
+            key, value = term.split('=', 1)
+            requirements.append((key.strip(), '=', value.strip()))
+        elif term.startswith('!'):
+            requirements.append((term[1:].strip(), '!', None))
+        else:
+            requirements.append((term, 'exists', None))
+
+    return requirements
+
+def labels_match(labels: Dict[str, str], requirements: List[tuple]) -> bool:
+    """Check object labels against parsed selector requirements"""
+    labels = labels or {}
+
+    for key, operator, value in requirements:
+        if operator == '=' and labels.get(key) != value:
+            return False
+        if operator == '!=' and labels.get(key) == value:
+            return False
+        if operator == 'exists' and key not in labels:
+            return False
+        if operator == '!' and key in labels:
+            return False
+
+    return True
+
+def parse_field_selector(selector: str) -> List[tuple]:
+    """
+    Parse a field selector into (path, operator, value) requirements
+
+    Supported forms: path=value, path==value, path!=value (e.g. status.phase!=Running)
+    """
+    requirements = []
+
+    for term in (selector or '').split(','):
+        term = term.strip()
+        if not term:
+            continue
+
+        if '!=' in term:
+            path, value = term.split('!=', 1)
+            requirements.append((path.strip(), '!=', value.strip()))
+        elif '==' in term:
+            path, value = term.split('==', 1)
+            requirements.append((path.strip(), '=', value.strip()))
+        elif '=' in term:
+            path, value = term.split('=', 1)
+            requirements.append((path.strip(), '=', value.strip()))
+        else:
+            raise ValueError(f"Invalid field selector term: {term}")
+
+    return requirements
+
+def _field_value(obj, path: str) -> str:
+    """Resolve an API field path (involvedObject.name) on a client model object (involved_object.name)"""
+    value = obj
+    for segment in path.split('.'):
+        if value is None:
+            break
+        value = getattr(value, re.sub(r'(?<!^)(?=[A-Z])', '_', segment).lower(), None)
+
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return '' if value is None else str(value)
+
+def fields_match(obj, requirements: List[tuple]) -> bool:
+    """Check an object against parsed field selector requirements (server-side semantics)"""
+    for path, operator, value in requirements:
+        actual = _field_value(obj, path)
+        if operator == '=' and actual != value:
+            return False
+        if operator == '!=' and actual == value:
+            return False
+
+    return True
+
+class ResourceInformer:
+    """
+    Keeps a local copy of one resource type in sync through list+watch
+
+    Features:
+    - Paginated initial LIST, then a single WATCH stream resumed from the last resourceVersion
+    - Automatic re-list when the server reports the resourceVersion as expired (410 Gone)
+    - Secondary indexes (namespace, labels, node, ...) maintained on every event
+    - Value counters (pod phase, node readiness, ...) adjusted on every event, read in O(1)
+    - List method re-resolved before every LIST/WATCH (resolve_list_func) so a client rebuilt
+      after a credential rotation is picked up
+    - Reported as not synced after max_failures consecutive LIST/WATCH errors, so readers
+      fall back to live API calls instead of serving a frozen snapshot
+    """
+
+    def __init__(self, name: str, list_func: Callable = None, indexers: Dict[str, Callable] = None,
+                 page_size: int = 500, watch_timeout: int = 300, counters: Dict[str, Callable] = None,
+                 resolve_list_func: Callable[[], Callable] = None, max_failures: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.list_func = list_func
+        self.resolve_list_func = resolve_list_func
+        self.indexers = indexers or {}
+        self.counters = counters or {}
+        self.page_size = page_size
+        self.watch_timeout = watch_timeout
+        self.max_failures = max_failures or int(os.getenv('K8S_INFORMER_MAX_FAILURES', '3'))
+
+        self.resource_version: Optional[str] = None
+        self._store: Dict[str, Any] = {}
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {name: defaultdict(set) for name in self.indexers}
+        self._counts: Dict[str, Dict[Optional[str], int]] = {name: defaultdict(int) for name in self.counters}
+        self._lock = threading.RLock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watch = None
+        self._failures = 0
+        self.last_success: Optional[float] = None
+
+    # ===== LIFECYCLE =====
+
+    def start(self) -> None:
+        """Start the list+watch loop in a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"informer-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watch loop"""
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def wait_for_sync(self, timeout: float = None) -> bool:
+        return self._synced.wait(timeout)
+
+    def _current_list_func(self) -> Callable:
+        """The list method of the current API client (bound methods must keep their docstring for watch)"""
+        if self.resolve_list_func is not None:
+            return self.resolve_list_func()
+        return self.list_func
+
+    def _record_success(self) -> None:
+        self._failures = 0
+        self.last_success = time.monotonic()
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.max_failures and self._synced.is_set():
+            self.logger.warning(f"{self.name} informer failed {self._failures} times in a row; "
+                                f"marking it unsynced until the next successful LIST")
+            self._synced.clear()
+            # Re-list on recovery: events missed while failing cannot be trusted to replay
+            self.resource_version = None
+
+    def _run(self) -> None:
+        """List once, then watch from the last resourceVersion until stopped"""
+        from kubernetes.client.rest import ApiException
+
+        backoff = 1.0
+
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._list()
+
+                self._watch_once()
+                self._record_success()
+                backoff = 1.0
+
+            except ApiException as e:
+                if e.status == 410:
+                    # resourceVersion too old - fall back to a fresh LIST
+                    self.logger.info(f"{self.name} informer resourceVersion expired, re-listing")
+                    self.resource_version = None
+                    continue
+
+                self.logger.warning(f"{self.name} informer API error: {e.status} {e.reason}")
+                self._record_failure()
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+            except Exception as e:
+                self.logger.warning(f"{self.name} informer error: {e}")
+                self._record_failure()
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    def _list(self) -> None:
+        """Paginated LIST that replaces the whole store"""
+        store = {}
+        continue_token = None
+        list_func = self._current_list_func()
+
+        while True:
+            kwargs = {'limit': self.page_size}
+            if continue_token:
+                kwargs['_continue'] = continue_token
+
+            result = list_func(**kwargs)
+            for obj in result.items:
+                store[_object_key(obj)] = obj
+
+            continue_token = result.metadata._continue
+            if not continue_token:
+                break
+
+        with self._lock:
+            self._store = store
+            self._indexes = {name: defaultdict(set) for name in self.indexers}
+            self._counts = {name: defaultdict(int) for name in self.counters}
+            for key, obj in store.items():
+                self._index_add(key, obj)
+            self.resource_version = result.metadata.resource_version
+
+        self._record_success()
+        self._synced.set()
+        self.logger.info(f"{self.name} informer synced {len(store)} objects at resourceVersion {self.resource_version}")
+
+    def _watch_once(self) -> None:
+        """Consume one WATCH stream; returns when the server closes it"""
+        from kubernetes import watch
+
+        self._watch = watch.Watch()
+        stream = self._watch.stream(
+            self._current_list_func(),
+            resource_version=self.resource_version,
+            timeout_seconds=self.watch_timeout,
+            allow_watch_bookmarks=True
+        )
+
+        for event in stream:
+            if self._stopped.is_set():
+                break
+
+            event_type = event.get('type')
+            obj = event.get('object')
+            version = _resource_version(obj)
+
+            if event_type in ('ADDED', 'MODIFIED'):
+                self._upsert(obj)
+            elif event_type == 'DELETED':
+                self._delete(obj)
+
+            if version:
+                self.resource_version = version
+
+    # ===== STORE MAINTENANCE =====
+
+    def _index_add(self, key: str, obj) -> None:
+        for index_name, indexer in self.indexers.items():
+            for value in indexer(obj):
+                self._indexes[index_name][value].add(key)
+        for counter_name, counter in self.counters.items():
+            self._counts[counter_name][counter(obj)] += 1
+
+    def _index_remove(self, key: str, obj) -> None:
+        for index_name, indexer in self.indexers.items():
+            index = self._indexes[index_name]
+            for value in indexer(obj):
+                keys = index.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[value]
+        for counter_name, counter in self.counters.items():
+            counts = self._counts[counter_name]
+            value = counter(obj)
+            counts[value] -= 1
+            if counts[value] <= 0:
+                del counts[value]
+
+    def _upsert(self, obj) -> None:
+        key = _object_key(obj)
+        with self._lock:
+            old = self._store.get(key)
+            if old is not None:
+                self._index_remove(key, old)
+            self._store[key] = obj
+            self._index_add(key, obj)
+
+    def _delete(self, obj) -> None:
+        key = _object_key(obj)
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self._index_remove(key, old)
+
+    # ===== READ API =====
+
+    def get(self, key: str):
+        with self._lock:
+            return self._store.get(key)
+
+    def list(self) -> List[Any]:
+        """All cached objects in key order (the order a LIST would return them)"""
+        with self._lock:
+            return [self._store[key] for key in sorted(self._store)]
+
+    def by_index(self, index_name: str, value: str) -> List[Any]:
+        with self._lock:
+            keys = self._indexes[index_name].get(value, ())
+            return [self._store[key] for key in sorted(keys)]
+
+    def select(self, **index_values) -> List[Any]:
+        """Intersect several index lookups, e.g. select(namespace='default', node='n1')"""
+        with self._lock:
+            keys = None
+            for index_name, value in index_values.items():
+                if value is None:
+                    continue
+                matched = self._indexes[index_name].get(value, set())
+                keys = set(matched) if keys is None else keys & matched
+                if not keys:
+                    return []
+
+            if keys is None:
+                keys = self._store
+            return [self._store[key] for key in sorted(keys)]
+
+    def counts(self, counter_name: str) -> Dict[Optional[str], int]:
+        """Objects per counter value, e.g. counts('phase') -> {'Running': 40, 'Pending': 2}"""
+        with self._lock:
+            return dict(self._counts[counter_name])
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+class ClusterCache:
+    """
+    Informer-backed cluster cache shared by the agent and the system monitor
+
+    Features:
+    - One list+watch stream per resource type instead of repeated full LISTs
+    - Namespace, label and node indexes for pods; namespace/involved-object indexes for events
+    - Read API that mirrors the filters the kubectl emulation needs
+    - Pod phase / node readiness counters for cluster status without listing anything
+    """
+
+    RESOURCES = ('pods', 'nodes', 'events', 'deployments')
+
+    def __init__(self, client_factory=None, resources: List[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.client_factory = client_factory or get_k8s_client_factory()
+        self.resources = list(resources or self.RESOURCES)
+        self.informers: Dict[str, ResourceInformer] = {}
+        self._lock = threading.Lock()
+
+    def _list_method(self, api: str, method: str) -> Callable[[], Callable]:
+        """Resolve api.method through the factory on every call so rotated credentials are picked up"""
+        return lambda: getattr(getattr(self.client_factory, api), method)
+
+    def _build_informer(self, resource: str) -> ResourceInformer:
+        if resource == 'pods':
+            return ResourceInformer('pods', indexers={
+                'namespace': _index_namespace,
+                'labels': _index_labels,
+                'node': _index_node
+            }, counters={'phase': _count_pod_phase},
+                resolve_list_func=self._list_method('core_v1', 'list_pod_for_all_namespaces'))
+        if resource == 'nodes':
+            return ResourceInformer('nodes', indexers={'labels': _index_labels},
+                                    counters={'ready': _count_node_ready},
+                                    resolve_list_func=self._list_method('core_v1', 'list_node'))
+        if resource == 'events':
+            return ResourceInformer('events', indexers={
+                'namespace': _index_namespace,
+                'involved_object': _index_involved_object
+            }, resolve_list_func=self._list_method('core_v1', 'list_event_for_all_namespaces'))
+        if resource == 'deployments':
+            return ResourceInformer('deployments', indexers={
+                'namespace': _index_namespace,
+                'labels': _index_labels
+            }, resolve_list_func=self._list_method('apps_v1', 'list_deployment_for_all_namespaces'))
+
+        raise ValueError(f"Unsupported cached resource: {resource}")
+
+    def start(self) -> None:
+        """Start informers for all configured resources"""
+        with self._lock:
+            for resource in self.resources:
+                if resource not in self.informers:
+                    self.informers[resource] = self._build_informer(resource)
+                self.informers[resource].start()
+
+    def stop(self) -> None:
+        with self._lock:
+            for informer in self.informers.values():
+                informer.stop()
+
+    def is_synced(self, resource: str) -> bool:
+        informer = self.informers.get(resource)
+        return informer is not None and informer.has_synced()
+
+    def wait_for_sync(self, timeout: float = 10.0) -> bool:
+        """Wait until every informer has completed its initial LIST"""
+        deadline = time.monotonic() + timeout
+        for informer in list(self.informers.values()):
+            if not informer.wait_for_sync(max(0.0, deadline - time.monotonic())):
+                return False
+        return True
+
+    def _select(self, resource: str, label_selector: str = None, field_selector: str = None,
+                **index_values) -> List[Any]:
+        informer = self.informers[resource]
+        requirements = parse_label_selector(label_selector)
+        field_requirements = parse_field_selector(field_selector)
+
+        # Equality requirements can be answered from the label index directly
+        equality = [f"{key}={value}" for key, operator, value in requirements if operator == '=']
+        if equality and 'labels' in informer.indexers:
+            index_values['labels'] = equality[0]
+
+        # ...and so can namespace/node equality field requirements
+        for path, operator, value in field_requirements:
+            if operator != '=':
+                continue
+            if path == 'metadata.namespace' and 'namespace' in informer.indexers and not index_values.get('namespace'):
+                index_values['namespace'] = value
+            elif path == 'spec.nodeName' and 'node' in informer.indexers and not index_values.get('node'):
+                index_values['node'] = value
+
+        objects = informer.select(**index_values)
+
+        if requirements:
+            objects = [obj for obj in objects if labels_match(obj.metadata.labels, requirements)]
+        if field_requirements:
+            objects = [obj for obj in objects if fields_match(obj, field_requirements)]
+
+        return objects
+
+    def status_counts(self) -> Optional[Dict[str, int]]:
+        """Node and pod totals by readiness/phase, or None until both informers have synced"""
+        if not (self.is_synced('pods') and self.is_synced('nodes')):
+            return None
+
+        nodes = self.informers['nodes'].counts('ready')
+        phases = self.informers['pods'].counts('phase')
+        return {
+            'nodes_count': sum(nodes.values()),
+            'nodes_ready': nodes.get('Ready', 0),
+            'pods_count': sum(phases.values()),
+            'running_pods': phases.get('Running', 0),
+            'pending_pods': phases.get('Pending', 0),
+            'failed_pods': phases.get('Failed', 0) + phases.get('Error', 0),
+            'succeeded_pods': phases.get('Succeeded', 0)
+        }
+
+    def list_pods(self, namespace: str = None, label_selector: str = None, node_name: str = None,
+                  field_selector: str = None) -> List[Any]:
+        return self._select('pods', label_selector, field_selector, namespace=namespace, node=node_name)
+
+    def get_pod(self, namespace: str, name: str):
+        return self.informers['pods'].get(f"{namespace}/{name}")
+
+    def list_nodes(self, label_selector: str = None, field_selector: str = None) -> List[Any]:
+        return self._select('nodes', label_selector, field_selector)
+
+    def get_node(self, name: str):
+        return self.informers['nodes'].get(name)
+
+    def list_events(self, namespace: str = None, involved_object: str = None, label_selector: str = None,
+                    field_selector: str = None) -> List[Any]:
+        """List events, optionally for one namespace or one involved object ("namespace/name")"""
+        return self._select('events', label_selector, field_selector,
+                            namespace=namespace, involved_object=involved_object)
+
+    def list_deployments(self, namespace: str = None, label_selector: str = None,
+                         field_selector: str = None) -> List[Any]:
+        return self._select('deployments', label_selector, field_selector, namespace=namespace)
+
+_cache: Optional[ClusterCache] = None
+_cache_lock = threading.Lock()
+
+def get_cluster_cache(start: bool = True) -> Optional[ClusterCache]:
+    """
+    Get the process-wide cluster cache, starting its informers on first use
+
+    Returns None when the cache is disabled (K8S_INFORMER_CACHE=0) or Kubernetes is not configured.
+    """
+    global _cache
+
+    if os.getenv('K8S_INFORMER_CACHE', '1').lower() in ('0', 'false', 'no'):
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                factory = get_k8s_client_factory()
+                if not factory.is_available():
+                    return None
+                _cache = ClusterCache(factory)
+
+    if start:
+        _cache.start()
+
+    return _cache
@@ -0,0 +1,271 @@
+"""
+Context Builder - Token-budgeted, relevance-ranked context for expert LLM prompts
+"""
+
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+# Rough average for English/JSON text with llama-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Query words that make otherwise omitted status sections relevant
+PROCESS_KEYWORDS = ('process', 'cpu', 'load', 'slow', 'hang', 'memory', 'ram', 'oom', 'top')
+NETWORK_KEYWORDS = ('network', 'interface', 'nic', 'packet', 'connect', 'dns', 'latency', 'eth', 'traffic')
+DISK_KEYWORDS = ('disk', 'space', 'storage', 'filesystem', 'mount', 'volume', 'df', 'inode')
+SERVICE_KEYWORDS = ('service', 'systemd', 'systemctl', 'daemon', 'kubelet', 'docker', 'containerd', 'glusterd')
+
+# detected_systems value -> expert_patterns.yaml category
+SYSTEM_CATEGORIES = {
+    'ubuntu_os': 'Ubuntu OS',
+    'kubernetes': 'Kubernetes',
+    'glusterfs': 'GlusterFS'
+}
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token); no tokenizer dependency"""
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+def _prune(value: Any) -> Any:
+    """Recursively drop None, empty strings and empty containers"""
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, '', [], {})}
+    if isinstance(value, (list, tuple)):
+        pruned = [_prune(item) for item in value]
+        return [item for item in pruned if item not in (None, '', [], {})]
+    if isinstance(value, float):
+        return round(value, 1)
+    return value
+
+def compact_json(value: Any) -> str:
+    """Whitespace-free JSON with empty values removed"""
+    return json.dumps(_prune(value), separators=(',', ':'), default=str)
+
+class PromptContextBuilder:
+    """
+    Builds the pattern/history/status/safety sections of the expert prompt within a token budget
+
+    Features:
+    - Compact JSON serialization (no indentation, empty values dropped, floats rounded)
+    - Retrieved knowledge passages, or expert pattern summaries ranked by keyword overlap with the query
+    - Only the metrics that matter: headline resources, full/root mounts, inactive services,
+      Kubernetes summary; processes and NICs only when the query asks about them
+    - Greedy truncation to a configurable token budget (PROMPT_CONTEXT_TOKENS)
+    - Per-section token accounting for logging
+    """
+
+    def __init__(self, expert_patterns: Dict[str, Any] = None, max_tokens: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.patterns = (expert_patterns or {}).get('patterns', {}) or {}
+        self.max_tokens = max_tokens or int(os.getenv('PROMPT_CONTEXT_TOKENS', '1500'))
+
+    # Patterns
+
+    def patterns_for_systems(self, systems: List[str]) -> List[Dict[str, Any]]:
+        """Expert patterns whose category belongs to one of the detected systems"""
+        categories = {SYSTEM_CATEGORIES.get(system, system) for system in systems}
+        return [
+            dict(pattern, key=key) for key, pattern in self.patterns.items()
+            if pattern.get('category') in categories
+        ]
+
+    @staticmethod
+    def _pattern_score(pattern: Dict[str, Any], query_lower: str, issue_keys: set) -> float:
+        score = sum(1.0 for keyword in pattern.get('keywords', []) if keyword.lower() in query_lower)
+        for regex in pattern.get('regex_patterns', []):
+            try:
+                if re.search(regex, query_lower, re.IGNORECASE):
+                    score += 2.0
+            except re.error:
+                continue
+        if pattern.get('key') in issue_keys:
+            score += 3.0
+        return score + pattern.get('confidence_base', 0)
+
+    @staticmethod
+    def summarize_pattern(pattern: Dict[str, Any]) -> Dict[str, Any]:
+        """Name, description, top symptoms and remediation commands of one pattern"""
+        return {
+            'id': pattern.get('key'),
+            'name': pattern.get('name'),
+            'severity': pattern.get('severity'),
+            'description': pattern.get('description'),
+            'symptoms': pattern.get('symptoms', [])[:3],
+            'steps': [
+                f"{step.get('command')} [{step.get('safety_level', 'MEDIUM')}]"
+                for step in pattern.get('remediation_steps', []) if step.get('command')
+            ]
+        }
+
+    def _knowledge_items(self, query: str, analysis: Dict[str, Any], context: Dict[str, Any]) -> List[str]:
+        passages = context.get('retrieved_passages') or []
+        if passages:
+            # Already ranked by the retrieval index
+            return [f"[{passage.get('pattern')}/{passage.get('kind')}] {passage.get('text')}" for passage in passages]
+
+        candidates = []
+        for entry in context.get('available_patterns', []):
+            # Older callers pass {'system': ..., 'patterns': {...}} groups
+            if isinstance(entry, dict) and isinstance(entry.get('patterns'), dict):
+                candidates.extend(dict(pattern, key=key) for key, pattern in entry['patterns'].items()
+                                  if isinstance(pattern, dict))
+            elif isinstance(entry, dict):
+                candidates.append(entry)
+
+        query_lower = query.lower()
+        issue_keys = {issue.get('pattern') for issue in analysis.get('potential_issues', [])}
+        scored = [(self._pattern_score(pattern, query_lower, issue_keys), pattern) for pattern in candidates]
+        # Patterns with no keyword/regex hit carry only their base confidence
+        scored = [(score, pattern) for score, pattern in scored if score >= 1.0 or len(scored) <= 3]
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        return [compact_json(self.summarize_pattern(pattern)) for _, pattern in scored]
+
+    # History and safety
+
+    @staticmethod
+    def summarize_history(history: Dict[str, Any]) -> Dict[str, Any]:
+        """Occurrence count, success rate and the most common root causes of one issue"""
+        occurrences = history.get('occurrences', []) or []
+        successes = sum(1 for occurrence in occurrences if occurrence.get('success'))
+        causes = Counter(occurrence.get('root_cause') for occurrence in occurrences if occurrence.get('root_cause'))
+        last = occurrences[-1] if occurrences else {}
+
+        return {
+            'count': len(occurrences),
+            'success_rate': round(successes / len(occurrences), 2) if occurrences else None,
+            'last_seen': last.get('timestamp'),
+            'last_resolution': last.get('resolution_method'),
+            'root_causes': [cause for cause, _ in causes.most_common(2)]
+        }
+
+    def _history_items(self, context: Dict[str, Any]) -> List[str]:
+        historical = context.get('historical_patterns', {}) or {}
+        ranked = sorted(historical.items(), key=lambda item: len(item[1].get('occurrences', []) or []), reverse=True)
+        return [compact_json({issue_key: self.summarize_history(history)}) for issue_key, history in ranked]
+
+    @staticmethod
+    def _safety_items(context: Dict[str, Any]) -> List[str]:
+        guidelines = context.get('safety_guidelines', {}) or {}
+        return [compact_json({key: guidelines.get(key) for key in ('description', 'recommendations')})]
+
+    # System status
+
+    def select_status(self, query: str, analysis: Dict[str, Any], status: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """(label, value) pairs of the status fields relevant to this query, most relevant first"""
+        query_lower = query.lower()
+        systems = analysis.get('detected_systems', [])
+        selected = []
+
+        resources = status.get('resource_usage', {}) or {}
+        headline = {key: resources.get(key) for key in ('cpu_percent', 'memory_percent', 'memory_available_gb', 'swap_percent')
+                    if resources.get(key) is not None}
+        if headline:
+            selected.append(('resources', headline))
+
+        disk = status.get('disk_usage', {}) or {}
+        wants_disk = any(word in query_lower for word in DISK_KEYWORDS)
+        mounts = {
+            mount: f"{info.get('percent')}% of {info.get('total_gb')}GB"
+            for mount, info in disk.items()
+            if isinstance(info, dict) and info.get('fstype') != 'squashfs'
+            and (wants_disk or mount == '/' or (info.get('percent') or 0) >= 80)
+        }
+        if mounts:
+            selected.append(('disk', mounts))
+
+        services = status.get('services_status', {}) or {}
+        wants_services = any(word in query_lower for word in SERVICE_KEYWORDS)
+        service_states = {
+            name: info.get('status') if isinstance(info, dict) else info
+            for name, info in services.items()
+            if wants_services or not (isinstance(info, dict) and info.get('active'))
+        }
+        if service_states:
+            selected.append(('services', service_states))
+
+        kubernetes = status.get('kubernetes_status', {}) or {}
+        if kubernetes and ('kubernetes' in systems or analysis.get('intent') != 'informational'
+                           or kubernetes.get('failed_pods') or kubernetes.get('pending_pods')):
+            selected.append(('kubernetes', {key: value for key, value in kubernetes.items()
+                                            if not isinstance(value, (dict, list))}))
+
+        processes = status.get('process_info', {}) or {}
+        if processes and any(word in query_lower for word in PROCESS_KEYWORDS):
+            top = processes.get('top_cpu_processes', [])[:5]
+            selected.append(('top_processes', [
+                f"{proc.get('name')}({proc.get('pid')}) cpu={proc.get('cpu_percent')} mem={round(proc.get('memory_percent') or 0, 1)}"
+                for proc in top
+            ]))
+
+        network = status.get('network_status', {}) or {}
+        if network and any(word in query_lower for word in NETWORK_KEYWORDS):
+            selected.append(('network_errors', {
+                nic: counters.get('errors_in', 0) + counters.get('errors_out', 0)
+                for nic, counters in network.items() if isinstance(counters, dict)
+            }))
+
+        return selected
+
+    def _status_items(self, query: str, analysis: Dict[str, Any], context: Dict[str, Any]) -> List[str]:
+        status = context.get('current_system_status', {}) or {}
+        items = [compact_json({label: value}) for label, value in self.select_status(query, analysis, status)]
+        return [item for item in items if item != '{}']
+
+    # Assembly
+
+    def build(self, query: str, analysis: Dict[str, Any], context: Dict[str, Any],
+              max_tokens: int = None) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Return ({section: text}, stats) with every section filled greedily, most relevant items first
+
+        Safety guidelines are filled first so they are never crowded out, then the other sections
+        in priority order (status, patterns, history); an item that does not fit the remaining
+        budget is skipped so smaller, later items can still be included. The "(+N more omitted)"
+        note of a truncated section is charged against the budget like any other item.
+        """
+        budget = max_tokens or self.max_tokens
+        sections = [
+            ('safety_guidelines', self._safety_items(context)),
+            ('current_system_status', self._status_items(query, analysis, context)),
+            ('expert_knowledge', self._knowledge_items(query, analysis, context)),
+            ('historical_patterns', self._history_items(context))
+        ]
+
+        remaining = budget
+        filled: Dict[str, str] = {}
+        stats: Dict[str, Any] = {'budget': budget, 'sections': {}, 'dropped': 0}
+
+        for name, items in sections:
+            costs = [estimate_tokens(item) + 1 for item in items]
+            # A truncated section needs room for its note; the note for all items is an upper bound
+            reserve = 0 if sum(costs) <= remaining else estimate_tokens(f"(+{len(items)} more omitted)") + 1
+
+            kept = []
+            for item, cost in zip(items, costs):
+                if cost <= remaining - reserve:
+                    kept.append(item)
+                    remaining -= cost
+                else:
+                    stats['dropped'] += 1
+
+            omitted = len(items) - len(kept)
+            note = f"(+{omitted} more omitted)"
+            if omitted and estimate_tokens(note) + 1 <= remaining:
+                kept.append(note)
+                remaining -= estimate_tokens(note) + 1
+            filled[name] = '\n'.join(kept) if kept else 'None'
+
+        # Keep the prompt's section order independent of the fill order
+        built = {name: filled[name] for name in
+                 ('current_system_status', 'expert_knowledge', 'historical_patterns', 'safety_guidelines')}
+        for name, text in built.items():
+            stats['sections'][name] = estimate_tokens(text)
+
+        stats['context_tokens'] = sum(stats['sections'].values())
+        return built, stats
@@ -2,11 +2,17 @@
 Enhanced RAG Agent - Expert query processing and intelligent action detection
 """
 
+import asyncio
 import logging
 import json
 import re
 import os
-from typing import Dict, List, Any, Optional, Tuple
+import time
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timezone, timedelta
 import yaml
 import ollama
@@ -14,6 +20,15 @@ import ollama
 from .expert_remediation_engine import ExpertRemediationEngine
 from .issue_history_manager import IssueHistoryManager
 from .utils import SafetyValidator, SystemMonitor
+from .k8s_client import get_k8s_client_factory
+from .cluster_cache import get_cluster_cache
+from .log_fetcher import ConcurrentLogFetcher, LogMatch, LogSearchResult
+from .log_cursor_store import LogCursorStore
+from .log_scanner import get_log_scanner
+from .json_stream import IncrementalJSONObjectParser
+from .response_cache import ResponseCache, cluster_fingerprint
+from .context_builder import PromptContextBuilder, estimate_tokens
+from .retrieval_index import RetrievalIndex
 
 class EnhancedRAGAgent:
     """
@@ -37,12 +52,39 @@ class EnhancedRAGAgent:
         
         # Initialize components
         self.remediation_engine = ExpertRemediationEngine(patterns_file)
-        self.history_manager = IssueHistoryManager()
+        self.history_manager = IssueHistoryManager.shared()
         self.safety_validator = SafetyValidator()
         self.system_monitor = SystemMonitor()
+        self.k8s_clients = get_k8s_client_factory()
+        self.log_fetcher = ConcurrentLogFetcher()
+        self.log_cursors = LogCursorStore()
+        self.log_scanner = get_log_scanner(patterns_file)
+        self.list_page_size = int(os.getenv('K8S_LIST_PAGE_SIZE', '500'))
+        # Per-request timeout on blocking API calls, so a timed-out stage's worker thread also stops
+        self.k8s_request_timeout = float(os.getenv('K8S_REQUEST_TIMEOUT', '10'))
+        self.response_cache = ResponseCache()
+        
+        # Per-stage timeouts (seconds) for expert_query_async
+        self.async_stage_timeouts = {
+            'system_status': float(os.getenv('EXPERT_QUERY_STATUS_TIMEOUT', '5')),
+            'history': float(os.getenv('EXPERT_QUERY_HISTORY_TIMEOUT', '3')),
+            'kubectl': float(os.getenv('EXPERT_QUERY_KUBECTL_TIMEOUT', '30')),
+            'llm': float(os.getenv('EXPERT_QUERY_LLM_TIMEOUT', '180')),
+            'fallback': float(os.getenv('EXPERT_QUERY_FALLBACK_TIMEOUT', '30'))
+        }
+        # Agent-owned pool so abandoned (timed out) stages never hold up asyncio.run() shutdown
+        self._stage_workers = int(os.getenv('EXPERT_QUERY_WORKERS', '8'))
+        self._stage_executor = ThreadPoolExecutor(max_workers=self._stage_workers, thread_name_prefix='expert-query')
+        # Timed-out stages whose worker thread is still running (they occupy a pool slot until they return)
+        self._abandoned_stages = 0
+        self._abandoned_lock = threading.Lock()
+        self.stage_stats = {'timeouts': 0, 'abandoned_completed': 0}
         
         # Load expert patterns for context
         self.expert_patterns = self._load_expert_patterns(patterns_file)
+        self.context_builder = PromptContextBuilder(self.expert_patterns)
+        self.retrieval_index = RetrievalIndex(patterns_file, self.history_manager.storage.source_path)
+        self.retrieval_top_k = int(os.getenv('RETRIEVAL_TOP_K', '6'))
         
         # Initialize conversation context
         self.conversation_context = {
@@ -128,6 +170,171 @@ class EnhancedRAGAgent:
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
 
+    async def expert_query_async(self, user_query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Asynchronous variant of expert_query for UIs and API front-ends serving several users
+        
+        System status, trending issues and historical pattern lookups are gathered
+        concurrently in worker threads, and the LLM is called through the async Ollama
+        client. Every stage has its own timeout; a stage that times out falls back to
+        the last known value instead of failing the query.
+        
+        Args:
+            user_query: The user's natural language query
+            context: Additional context information
+            
+        Returns:
+            Comprehensive response with actions, recommendations, and context
+        """
+        try:
+            timeouts = self.async_stage_timeouts
+            
+            # Query analysis is pure CPU work on in-memory patterns and decides which stages are needed
+            query_analysis = self._analyze_query(user_query)
+            
+            if query_analysis.get('kubectl_command'):
+                response = await self._kubectl_stage_async(query_analysis['kubectl_command'], user_query)
+            else:
+                historical_patterns = await self._gather_context_async(query_analysis)
+                
+                expert_context = self._prepare_expert_context(query_analysis, context, historical_patterns, user_query)
+                prompt = self._create_expert_prompt(user_query, query_analysis, expert_context)
+                
+                try:
+                    llm_response = await asyncio.wait_for(
+                        self._query_llm_async(prompt, self._response_cache_key(user_query, query_analysis, context)),
+                        timeouts['llm'])
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"LLM stage exceeded {timeouts['llm']}s, using rule-based response")
+                    llm_response = await self._fallback_response_async(prompt)
+                
+                response = self._process_llm_response(llm_response, query_analysis)
+                response.update(self._generate_system_recommendations(query_analysis))
+            
+            self._update_conversation_history(user_query, response)
+            
+            return response
+            
+        except Exception as e:
+            self.logger.error(f"Error processing async query: {e}")
+            return {
+                'response': "I apologize, but I encountered an error processing your query. Please try rephrasing your question.",
+                'error': str(e),
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
+
+    def expert_query_stream(self, user_query: str, context: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of expert_query that yields events while the LLM generates
+        
+        Events:
+            {'type': 'token', 'text': str, 'field': str|None, 'partial': str|None}
+                every streamed chunk, with the top-level field currently being written
+            {'type': 'field', 'key': str, 'value': Any}
+                a top-level JSON field (analysis, recommendations, ...) has completed
+            {'type': 'done', 'response': dict}
+                the final response, identical in shape to expert_query()
+        """
+        try:
+            query_analysis = self._analyze_query(user_query)
+            
+            if query_analysis.get('kubectl_command'):
+                response = asyncio.run(self._kubectl_stage_async(query_analysis['kubectl_command'], user_query))
+                self._update_conversation_history(user_query, response)
+                yield {'type': 'done', 'response': response}
+                return
+            
+            # Same concurrent, per-stage-timeout context gathering as expert_query_async
+            historical_patterns = asyncio.run(self._gather_context_async(query_analysis))
+            expert_context = self._prepare_expert_context(query_analysis, context, historical_patterns, user_query)
+            prompt = self._create_expert_prompt(user_query, query_analysis, expert_context)
+            
+            parser = IncrementalJSONObjectParser()
+            chunks = []
+            
+            for chunk in self._query_llm_stream(prompt, self._response_cache_key(user_query, query_analysis, context)):
+                chunks.append(chunk)
+                for key, value in parser.feed(chunk):
+                    yield {'type': 'field', 'key': key, 'value': value}
+                
+                field, partial = parser.partial_value()
+                yield {'type': 'token', 'text': chunk, 'field': field, 'partial': partial}
+            
+            response = self._process_llm_response(''.join(chunks), query_analysis)
+            response.update(self._generate_system_recommendations(query_analysis))
+            
+            self._update_conversation_history(user_query, response)
+            yield {'type': 'done', 'response': response}
+            
+        except Exception as e:
+            self.logger.error(f"Error processing streaming query: {e}")
+            yield {'type': 'done', 'response': {
+                'response': "I apologize, but I encountered an error processing your query. Please try rephrasing your question.",
+                'error': str(e),
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }}
+
+    async def _gather_context_async(self, query_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Refresh system status and trending issues concurrently and return the historical patterns"""
+        system_status, active_issues, historical_patterns = await asyncio.gather(
+            self._run_stage('system_status', self.system_monitor.get_comprehensive_status,
+                            default=self.conversation_context['system_status']),
+            self._run_stage('history', self.history_manager.get_trending_issues, 7,
+                            default=self.conversation_context['active_issues']),
+            self._run_stage('history', self._lookup_historical_patterns, query_analysis, default={})
+        )
+        
+        self.conversation_context['system_status'] = system_status
+        self.conversation_context['active_issues'] = active_issues
+        
+        return historical_patterns
+
+    async def _kubectl_stage_async(self, kubectl_command: str, user_query: str) -> Dict[str, Any]:
+        """Run a kubectl query in a worker thread under the 'kubectl' stage timeout"""
+        response = await self._run_stage('kubectl', self._handle_kubectl_query, kubectl_command, user_query)
+        if response is None:
+            response = {
+                'response': f"❌ kubectl command did not complete within {self.async_stage_timeouts['kubectl']:.0f}s",
+                'confidence_level': 'low',
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
+        return response
+
+    async def _run_stage(self, stage: str, func, *args, default: Any = None) -> Any:
+        """Run a blocking stage in a worker thread, returning default on timeout or error"""
+        timeout = self.async_stage_timeouts[stage]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        future = self._stage_executor.submit(partial(func, *args))
+        
+        try:
+            # Cancelling the wrapper on timeout also cancels the work if it has not started yet
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.stage_stats['timeouts'] += 1
+            if not future.done():
+                self._abandon_stage(future)
+            self.logger.warning(f"Stage '{stage}' ({getattr(func, '__name__', func)}) exceeded {timeout}s, using fallback "
+                                f"({self._abandoned_stages}/{self._stage_workers} workers held by abandoned stages)")
+        except Exception as e:
+            self.logger.error(f"Stage '{stage}' ({getattr(func, '__name__', func)}) failed: {e}")
+        finally:
+            self.logger.debug(f"Stage '{stage}' took {loop.time() - start:.2f}s")
+        
+        return default
+
+    def _abandon_stage(self, future) -> None:
+        """Count a timed-out stage whose thread is still running until it returns"""
+        with self._abandoned_lock:
+            self._abandoned_stages += 1
+        
+        def finished(_):
+            with self._abandoned_lock:
+                self._abandoned_stages -= 1
+                self.stage_stats['abandoned_completed'] += 1
+        
+        future.add_done_callback(finished)
+
     def detect_actions(self, query: str) -> List[Dict[str, Any]]:
         """Analyze user query for intent and actionable items"""
         analysis = self._analyze_query(query)
@@ -253,18 +460,16 @@ class EnhancedRAGAgent:
             if any(keyword in query_lower for keyword in ['gluster', 'storage', 'volume', 'filesystem']):
                 analysis['detected_systems'].append('glusterfs')
             
-            # Detect potential issues from patterns
-            for category, patterns in self.expert_patterns.items():
-                if isinstance(patterns, dict) and 'patterns' in patterns:
-                    for pattern_name, pattern_data in patterns['patterns'].items():
-                        keywords = pattern_data.get('detection', {}).get('keywords', [])
-                        
-                        if any(keyword.lower() in query_lower for keyword in keywords):
-                            analysis['potential_issues'].append({
-                                'category': category,
-                                'pattern': pattern_name,
-                                'confidence': 0.7
-                            })
+            # Detect potential issues from the expert pattern keywords (whole words only, so "du" does not hit "during")
+            for pattern_name, pattern_data in self.expert_patterns.get('patterns', {}).items():
+                keywords = pattern_data.get('keywords', [])
+                
+                if any(re.search(rf"(?<!\w){re.escape(keyword.lower())}(?!\w)", query_lower) for keyword in keywords):
+                    analysis['potential_issues'].append({
+                        'category': pattern_data.get('category', 'unknown'),
+                        'pattern': pattern_name,
+                        'confidence': 0.7
+                    })
             
             # Determine urgency
             urgent_keywords = ['critical', 'urgent', 'emergency', 'down', 'failed', 'crashed']
@@ -307,13 +512,13 @@ class EnhancedRAGAgent:
                 return self._handle_kubectl_query(analysis['kubectl_command'], query)
             
             # Prepare context for LLM
-            expert_context = self._prepare_expert_context(analysis, context)
+            expert_context = self._prepare_expert_context(analysis, context, query=query)
             
             # Create expert prompt
             prompt = self._create_expert_prompt(query, analysis, expert_context)
             
-            # Generate response using Ollama
-            llm_response = self._query_llm(prompt)
+            # Generate response using Ollama (repeated questions about an unchanged cluster hit the cache)
+            llm_response = self._query_llm(prompt, self._response_cache_key(query, analysis, context))
             
             # Process LLM response for actions
             processed_response = self._process_llm_response(llm_response, analysis)
@@ -330,30 +535,44 @@ class EnhancedRAGAgent:
                 'error': str(e)
             }
 
-    def _prepare_expert_context(self, analysis: Dict[str, Any], context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Prepare expert context for LLM query"""
+    def _lookup_historical_patterns(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Look up issue history for every potential issue detected in the query"""
+        historical_patterns = {}
+        
+        for issue_info in analysis['potential_issues']:
+            issue_key = issue_info['pattern']
+            summary = self.history_manager.get_pattern_summary(issue_key)
+            if summary['has_history']:
+                historical_patterns[issue_key] = summary['history']
+        
+        return historical_patterns
+
+    def _prepare_expert_context(self, analysis: Dict[str, Any], context: Dict[str, Any] = None,
+                                historical_patterns: Dict[str, Any] = None, query: str = None) -> Dict[str, Any]:
+        """Prepare expert context for LLM query (historical_patterns may be looked up ahead of time)"""
         expert_context = {
             'current_system_status': self.conversation_context['system_status'],
             'historical_patterns': {},
             'safety_guidelines': self.safety_validator.get_safety_guidelines(),
-            'available_patterns': []
+            'available_patterns': [],
+            'retrieved_passages': []
         }
         
         try:
-            # Add relevant expert patterns
-            for system in analysis['detected_systems']:
-                if system in self.expert_patterns:
-                    expert_context['available_patterns'].append({
-                        'system': system,
-                        'patterns': self.expert_patterns[system]
-                    })
+            # Retrieve the top-k pattern/resolution passages for the query
+            if query:
+                expert_context['retrieved_passages'] = [
+                    hit.to_dict() for hit in self.retrieval_index.search(query, self.retrieval_top_k)
+                ]
+            
+            # Whole-pattern summaries by system are only used when retrieval finds nothing
+            if not expert_context['retrieved_passages']:
+                expert_context['available_patterns'] = self.context_builder.patterns_for_systems(analysis['detected_systems'])
             
             # Add historical context for potential issues
-            for issue_info in analysis['potential_issues']:
-                issue_key = f"{issue_info['category']}_{issue_info['pattern']}"
-                if self.history_manager.has_similar_issue(issue_key):
-                    expert_context['historical_patterns'][issue_key] = \
-                        self.history_manager.get_pattern_history(issue_key)
+            if historical_patterns is None:
+                historical_patterns = self._lookup_historical_patterns(analysis)
+            expert_context['historical_patterns'] = historical_patterns
             
             # Add current context if provided
             if context:
@@ -367,6 +586,8 @@ class EnhancedRAGAgent:
 
     def _create_expert_prompt(self, query: str, analysis: Dict[str, Any], context: Dict[str, Any]) -> str:
         """Create expert-level prompt for LLM"""
+        sections, stats = self.context_builder.build(query, analysis, context)
+        
         prompt = f"""You are an expert system administrator with deep knowledge of Ubuntu OS, Kubernetes, and GlusterFS systems.
 
 QUERY ANALYSIS:
@@ -376,17 +597,17 @@ QUERY ANALYSIS:
 - Urgency Level: {analysis['urgency_level']}
 - Potential Issues: {len(analysis['potential_issues'])} detected
 
-AVAILABLE EXPERT PATTERNS:
-{json.dumps(context.get('available_patterns', []), indent=2)}
+RELEVANT EXPERT KNOWLEDGE:
+{sections['expert_knowledge']}
 
 HISTORICAL CONTEXT:
-{json.dumps(context.get('historical_patterns', {}), indent=2)}
+{sections['historical_patterns']}
 
 CURRENT SYSTEM STATUS:
-{json.dumps(context.get('current_system_status', {}), indent=2)}
+{sections['current_system_status']}
 
 SAFETY GUIDELINES:
-{json.dumps(context.get('safety_guidelines', {}), indent=2)}
+{sections['safety_guidelines']}
 
 Please provide a comprehensive expert response that includes:
 
@@ -409,41 +630,150 @@ Format your response as JSON with the following structure:
 
 Focus on being practical, safe, and leveraging the historical patterns and expert knowledge available."""
 
+        self.logger.info(f"Expert prompt: ~{estimate_tokens(prompt)} tokens "
+                         f"(context {stats['context_tokens']}/{stats['budget']}, {stats['dropped']} items dropped)")
+        
         return prompt
 
-    def _query_llm(self, prompt: str) -> str:
+    def _llm_request(self, prompt: str) -> Dict[str, Any]:
+        """Build the chat request shared by the sync, async and streaming LLM paths"""
+        return {
+            'model': self.model_name,
+            'messages': [
+                {
+                    'role': 'system',
+                    'content': 'You are an expert system administrator with deep knowledge of Kubernetes, GlusterFS, and Ubuntu. Always respond with valid JSON containing analysis, diagnosis, recommendations, safety_considerations, commands, and risk_level.'
+                },
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ],
+            'options': {
+                'temperature': 0.3,  # Lower temperature for more consistent responses
+                'top_p': 0.9,
+                'num_predict': 1000  # Limit response length
+            },
+            'format': 'json'  # Ensure JSON response
+        }
+
+    def _response_cache_key(self, query: str, analysis: Dict[str, Any], context: Dict[str, Any] = None) -> Optional[str]:
+        """Cache key for an LLM answer, or None when the answer must not be cached"""
+        if context:
+            # Caller-supplied context is not part of the key, so such answers are never reused
+            return None
+        
+        fingerprint = cluster_fingerprint(self.conversation_context['system_status'],
+                                          self.conversation_context['active_issues'])
+        self.response_cache.update_fingerprint(fingerprint)
+        return self.response_cache.make_key(query, analysis, fingerprint)
+
+    def _cached_llm_response(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info(f"Response cache hit ({self.response_cache.get_metrics()['hit_rate']:.0%} hit rate)")
+        return cached
+
+    def _call_llm(self, prompt: str) -> str:
+        """Single blocking Ollama chat call (raises on failure)"""
+        # Configure Ollama client with base URL
+        client = ollama.Client(host=self.ollama_base_url)
+        
+        response = client.chat(**self._llm_request(prompt))
+        
+        return response['message']['content']
+
+    def _query_llm(self, prompt: str, cache_key: str = None) -> str:
         """Query the LLM using Ollama"""
+        cached = self._cached_llm_response(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Configure Ollama client with base URL
-            client = ollama.Client(host=self.ollama_base_url)
-            
-            response = client.chat(
-                model=self.model_name,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': 'You are an expert system administrator with deep knowledge of Kubernetes, GlusterFS, and Ubuntu. Always respond with valid JSON containing analysis, diagnosis, recommendations, safety_considerations, commands, and risk_level.'
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                options={
-                    'temperature': 0.3,  # Lower temperature for more consistent responses
-                    'top_p': 0.9,
-                    'num_predict': 1000  # Limit response length
-                },
-                format='json'  # Ensure JSON response
-            )
+            content = self._call_llm(prompt)
             
-            return response['message']['content']
+            if cache_key is not None:
+                self.response_cache.put(cache_key, content)
+            return content
             
         except Exception as e:
             self.logger.error(f"Error querying LLM: {e}")
             # Fallback to rule-based response when LLM is not available
             return self._generate_fallback_response(prompt)
 
+    async def _query_llm_async(self, prompt: str, cache_key: str = None) -> str:
+        """Query the LLM using the async Ollama client (does not block the event loop)"""
+        cached = self._cached_llm_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            client = ollama.AsyncClient(host=self.ollama_base_url)
+            
+            response = await client.chat(**self._llm_request(prompt))
+            content = response['message']['content']
+            
+            if cache_key is not None:
+                self.response_cache.put(cache_key, content)
+            return content
+            
+        except Exception as e:
+            self.logger.error(f"Error querying LLM: {e}")
+            # Fallback to rule-based response when LLM is not available
+            return await self._fallback_response_async(prompt)
+
+    async def _fallback_response_async(self, prompt: str) -> str:
+        """Rule-based fallback in a worker thread (it runs kubectl/gluster/df commands) with its own timeout"""
+        unavailable = json.dumps({
+            'analysis': 'Expert LLM service is unavailable and live system data could not be collected in time',
+            'diagnosis': f"Rule-based data collection exceeded {self.async_stage_timeouts['fallback']:g}s",
+            'recommendations': [
+                'Check that the Ollama service is running and reachable',
+                'Retry the query once the cluster API responds again'
+            ],
+            'safety_considerations': ['No commands were executed'],
+            'commands': [],
+            'risk_level': 'SAFE'
+        })
+        return await self._run_stage('fallback', self._generate_fallback_response, prompt, default=unavailable)
+
+    def _query_llm_stream(self, prompt: str, cache_key: str = None) -> Iterator[str]:
+        """Query the LLM with streaming enabled and yield content chunks as they arrive"""
+        cached = self._cached_llm_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        streamed = False
+        chunks = []
+        
+        try:
+            client = ollama.Client(host=self.ollama_base_url)
+            start = datetime.now(timezone.utc)
+            
+            for part in client.chat(stream=True, **self._llm_request(prompt)):
+                content = part['message']['content']
+                if not content:
+                    continue
+                if not streamed:
+                    elapsed = (datetime.now(timezone.utc) - start).total_seconds()
+                    self.logger.info(f"LLM time to first token: {elapsed:.2f}s")
+                    streamed = True
+                chunks.append(content)
+                yield content
+            
+            if cache_key is not None and chunks:
+                self.response_cache.put(cache_key, ''.join(chunks))
+                
+        except Exception as e:
+            self.logger.error(f"Error streaming from LLM: {e}")
+            if not streamed:
+                # Fallback to rule-based response when LLM is not available
+                yield self._generate_fallback_response(prompt)
+
     def _generate_fallback_response(self, prompt: str) -> str:
         """Generate rule-based response when LLM is not available"""
         self.logger.info("Using fallback rule-based response system")
@@ -551,34 +881,74 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
             self.logger.error(f"Error executing command {command}: {e}")
             return f"Error executing command: {str(e)}"
 
+    def stream_command(self, command: str) -> Iterator[str]:
+        """
+        Execute a safe command and yield its output line by line
+        
+        kubectl get listings are produced row by row while pages arrive from the API
+        server, so callers can render large tables progressively. Other commands
+        yield their complete output once.
+        """
+        validation = self.safety_validator.validate_command(command, "SAFE")
+        if not validation['safe']:
+            yield f"Command rejected for safety: {validation['reason']}"
+            return
+        
+        command_lower = command.lower().strip()
+        if self._is_root_cause_command(command_lower):
+            # Pod log matches are shown as each concurrent log read completes
+            yield from self._iter_root_cause_analysis(self._extract_error_pattern(command),
+                                                      self.k8s_clients.core_v1, self.k8s_clients.apps_v1)
+            return
+        
+        if not (command_lower.startswith('kubectl get') or command_lower.startswith('get')):
+            yield self._execute_safe_command(command)
+            return
+        
+        try:
+            rows = self._iter_get_rows(command_lower, self.k8s_clients.core_v1,
+                                       self.k8s_clients.apps_v1, self.k8s_clients.networking_v1,
+                                       self._parse_selectors(command))
+        except Exception as e:
+            self.logger.error(f"Error executing kubectl command via K8s API: {e}")
+            yield f"Error executing kubectl command: {str(e)}"
+            return
+        
+        yield from rows
+
+    @staticmethod
+    def _is_root_cause_command(command_lower: str) -> bool:
+        """Same routing as _execute_kubectl_command: get/describe/logs/events take precedence"""
+        if not command_lower.startswith('kubectl') or command_lower.startswith('kubectl get'):
+            return False
+        if any(word in command_lower for word in ('describe', 'logs', 'events')):
+            return False
+        return 'analyze' in command_lower or 'root cause' in command_lower or 'investigate' in command_lower
+
     def _execute_kubectl_command(self, command: str) -> str:
         """Execute comprehensive kubectl commands using Kubernetes Python client with intelligent analysis"""
         try:
-            from kubernetes import client, config
-            import re
-            
-            # Load in-cluster config (we're running inside a Kubernetes pod)
-            config.load_incluster_config()
-            
-            # Create API clients
-            v1 = client.CoreV1Api()
-            apps_v1 = client.AppsV1Api()
-            networking_v1 = client.NetworkingV1Api()
-            rbac_v1 = client.RbacAuthorizationV1Api()
-            events_v1 = client.EventsV1Api()
+            # Shared, pooled API clients (config is only reloaded when credentials rotate)
+            v1 = self.k8s_clients.core_v1
+            apps_v1 = self.k8s_clients.apps_v1
+            networking_v1 = self.k8s_clients.networking_v1
+            rbac_v1 = self.k8s_clients.rbac_v1
             
             self.logger.info(f"Executing kubectl command via K8s API: {command}")
             
             # Parse kubectl command - Enhanced parsing for comprehensive support
             command_lower = command.lower().strip()
             
+            # Selectors are case-sensitive, so they are parsed from the original command
+            selectors = self._parse_selectors(command)
+            
             # Debug logging
             self.logger.info(f"Command after lowercase and strip: '{command_lower}'")
             
             # GET COMMANDS
             if command_lower.startswith('kubectl get') or command_lower.startswith('get'):
                 self.logger.info("Routing to _handle_get_commands")
-                return self._handle_get_commands(command_lower, v1, apps_v1, networking_v1, rbac_v1)
+                return self._handle_get_commands(command_lower, v1, apps_v1, networking_v1, rbac_v1, selectors)
             
             # DESCRIBE COMMANDS  
             elif 'describe' in command_lower:
@@ -593,7 +963,7 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
             # EVENTS COMMANDS
             elif 'events' in command_lower:
                 self.logger.info("Routing to _handle_events_commands")
-                return self._handle_events_commands(command_lower, v1)
+                return self._handle_events_commands(command_lower, v1, selectors)
             
             # ROOT CAUSE ANALYSIS - New intelligent feature
             elif 'analyze' in command_lower or 'root cause' in command_lower or 'investigate' in command_lower:
@@ -631,42 +1001,48 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
             self.logger.error(f"Error executing kubectl command via K8s API: {e}")
             return f"Error executing kubectl command: {str(e)}\n\nTip: Try using standard kubectl syntax like:\n- kubectl get pods\n- kubectl describe pod <name>\n- kubectl logs <pod-name>"
 
-    def _handle_get_commands(self, command: str, v1, apps_v1, networking_v1, rbac_v1) -> str:
+    def _handle_get_commands(self, command: str, v1, apps_v1, networking_v1, rbac_v1,
+                             selectors: Dict[str, str] = None) -> str:
         """Handle all kubectl get commands comprehensively"""
+        return '\n'.join(self._iter_get_rows(command, v1, apps_v1, networking_v1, selectors))
+
+    def _iter_get_rows(self, command: str, v1, apps_v1, networking_v1,
+                       selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Route a kubectl get command to its row generator; selectors are applied by the API server"""
         try:
             # Parse namespace
             namespace = self._parse_namespace(command)
             all_namespaces = '--all-namespaces' in command or '-A' in command
             
             if 'get pods' in command or 'get pod' in command:
-                return self._get_pods_detailed(v1, namespace, all_namespaces)
+                yield from self._iter_pods_rows(v1, namespace, all_namespaces, selectors)
             elif 'get services' in command or 'get svc' in command:
-                return self._get_services_detailed(v1, namespace, all_namespaces)
+                yield from self._iter_services_rows(v1, namespace, all_namespaces, selectors)
             elif 'get nodes' in command or 'get node' in command:
-                return self._get_nodes_detailed(v1)
+                yield from self._iter_nodes_rows(v1, selectors)
             elif 'get deployments' in command or 'get deploy' in command:
-                return self._get_deployments_detailed(apps_v1, namespace, all_namespaces)
+                yield from self._iter_deployments_rows(apps_v1, namespace, all_namespaces, selectors)
             elif 'get namespaces' in command or 'get ns' in command:
-                return self._get_namespaces_detailed(v1)
+                yield from self._iter_namespaces_rows(v1, selectors)
             elif 'get events' in command:
-                return self._get_events_detailed(v1, namespace, all_namespaces)
+                yield from self._iter_event_rows(v1, namespace, all_namespaces, selectors)
             elif 'get configmaps' in command or 'get cm' in command:
-                return self._get_configmaps_detailed(v1, namespace, all_namespaces)
+                yield from self._iter_configmaps_rows(v1, namespace, all_namespaces, selectors)
             elif 'get secrets' in command:
-                return self._get_secrets_detailed(v1, namespace, all_namespaces)
+                yield from self._iter_secrets_rows(v1, namespace, all_namespaces, selectors)
             elif 'get ingress' in command or 'get ing' in command:
-                return self._get_ingress_detailed(networking_v1, namespace, all_namespaces)
+                yield from self._iter_ingress_rows(networking_v1, namespace, all_namespaces, selectors)
             elif 'get persistentvolumes' in command or 'get pv' in command:
-                return self._get_pv_detailed(v1)
+                yield from self._iter_pv_rows(v1, selectors)
             elif 'get persistentvolumeclaims' in command or 'get pvc' in command:
-                return self._get_pvc_detailed(v1, namespace, all_namespaces)
+                yield from self._iter_pvc_rows(v1, namespace, all_namespaces, selectors)
             elif 'get all' in command:
-                return self._get_all_resources(v1, apps_v1, namespace, all_namespaces)
+                yield from self._iter_all_resources_rows(v1, apps_v1, namespace, all_namespaces, selectors)
             else:
-                return f"Get command not recognized. Try: pods, services, nodes, deployments, namespaces, events, configmaps, secrets, ingress, pv, pvc, all"
+                yield f"Get command not recognized. Try: pods, services, nodes, deployments, namespaces, events, configmaps, secrets, ingress, pv, pvc, all"
                 
         except Exception as e:
-            return f"Error handling get command: {str(e)}"
+            yield f"Error handling get command: {str(e)}"
 
     def _handle_describe_commands(self, command: str, v1, apps_v1, networking_v1) -> str:
         """Handle all kubectl describe commands with detailed analysis"""
@@ -696,7 +1072,11 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
     def _handle_logs_commands(self, command: str, v1) -> str:
         """Handle kubectl logs with advanced options"""
         try:
+            from kubernetes import client
+            
             parts = command.split()
+            if parts and parts[0] == 'kubectl':
+                parts = parts[1:]
             if len(parts) < 2:
                 return "Usage: kubectl logs <pod-name> [-n <namespace>] [-c <container>] [--tail=lines] [--since=time]"
             
@@ -710,18 +1090,23 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                 return "Pod name is required"
             
             try:
-                log_params = {
-                    'name': pod_name,
-                    'namespace': namespace,
-                    'tail_lines': tail_lines or 100,
-                }
-                
-                if container:
-                    log_params['container'] = container
                 if since_seconds:
-                    log_params['since_seconds'] = since_seconds
-                
-                logs = v1.read_namespaced_pod_log(**log_params)
+                    # Explicit time window - read it directly rather than through the cursor
+                    log_params = {
+                        'name': pod_name,
+                        'namespace': namespace,
+                        'tail_lines': tail_lines or 100,
+                        'since_seconds': since_seconds,
+                        '_request_timeout': self.k8s_request_timeout
+                    }
+                    if container:
+                        log_params['container'] = container
+                    
+                    logs = v1.read_namespaced_pod_log(**log_params)
+                else:
+                    # Incremental read: only lines newer than the last read are transferred
+                    logs = self.log_cursors.read(v1, namespace, pod_name, container, tail_lines=tail_lines or 100,
+                                                 request_timeout=self.k8s_request_timeout)
                 
                 header = f"=== Logs for pod {pod_name}"
                 if container:
@@ -739,25 +1124,27 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         except Exception as e:
             return f"Error handling logs command: {str(e)}"
 
-    def _handle_events_commands(self, command: str, v1) -> str:
+    def _handle_events_commands(self, command: str, v1, selectors: Dict[str, str] = None) -> str:
         """Handle kubectl get events with filtering"""
+        namespace = self._parse_namespace(command)
+        all_namespaces = '--all-namespaces' in command or '-A' in command
+        
+        return '\n'.join(self._iter_event_rows(v1, namespace, all_namespaces, selectors))
+
+    def _iter_event_rows(self, v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None,
+                         max_events: int = 50) -> Iterator[str]:
+        """Yield the most recent events as table rows, header first"""
         try:
-            namespace = self._parse_namespace(command)
-            all_namespaces = '--all-namespaces' in command or '-A' in command
+            events = self._iter_events(v1, None if all_namespaces else (namespace or 'default'), **(selectors or {}))
             
-            if all_namespaces:
-                events = v1.list_event_for_all_namespaces()
-            elif namespace:
-                events = v1.list_namespaced_event(namespace=namespace)
-            else:
-                events = v1.list_namespaced_event(namespace='default')
+            yield "NAMESPACE    LAST SEEN    TYPE      REASON          OBJECT                     MESSAGE"
             
-            output = "NAMESPACE    LAST SEEN    TYPE      REASON          OBJECT                     MESSAGE\n"
+            # Keep only the most recent events while the pages stream in
+            oldest = datetime.min.replace(tzinfo=timezone.utc)
+            recent_events = heapq.nlargest(max_events, events,
+                                           key=lambda x: x.last_timestamp or x.first_timestamp or oldest)
             
-            # Sort events by timestamp (most recent first)
-            sorted_events = sorted(events.items, key=lambda x: x.last_timestamp or x.first_timestamp, reverse=True)
-            
-            for event in sorted_events[:50]:  # Show last 50 events
+            for event in recent_events:
                 last_seen = "unknown"
                 if event.last_timestamp:
                     time_diff = datetime.now(timezone.utc) - event.last_timestamp
@@ -769,69 +1156,109 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                         last_seen = f"{time_diff.seconds // 60}m"
                 
                 obj_ref = f"{event.involved_object.kind}/{event.involved_object.name}" if event.involved_object else "unknown"
-                message = (event.message[:50] + '...') if len(event.message) > 50 else event.message
+                message = event.message or ""
+                message = (message[:50] + '...') if len(message) > 50 else message
                 
-                output += f"{event.namespace:<12} {last_seen:<12} {event.type:<9} {event.reason:<15} {obj_ref:<26} {message}\n"
-            
-            return output.strip()
+                namespace = event.metadata.namespace if event.metadata else ''
+                yield f"{namespace or '':<12} {last_seen:<12} {event.type or '':<9} {event.reason or '':<15} {obj_ref:<26} {message}"
             
         except Exception as e:
-            return f"Error getting events: {str(e)}"
+            yield f"Error getting events: {str(e)}"
 
     def _perform_root_cause_analysis(self, error_pattern: str, v1, apps_v1) -> str:
         """Perform intelligent root cause analysis by cross-referencing cluster data"""
         try:
-            analysis_result = "=== ROOT CAUSE ANALYSIS ===\n"
-            analysis_result += f"Analyzing error pattern: '{error_pattern}'\n\n"
-            
-            findings = []
-            
-            # 1. Search in pod logs across all namespaces
+            # 1. Search in pod logs across all namespaces (ranked by hit count)
             pods_with_error = self._search_error_in_pods(error_pattern, v1)
+            findings = []
             if pods_with_error:
                 findings.append("🔍 FOUND IN POD LOGS:")
                 for pod_info in pods_with_error:
                     findings.append(f"  • {pod_info}")
             
-            # 2. Search in events
-            events_with_error = self._search_error_in_events(error_pattern, v1)
-            if events_with_error:
-                findings.append("\n🔍 FOUND IN EVENTS:")
-                for event_info in events_with_error:
-                    findings.append(f"  • {event_info}")
-            
-            # 3. Check pod statuses for related issues
-            related_pod_issues = self._find_related_pod_issues(error_pattern, v1)
-            if related_pod_issues:
-                findings.append("\n🔍 RELATED POD ISSUES:")
-                for issue in related_pod_issues:
-                    findings.append(f"  • {issue}")
-            
-            # 4. Cross-reference with node issues
-            node_issues = self._check_node_issues(v1)
-            if node_issues:
-                findings.append("\n🔍 POTENTIAL NODE ISSUES:")
-                for issue in node_issues:
-                    findings.append(f"  • {issue}")
-            
-            # 5. Generate intelligent recommendations
-            recommendations = self._generate_rca_recommendations(error_pattern, findings)
-            
-            if findings:
-                analysis_result += "\n".join(findings)
-                analysis_result += f"\n\n=== RECOMMENDATIONS ===\n{recommendations}"
-            else:
-                analysis_result += "❌ No direct matches found in cluster data.\n"
-                analysis_result += "🔍 Try checking:\n"
-                analysis_result += "  • Specific pod logs: kubectl logs <pod-name>\n"
-                analysis_result += "  • Recent events: kubectl get events --sort-by='.lastTimestamp'\n"
-                analysis_result += "  • Node status: kubectl get nodes -o wide\n"
-            
-            return analysis_result
+            return self._root_cause_header(error_pattern) + self._root_cause_report(error_pattern, v1, findings)
             
         except Exception as e:
             return f"Error performing root cause analysis: {str(e)}"
 
+    def _iter_root_cause_analysis(self, error_pattern: str, v1, apps_v1) -> Iterator[str]:
+        """
+        Root cause analysis that yields pod log matches as the concurrent log reads complete
+        
+        Matches arrive in completion order rather than ranked; the cross-referenced
+        sections and recommendations follow once the log search has finished.
+        """
+        try:
+            yield self._root_cause_header(error_pattern).rstrip('\n') + '\n'
+            
+            findings = []
+            stats = LogSearchResult()
+            try:
+                for match in self._iter_pod_log_matches(error_pattern, v1, stats):
+                    if not findings:
+                        findings.append("🔍 FOUND IN POD LOGS:")
+                        yield findings[-1]
+                    findings.append(f"  • {self._format_log_match(match)}")
+                    yield findings[-1]
+                note = self._log_search_note(stats)
+            except Exception as e:
+                note = f"Error searching pod logs: {str(e)}"
+            
+            if note:
+                if not findings:
+                    findings.append("🔍 FOUND IN POD LOGS:")
+                    yield findings[-1]
+                findings.append(f"  • {note}")
+                yield findings[-1]
+            
+            # Pod findings were already yielded; only the remaining sections follow
+            yield self._root_cause_report(error_pattern, v1, findings, skip=len(findings))
+            
+        except Exception as e:
+            yield f"Error performing root cause analysis: {str(e)}"
+
+    @staticmethod
+    def _root_cause_header(error_pattern: str) -> str:
+        return f"=== ROOT CAUSE ANALYSIS ===\nAnalyzing error pattern: '{error_pattern}'\n\n"
+
+    def _root_cause_report(self, error_pattern: str, v1, findings: List[str], skip: int = 0) -> str:
+        """Events, related pod and node sections plus recommendations, appended to the pod log findings"""
+        # 2. Search in events
+        events_with_error = self._search_error_in_events(error_pattern, v1)
+        if events_with_error:
+            findings.append("\n🔍 FOUND IN EVENTS:")
+            for event_info in events_with_error:
+                findings.append(f"  • {event_info}")
+        
+        # 3. Check pod statuses for related issues
+        related_pod_issues = self._find_related_pod_issues(error_pattern, v1)
+        if related_pod_issues:
+            findings.append("\n🔍 RELATED POD ISSUES:")
+            for issue in related_pod_issues:
+                findings.append(f"  • {issue}")
+        
+        # 4. Cross-reference with node issues
+        node_issues = self._check_node_issues(v1)
+        if node_issues:
+            findings.append("\n🔍 POTENTIAL NODE ISSUES:")
+            for issue in node_issues:
+                findings.append(f"  • {issue}")
+        
+        # 5. Generate intelligent recommendations
+        recommendations = self._generate_rca_recommendations(error_pattern, findings)
+        
+        if findings:
+            report = "\n".join(findings[skip:])
+            report += f"\n\n=== RECOMMENDATIONS ===\n{recommendations}"
+        else:
+            report = "❌ No direct matches found in cluster data.\n"
+            report += "🔍 Try checking:\n"
+            report += "  • Specific pod logs: kubectl logs <pod-name>\n"
+            report += "  • Recent events: kubectl get events --sort-by='.lastTimestamp'\n"
+            report += "  • Node status: kubectl get nodes -o wide\n"
+        
+        return report
+
     def _handle_exec_commands(self, command: str, v1) -> str:
         """Handle exec commands (limited for security)"""
         return "⚠️ EXEC COMMANDS RESTRICTED\nFor security reasons, exec commands are not allowed through this interface.\nUse your local kubectl: " + command
@@ -934,20 +1361,14 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         try:
             # Check for potential issues and suggest actions
             for issue_info in analysis['potential_issues']:
-                issue_key = f"{issue_info['category']}_{issue_info['pattern']}"
+                issue_key = issue_info['pattern']
                 
-                # Get historical recommendations
-                if self.history_manager.has_similar_issue(issue_key):
-                    history = self.history_manager.get_pattern_history(issue_key)
-                    
-                    # Suggest based on successful past resolutions
-                    for occurrence in history['occurrences']:
-                        if occurrence['success']:
-                            recommendations['automated_actions'].append({
-                                'action': occurrence['resolution_method'],
-                                'confidence': occurrence['confidence_score'],
-                                'historical_success': True
-                            })
+                # Suggest based on successful past resolutions (precomputed per history version)
+                for resolution in self.history_manager.get_pattern_summary(issue_key)['successful_resolutions']:
+                    recommendations['automated_actions'].append({
+                        **resolution,
+                        'historical_success': True
+                    })
             
             # Add urgency-based recommendations
             if analysis['urgency_level'] == 'high':
@@ -1079,6 +1500,132 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
 
     # ===== COMPREHENSIVE KUBECTL HELPER METHODS =====
     
+    def _get_cluster_cache(self):
+        """Get the shared informer cache (None when disabled or Kubernetes is unavailable)"""
+        try:
+            return get_cluster_cache()
+        except Exception as e:
+            self.logger.warning(f"Cluster cache unavailable: {e}")
+            return None
+
+    def _paginate(self, list_func, page_size: int = None, **kwargs) -> Iterator[Any]:
+        """Yield the items of a Kubernetes list call page by page using limit/_continue"""
+        page_size = page_size or self.list_page_size
+        continue_token = None
+        
+        while True:
+            if continue_token:
+                kwargs['_continue'] = continue_token
+            
+            page = list_func(limit=page_size, _request_timeout=self.k8s_request_timeout, **kwargs)
+            yield from page.items
+            
+            continue_token = page.metadata._continue if page.metadata else None
+            if not continue_token:
+                return
+
+    @staticmethod
+    def _selector_kwargs(label_selector: str = None, field_selector: str = None) -> Dict[str, str]:
+        """Build list-call keyword arguments for the selectors that are set"""
+        kwargs = {}
+        if label_selector:
+            kwargs['label_selector'] = label_selector
+        if field_selector:
+            kwargs['field_selector'] = field_selector
+        return kwargs
+
+    @staticmethod
+    def _join_field_selectors(*selectors: str) -> Optional[str]:
+        """Combine field selector fragments (None/empty fragments are skipped)"""
+        return ','.join(selector for selector in selectors if selector) or None
+
+    def _iter_pods(self, v1, namespace: str = None, label_selector: str = None, node_name: str = None,
+                   field_selector: str = None) -> Iterator[Any]:
+        """Iterate pods from the informer cache, falling back to paged, server-filtered API reads until it has synced"""
+        cache = self._get_cluster_cache()
+        if cache and cache.is_synced('pods'):
+            return iter(cache.list_pods(namespace=namespace, label_selector=label_selector, node_name=node_name,
+                                        field_selector=field_selector))
+        
+        field_selector = self._join_field_selectors(f"spec.nodeName={node_name}" if node_name else None, field_selector)
+        kwargs = self._selector_kwargs(label_selector, field_selector)
+        
+        if namespace:
+            return self._paginate(v1.list_namespaced_pod, namespace=namespace, **kwargs)
+        return self._paginate(v1.list_pod_for_all_namespaces, **kwargs)
+
+    def _list_pods(self, v1, namespace: str = None, label_selector: str = None, node_name: str = None,
+                   field_selector: str = None) -> list:
+        """List pods from the informer cache, falling back to the API until it has synced"""
+        return list(self._iter_pods(v1, namespace=namespace, label_selector=label_selector, node_name=node_name,
+                                    field_selector=field_selector))
+
+    def _read_pod(self, v1, pod_name: str, namespace: str):
+        """Read a single pod from the informer cache, falling back to the API"""
+        cache = self._get_cluster_cache()
+        if cache and cache.is_synced('pods'):
+            pod = cache.get_pod(namespace, pod_name)
+            if pod is not None:
+                return pod
+        return v1.read_namespaced_pod(name=pod_name, namespace=namespace, _request_timeout=self.k8s_request_timeout)
+
+    def _iter_nodes(self, v1, label_selector: str = None, field_selector: str = None) -> Iterator[Any]:
+        """Iterate nodes from the informer cache, falling back to paged, server-filtered API reads"""
+        cache = self._get_cluster_cache()
+        if cache and cache.is_synced('nodes'):
+            return iter(cache.list_nodes(label_selector=label_selector, field_selector=field_selector))
+        return self._paginate(v1.list_node, **self._selector_kwargs(label_selector, field_selector))
+
+    def _list_nodes(self, v1, label_selector: str = None, field_selector: str = None) -> list:
+        """List nodes from the informer cache, falling back to the API"""
+        return list(self._iter_nodes(v1, label_selector=label_selector, field_selector=field_selector))
+
+    def _iter_events(self, v1, namespace: str = None, involved_object_name: str = None,
+                     label_selector: str = None, field_selector: str = None) -> Iterator[Any]:
+        """Iterate events (optionally for one involved object) from the informer cache, falling back to paged, server-filtered API reads"""
+        cache = self._get_cluster_cache()
+        if cache and cache.is_synced('events'):
+            if involved_object_name and namespace:
+                return iter(cache.list_events(namespace=namespace, involved_object=f"{namespace}/{involved_object_name}",
+                                              label_selector=label_selector, field_selector=field_selector))
+            field_selector = self._join_field_selectors(
+                f"involvedObject.name={involved_object_name}" if involved_object_name else None, field_selector)
+            return iter(cache.list_events(namespace=namespace, label_selector=label_selector,
+                                          field_selector=field_selector))
+        
+        field_selector = self._join_field_selectors(
+            f"involvedObject.name={involved_object_name}" if involved_object_name else None, field_selector)
+        kwargs = self._selector_kwargs(label_selector, field_selector)
+        
+        if namespace:
+            return self._paginate(v1.list_namespaced_event, namespace=namespace, **kwargs)
+        return self._paginate(v1.list_event_for_all_namespaces, **kwargs)
+
+    def _list_events(self, v1, namespace: str = None, involved_object_name: str = None,
+                     label_selector: str = None, field_selector: str = None) -> list:
+        """List events (optionally for one involved object) from the informer cache, falling back to the API"""
+        return list(self._iter_events(v1, namespace=namespace, involved_object_name=involved_object_name,
+                                      label_selector=label_selector, field_selector=field_selector))
+
+    def _iter_deployments(self, apps_v1, namespace: str = None, label_selector: str = None,
+                          field_selector: str = None) -> Iterator[Any]:
+        """Iterate deployments from the informer cache, falling back to paged, server-filtered API reads"""
+        cache = self._get_cluster_cache()
+        if cache and cache.is_synced('deployments'):
+            return iter(cache.list_deployments(namespace=namespace, label_selector=label_selector,
+                                               field_selector=field_selector))
+        
+        kwargs = self._selector_kwargs(label_selector, field_selector)
+        if namespace:
+            return self._paginate(apps_v1.list_namespaced_deployment, namespace=namespace, **kwargs)
+        return self._paginate(apps_v1.list_deployment_for_all_namespaces, **kwargs)
+
+    def _list_deployments(self, apps_v1, namespace: str = None, label_selector: str = None,
+                          field_selector: str = None) -> list:
+        """List deployments from the informer cache, falling back to the API"""
+        return list(self._iter_deployments(apps_v1, namespace=namespace, label_selector=label_selector,
+                                           field_selector=field_selector))
+
     def _parse_namespace(self, command: str) -> str:
         """Parse namespace from kubectl command"""
         if '-n ' in command:
@@ -1095,6 +1642,30 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                 return parts[1].split()[0]
         return None
 
+    def _parse_selectors(self, command: str) -> Dict[str, str]:
+        """Parse -l/--selector and --field-selector from a kubectl command into list-call keyword arguments"""
+        import shlex
+        
+        try:
+            tokens = shlex.split(command)
+        except ValueError:
+            tokens = command.split()
+        
+        flags = {'-l': 'label_selector', '--selector': 'label_selector', '--field-selector': 'field_selector'}
+        selectors = {}
+        
+        for i, token in enumerate(tokens):
+            flag, has_value, value = token.partition('=')
+            if flag not in flags:
+                continue
+            if not has_value:
+                if i + 1 >= len(tokens):
+                    continue
+                value = tokens[i + 1]
+            selectors[flags[flag]] = value
+        
+        return selectors
+
     def _parse_container(self, command: str) -> str:
         """Parse container name from kubectl logs command"""
         if '-c ' in command:
@@ -1151,16 +1722,22 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
 
     def _get_pods_detailed(self, v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed pod information"""
+        return '\n'.join(self._iter_pods_rows(v1, namespace, all_namespaces))
+
+    def _iter_pods_rows(self, v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed pod information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                pods = v1.list_pod_for_all_namespaces()
-                output = "NAMESPACE         NAME                           READY   STATUS      RESTARTS   AGE     NODE\n"
+                pods = self._iter_pods(v1, **selectors)
+                yield "NAMESPACE         NAME                           READY   STATUS      RESTARTS   AGE     NODE"
             else:
                 ns = namespace or 'default'
-                pods = v1.list_namespaced_pod(namespace=ns)
-                output = "NAME                           READY   STATUS      RESTARTS   AGE     NODE\n"
+                pods = self._iter_pods(v1, namespace=ns, **selectors)
+                yield "NAME                           READY   STATUS      RESTARTS   AGE     NODE"
             
-            for pod in pods.items:
+            for pod in pods:
                 # Calculate ready containers
                 ready_count = 0
                 total_count = len(pod.status.container_statuses) if pod.status.container_statuses else 0
@@ -1188,27 +1765,31 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                 node_name = pod.spec.node_name or "unknown"
                 
                 if all_namespaces:
-                    output += f"{pod.metadata.namespace:<17} {pod.metadata.name:<30} {ready_status:<7} {pod.status.phase:<11} {restart_count:<10} {age_str:<7} {node_name}\n"
+                    yield f"{pod.metadata.namespace:<17} {pod.metadata.name:<30} {ready_status:<7} {pod.status.phase:<11} {restart_count:<10} {age_str:<7} {node_name}"
                 else:
-                    output += f"{pod.metadata.name:<30} {ready_status:<7} {pod.status.phase:<11} {restart_count:<10} {age_str:<7} {node_name}\n"
-            
-            return output.strip()
+                    yield f"{pod.metadata.name:<30} {ready_status:<7} {pod.status.phase:<11} {restart_count:<10} {age_str:<7} {node_name}"
             
         except Exception as e:
-            return f"Error getting pods: {str(e)}"
+            yield f"Error getting pods: {str(e)}"
 
     def _get_services_detailed(self, v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed service information"""
+        return '\n'.join(self._iter_services_rows(v1, namespace, all_namespaces))
+
+    def _iter_services_rows(self, v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed service information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                services = v1.list_service_for_all_namespaces()
-                output = "NAMESPACE    NAME                    TYPE           CLUSTER-IP      EXTERNAL-IP   PORT(S)                  AGE\n"
+                services = self._paginate(v1.list_service_for_all_namespaces, **selectors)
+                yield "NAMESPACE    NAME                    TYPE           CLUSTER-IP      EXTERNAL-IP   PORT(S)                  AGE"
             else:
                 ns = namespace or 'default'
-                services = v1.list_namespaced_service(namespace=ns)
-                output = "NAME                    TYPE           CLUSTER-IP      EXTERNAL-IP   PORT(S)                  AGE\n"
+                services = self._paginate(v1.list_namespaced_service, namespace=ns, **selectors)
+                yield "NAME                    TYPE           CLUSTER-IP      EXTERNAL-IP   PORT(S)                  AGE"
             
-            for svc in services.items:
+            for svc in services:
                 external_ip = "<none>"
                 if svc.status.load_balancer and svc.status.load_balancer.ingress:
                     external_ip = svc.status.load_balancer.ingress[0].ip or svc.status.load_balancer.ingress[0].hostname or "<pending>"
@@ -1229,22 +1810,26 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     age_str = "unknown"
                 
                 if all_namespaces:
-                    output += f"{svc.metadata.namespace:<12} {svc.metadata.name:<23} {svc.spec.type:<14} {svc.spec.cluster_ip:<15} {external_ip:<13} {port_str:<24} {age_str}\n"
+                    yield f"{svc.metadata.namespace:<12} {svc.metadata.name:<23} {svc.spec.type:<14} {svc.spec.cluster_ip:<15} {external_ip:<13} {port_str:<24} {age_str}"
                 else:
-                    output += f"{svc.metadata.name:<23} {svc.spec.type:<14} {svc.spec.cluster_ip:<15} {external_ip:<13} {port_str:<24} {age_str}\n"
-            
-            return output.strip()
+                    yield f"{svc.metadata.name:<23} {svc.spec.type:<14} {svc.spec.cluster_ip:<15} {external_ip:<13} {port_str:<24} {age_str}"
             
         except Exception as e:
-            return f"Error getting services: {str(e)}"
+            yield f"Error getting services: {str(e)}"
 
     def _get_nodes_detailed(self, v1) -> str:
         """Get detailed node information"""
+        return '\n'.join(self._iter_nodes_rows(v1))
+
+    def _iter_nodes_rows(self, v1, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed node information rows, header first"""
+        selectors = selectors or {}
+        
         try:
-            nodes = v1.list_node()
-            output = "NAME              STATUS    ROLES           AGE     VERSION        INTERNAL-IP     EXTERNAL-IP\n"
+            nodes = self._iter_nodes(v1, **selectors)
+            yield "NAME              STATUS    ROLES           AGE     VERSION        INTERNAL-IP     EXTERNAL-IP"
             
-            for node in nodes.items:
+            for node in nodes:
                 status = "Ready" if any(condition.status == "True" and condition.type == "Ready" for condition in node.status.conditions) else "NotReady"
                 roles = ','.join([label.split('/')[-1] for label in node.metadata.labels.keys() if 'node-role.kubernetes.io' in label]) or "<none>"
                 
@@ -1264,25 +1849,29 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                         elif addr.type == "ExternalIP":
                             external_ip = addr.address
                 
-                output += f"{node.metadata.name:<17} {status:<9} {roles:<15} {age_str:<7} {version:<14} {internal_ip:<15} {external_ip}\n"
-            
-            return output.strip()
+                yield f"{node.metadata.name:<17} {status:<9} {roles:<15} {age_str:<7} {version:<14} {internal_ip:<15} {external_ip}"
             
         except Exception as e:
-            return f"Error getting nodes: {str(e)}"
+            yield f"Error getting nodes: {str(e)}"
 
     def _get_deployments_detailed(self, apps_v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed deployment information"""
+        return '\n'.join(self._iter_deployments_rows(apps_v1, namespace, all_namespaces))
+
+    def _iter_deployments_rows(self, apps_v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed deployment information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                deployments = apps_v1.list_deployment_for_all_namespaces()
-                output = "NAMESPACE    NAME                    READY   UP-TO-DATE   AVAILABLE   AGE\n"
+                deployments = self._iter_deployments(apps_v1, **selectors)
+                yield "NAMESPACE    NAME                    READY   UP-TO-DATE   AVAILABLE   AGE"
             else:
                 ns = namespace or 'default'
-                deployments = apps_v1.list_namespaced_deployment(namespace=ns)
-                output = "NAME                    READY   UP-TO-DATE   AVAILABLE   AGE\n"
+                deployments = self._iter_deployments(apps_v1, namespace=ns, **selectors)
+                yield "NAME                    READY   UP-TO-DATE   AVAILABLE   AGE"
             
-            for deploy in deployments.items:
+            for deploy in deployments:
                 ready = f"{deploy.status.ready_replicas or 0}/{deploy.spec.replicas or 0}"
                 up_to_date = deploy.status.updated_replicas or 0
                 available = deploy.status.available_replicas or 0
@@ -1294,22 +1883,26 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     age_str = "unknown"
                 
                 if all_namespaces:
-                    output += f"{deploy.metadata.namespace:<12} {deploy.metadata.name:<23} {ready:<7} {up_to_date:<12} {available:<11} {age_str}\n"
+                    yield f"{deploy.metadata.namespace:<12} {deploy.metadata.name:<23} {ready:<7} {up_to_date:<12} {available:<11} {age_str}"
                 else:
-                    output += f"{deploy.metadata.name:<23} {ready:<7} {up_to_date:<12} {available:<11} {age_str}\n"
-            
-            return output.strip()
+                    yield f"{deploy.metadata.name:<23} {ready:<7} {up_to_date:<12} {available:<11} {age_str}"
             
         except Exception as e:
-            return f"Error getting deployments: {str(e)}"
+            yield f"Error getting deployments: {str(e)}"
 
     def _get_namespaces_detailed(self, v1) -> str:
         """Get detailed namespace information"""
+        return '\n'.join(self._iter_namespaces_rows(v1))
+
+    def _iter_namespaces_rows(self, v1, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed namespace information rows, header first"""
+        selectors = selectors or {}
+        
         try:
-            namespaces = v1.list_namespace()
-            output = "NAME                   STATUS    AGE\n"
+            namespaces = self._paginate(v1.list_namespace, **selectors)
+            yield "NAME                   STATUS    AGE"
             
-            for ns in namespaces.items:
+            for ns in namespaces:
                 status = ns.status.phase or "Unknown"
                 
                 if ns.metadata.creation_timestamp:
@@ -1318,29 +1911,33 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                 else:
                     age_str = "unknown"
                 
-                output += f"{ns.metadata.name:<22} {status:<9} {age_str}\n"
-            
-            return output.strip()
+                yield f"{ns.metadata.name:<22} {status:<9} {age_str}"
             
         except Exception as e:
-            return f"Error getting namespaces: {str(e)}"
+            yield f"Error getting namespaces: {str(e)}"
 
     def _get_events_detailed(self, v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed events information"""
-        return self._handle_events_commands(f"get events {'--all-namespaces' if all_namespaces else ''}", v1)
+        return '\n'.join(self._iter_event_rows(v1, namespace, all_namespaces))
 
     def _get_configmaps_detailed(self, v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed configmaps information"""
+        return '\n'.join(self._iter_configmaps_rows(v1, namespace, all_namespaces))
+
+    def _iter_configmaps_rows(self, v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed configmaps information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                cms = v1.list_config_map_for_all_namespaces()
-                output = "NAMESPACE    NAME                    DATA   AGE\n"
+                cms = self._paginate(v1.list_config_map_for_all_namespaces, **selectors)
+                yield "NAMESPACE    NAME                    DATA   AGE"
             else:
                 ns = namespace or 'default'
-                cms = v1.list_namespaced_config_map(namespace=ns)
-                output = "NAME                    DATA   AGE\n"
+                cms = self._paginate(v1.list_namespaced_config_map, namespace=ns, **selectors)
+                yield "NAME                    DATA   AGE"
             
-            for cm in cms.items:
+            for cm in cms:
                 data_count = len(cm.data) if cm.data else 0
                 
                 if cm.metadata.creation_timestamp:
@@ -1350,27 +1947,31 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     age_str = "unknown"
                 
                 if all_namespaces:
-                    output += f"{cm.metadata.namespace:<12} {cm.metadata.name:<23} {data_count:<6} {age_str}\n"
+                    yield f"{cm.metadata.namespace:<12} {cm.metadata.name:<23} {data_count:<6} {age_str}"
                 else:
-                    output += f"{cm.metadata.name:<23} {data_count:<6} {age_str}\n"
-            
-            return output.strip()
+                    yield f"{cm.metadata.name:<23} {data_count:<6} {age_str}"
             
         except Exception as e:
-            return f"Error getting configmaps: {str(e)}"
+            yield f"Error getting configmaps: {str(e)}"
 
     def _get_secrets_detailed(self, v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed secrets information"""
+        return '\n'.join(self._iter_secrets_rows(v1, namespace, all_namespaces))
+
+    def _iter_secrets_rows(self, v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed secrets information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                secrets = v1.list_secret_for_all_namespaces()
-                output = "NAMESPACE    NAME                               TYPE                                  DATA   AGE\n"
+                secrets = self._paginate(v1.list_secret_for_all_namespaces, **selectors)
+                yield "NAMESPACE    NAME                               TYPE                                  DATA   AGE"
             else:
                 ns = namespace or 'default'
-                secrets = v1.list_namespaced_secret(namespace=ns)
-                output = "NAME                               TYPE                                  DATA   AGE\n"
+                secrets = self._paginate(v1.list_namespaced_secret, namespace=ns, **selectors)
+                yield "NAME                               TYPE                                  DATA   AGE"
             
-            for secret in secrets.items:
+            for secret in secrets:
                 data_count = len(secret.data) if secret.data else 0
                 secret_type = secret.type or "Opaque"
                 
@@ -1381,27 +1982,31 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     age_str = "unknown"
                 
                 if all_namespaces:
-                    output += f"{secret.metadata.namespace:<12} {secret.metadata.name:<34} {secret_type:<37} {data_count:<6} {age_str}\n"
+                    yield f"{secret.metadata.namespace:<12} {secret.metadata.name:<34} {secret_type:<37} {data_count:<6} {age_str}"
                 else:
-                    output += f"{secret.metadata.name:<34} {secret_type:<37} {data_count:<6} {age_str}\n"
-            
-            return output.strip()
+                    yield f"{secret.metadata.name:<34} {secret_type:<37} {data_count:<6} {age_str}"
             
         except Exception as e:
-            return f"Error getting secrets: {str(e)}"
+            yield f"Error getting secrets: {str(e)}"
 
     def _get_ingress_detailed(self, networking_v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed ingress information"""
+        return '\n'.join(self._iter_ingress_rows(networking_v1, namespace, all_namespaces))
+
+    def _iter_ingress_rows(self, networking_v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed ingress information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                ingresses = networking_v1.list_ingress_for_all_namespaces()
-                output = "NAMESPACE    NAME                    CLASS    HOSTS                   ADDRESS     PORTS     AGE\n"
+                ingresses = self._paginate(networking_v1.list_ingress_for_all_namespaces, **selectors)
+                yield "NAMESPACE    NAME                    CLASS    HOSTS                   ADDRESS     PORTS     AGE"
             else:
                 ns = namespace or 'default'
-                ingresses = networking_v1.list_namespaced_ingress(namespace=ns)
-                output = "NAME                    CLASS    HOSTS                   ADDRESS     PORTS     AGE\n"
+                ingresses = self._paginate(networking_v1.list_namespaced_ingress, namespace=ns, **selectors)
+                yield "NAME                    CLASS    HOSTS                   ADDRESS     PORTS     AGE"
             
-            for ing in ingresses.items:
+            for ing in ingresses:
                 ing_class = ing.spec.ingress_class_name or "<none>"
                 hosts = []
                 if ing.spec.rules:
@@ -1426,22 +2031,26 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     age_str = "unknown"
                 
                 if all_namespaces:
-                    output += f"{ing.metadata.namespace:<12} {ing.metadata.name:<23} {ing_class:<8} {host_str:<23} {address:<11} {ports:<9} {age_str}\n"
+                    yield f"{ing.metadata.namespace:<12} {ing.metadata.name:<23} {ing_class:<8} {host_str:<23} {address:<11} {ports:<9} {age_str}"
                 else:
-                    output += f"{ing.metadata.name:<23} {ing_class:<8} {host_str:<23} {address:<11} {ports:<9} {age_str}\n"
-            
-            return output.strip()
+                    yield f"{ing.metadata.name:<23} {ing_class:<8} {host_str:<23} {address:<11} {ports:<9} {age_str}"
             
         except Exception as e:
-            return f"Error getting ingress: {str(e)}"
+            yield f"Error getting ingress: {str(e)}"
 
     def _get_pv_detailed(self, v1) -> str:
         """Get detailed persistent volume information"""
+        return '\n'.join(self._iter_pv_rows(v1))
+
+    def _iter_pv_rows(self, v1, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed persistent volume information rows, header first"""
+        selectors = selectors or {}
+        
         try:
-            pvs = v1.list_persistent_volume()
-            output = "NAME                                       CAPACITY   ACCESS MODES   RECLAIM POLICY   STATUS      CLAIM                    STORAGECLASS   AGE\n"
+            pvs = self._paginate(v1.list_persistent_volume, **selectors)
+            yield "NAME                                       CAPACITY   ACCESS MODES   RECLAIM POLICY   STATUS      CLAIM                    STORAGECLASS   AGE"
             
-            for pv in pvs.items:
+            for pv in pvs:
                 capacity = pv.spec.capacity.get('storage', 'unknown') if pv.spec.capacity else 'unknown'
                 access_modes = ','.join(pv.spec.access_modes) if pv.spec.access_modes else 'unknown'
                 reclaim_policy = pv.spec.persistent_volume_reclaim_policy or 'unknown'
@@ -1459,25 +2068,29 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                 else:
                     age_str = "unknown"
                 
-                output += f"{pv.metadata.name:<42} {capacity:<10} {access_modes:<14} {reclaim_policy:<16} {status:<11} {claim:<24} {storage_class:<14} {age_str}\n"
-            
-            return output.strip()
+                yield f"{pv.metadata.name:<42} {capacity:<10} {access_modes:<14} {reclaim_policy:<16} {status:<11} {claim:<24} {storage_class:<14} {age_str}"
             
         except Exception as e:
-            return f"Error getting persistent volumes: {str(e)}"
+            yield f"Error getting persistent volumes: {str(e)}"
 
     def _get_pvc_detailed(self, v1, namespace: str, all_namespaces: bool) -> str:
         """Get detailed persistent volume claims information"""
+        return '\n'.join(self._iter_pvc_rows(v1, namespace, all_namespaces))
+
+    def _iter_pvc_rows(self, v1, namespace: str, all_namespaces: bool, selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield detailed persistent volume claims information rows, header first"""
+        selectors = selectors or {}
+        
         try:
             if all_namespaces:
-                pvcs = v1.list_persistent_volume_claim_for_all_namespaces()
-                output = "NAMESPACE    NAME                    STATUS   VOLUME                                     CAPACITY   ACCESS MODES   STORAGECLASS   AGE\n"
+                pvcs = self._paginate(v1.list_persistent_volume_claim_for_all_namespaces, **selectors)
+                yield "NAMESPACE    NAME                    STATUS   VOLUME                                     CAPACITY   ACCESS MODES   STORAGECLASS   AGE"
             else:
                 ns = namespace or 'default'
-                pvcs = v1.list_namespaced_persistent_volume_claim(namespace=ns)
-                output = "NAME                    STATUS   VOLUME                                     CAPACITY   ACCESS MODES   STORAGECLASS   AGE\n"
+                pvcs = self._paginate(v1.list_namespaced_persistent_volume_claim, namespace=ns, **selectors)
+                yield "NAME                    STATUS   VOLUME                                     CAPACITY   ACCESS MODES   STORAGECLASS   AGE"
             
-            for pvc in pvcs.items:
+            for pvc in pvcs:
                 status = pvc.status.phase or 'unknown'
                 volume_name = pvc.spec.volume_name or "<none>"
                 
@@ -1495,41 +2108,46 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     age_str = "unknown"
                 
                 if all_namespaces:
-                    output += f"{pvc.metadata.namespace:<12} {pvc.metadata.name:<23} {status:<8} {volume_name:<42} {capacity:<10} {access_modes:<14} {storage_class:<14} {age_str}\n"
+                    yield f"{pvc.metadata.namespace:<12} {pvc.metadata.name:<23} {status:<8} {volume_name:<42} {capacity:<10} {access_modes:<14} {storage_class:<14} {age_str}"
                 else:
-                    output += f"{pvc.metadata.name:<23} {status:<8} {volume_name:<42} {capacity:<10} {access_modes:<14} {storage_class:<14} {age_str}\n"
-            
-            return output.strip()
+                    yield f"{pvc.metadata.name:<23} {status:<8} {volume_name:<42} {capacity:<10} {access_modes:<14} {storage_class:<14} {age_str}"
             
         except Exception as e:
-            return f"Error getting persistent volume claims: {str(e)}"
+            yield f"Error getting persistent volume claims: {str(e)}"
 
     def _get_all_resources(self, v1, apps_v1, namespace: str, all_namespaces: bool) -> str:
         """Get all major resources in a summary"""
-        result = "=== CLUSTER RESOURCE SUMMARY ===\n\n"
+        return '\n'.join(self._iter_all_resources_rows(v1, apps_v1, namespace, all_namespaces))
+
+    def _iter_all_resources_rows(self, v1, apps_v1, namespace: str, all_namespaces: bool,
+                                 selectors: Dict[str, str] = None) -> Iterator[str]:
+        """Yield the resource summary section by section"""
+        yield "=== CLUSTER RESOURCE SUMMARY ==="
         
         try:
-            result += "PODS:\n"
-            result += self._get_pods_detailed(v1, namespace, all_namespaces)
-            result += "\n\nSERVICES:\n"
-            result += self._get_services_detailed(v1, namespace, all_namespaces)
-            result += "\n\nDEPLOYMENTS:\n"
-            result += self._get_deployments_detailed(apps_v1, namespace, all_namespaces)
+            yield ""
+            yield "PODS:"
+            yield from self._iter_pods_rows(v1, namespace, all_namespaces, selectors)
+            yield ""
+            yield "SERVICES:"
+            yield from self._iter_services_rows(v1, namespace, all_namespaces, selectors)
+            yield ""
+            yield "DEPLOYMENTS:"
+            yield from self._iter_deployments_rows(apps_v1, namespace, all_namespaces, selectors)
             
             if all_namespaces or not namespace:
-                result += "\n\nNODES:\n"
-                result += self._get_nodes_detailed(v1)
+                yield ""
+                yield "NODES:"
+                yield from self._iter_nodes_rows(v1, selectors)
                 
         except Exception as e:
-            result += f"\nError getting all resources: {str(e)}"
-        
-        return result
+            yield f"Error getting all resources: {str(e)}"
 
     def _describe_pod_detailed(self, v1, pod_name: str, namespace: str) -> str:
         """Provide detailed pod description with enhanced analysis"""
         try:
             from kubernetes import client
-            pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+            pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace, _request_timeout=self.k8s_request_timeout)
             
             output = f"=== DETAILED POD ANALYSIS: {pod_name} ===\n\n"
             
@@ -1604,13 +2222,10 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
             
             # Events for this pod
             try:
-                events = v1.list_namespaced_event(
-                    namespace=namespace,
-                    field_selector=f"involvedObject.name={pod_name}"
-                )
-                if events.items:
+                events = self._list_events(v1, namespace, involved_object_name=pod_name)
+                if events:
                     output += f"\nRECENT EVENTS:\n"
-                    for event in sorted(events.items, key=lambda x: x.last_timestamp or x.first_timestamp, reverse=True)[:10]:
+                    for event in sorted(events, key=lambda x: x.last_timestamp or x.first_timestamp, reverse=True)[:10]:
                         output += f"  {event.type}: {event.reason} - {event.message}\n"
             except:
                 output += f"\nEvents: Could not retrieve events\n"
@@ -1648,7 +2263,8 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         """Provide detailed service description"""
         try:
             from kubernetes import client
-            service = v1.read_namespaced_service(name=service_name, namespace=namespace)
+            service = v1.read_namespaced_service(name=service_name, namespace=namespace,
+                                                 _request_timeout=self.k8s_request_timeout)
             
             output = f"=== SERVICE ANALYSIS: {service_name} ===\n\n"
             output += f"Name:         {service.metadata.name}\n"
@@ -1678,9 +2294,9 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                 # Find matching pods
                 try:
                     label_selector = ','.join([f"{k}={v}" for k, v in service.spec.selector.items()])
-                    pods = v1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
-                    output += f"\nMatching Pods ({len(pods.items)}):\n"
-                    for pod in pods.items:
+                    pods = self._list_pods(v1, namespace=namespace, label_selector=label_selector)
+                    output += f"\nMatching Pods ({len(pods)}):\n"
+                    for pod in pods:
                         output += f"  • {pod.metadata.name} ({pod.status.phase})\n"
                 except:
                     output += f"\nCould not retrieve matching pods\n"
@@ -1697,7 +2313,8 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         """Provide detailed deployment description"""
         try:
             from kubernetes import client
-            deployment = apps_v1.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+            deployment = apps_v1.read_namespaced_deployment(name=deployment_name, namespace=namespace,
+                                                            _request_timeout=self.k8s_request_timeout)
             
             output = f"=== DEPLOYMENT ANALYSIS: {deployment_name} ===\n\n"
             output += f"Name:            {deployment.metadata.name}\n"
@@ -1743,7 +2360,7 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         """Provide detailed node description"""
         try:
             from kubernetes import client
-            node = v1.read_node(name=node_name)
+            node = v1.read_node(name=node_name, _request_timeout=self.k8s_request_timeout)
             
             output = f"=== NODE ANALYSIS: {node_name} ===\n\n"
             output += f"Name:                 {node.metadata.name}\n"
@@ -1796,25 +2413,61 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
             else:
                 return f"Error describing node '{node_name}': {e.reason}"
 
+    def _iter_pod_log_matches(self, error_pattern: str, v1, stats: LogSearchResult) -> Iterator[LogMatch]:
+        """Yield pod log matches as the concurrent reads complete; accounting goes into stats"""
+        # Only Running and Failed pods have logs worth searching; let the API server do the filtering
+        pods = self._list_pods(
+            v1, field_selector="status.phase!=Pending,status.phase!=Succeeded,status.phase!=Unknown"
+        )
+        
+        start = time.monotonic()
+        yield from self.log_fetcher.iter_search(
+            v1, pods, error_pattern, stats=stats,
+            match_log=partial(self._match_pod_log, v1)
+        )
+        stats.elapsed = time.monotonic() - start
+        
+        self.logger.info(f"Searched {stats.scanned} pod log(s) in {stats.elapsed:.2f}s")
+
+    def _match_pod_log(self, v1, namespace: str, pod: str, container: Optional[str], tail_lines: int,
+                       timeout: float, regex) -> Tuple[List[str], List[str]]:
+        """Matching lines and known pattern IDs; memoized per cursor, so only new log lines are searched"""
+        matching_lines = self.log_cursors.match_lines(v1, namespace, pod, container, regex,
+                                                      tail_lines=tail_lines, request_timeout=timeout)
+        if not matching_lines:
+            return [], []
+        scan = self.log_cursors.scan(v1, namespace, pod, container, scanner=self.log_scanner, tail_lines=tail_lines)
+        return matching_lines, list(scan.pattern_hits)
+
+    @staticmethod
+    def _format_log_match(match: LogMatch) -> str:
+        target = f"{match.namespace}/{match.pod}"
+        if match.container:
+            target += f" (container: {match.container})"
+        finding = f"Pod {target}: {match.hits} matching line(s) in logs"
+        if match.pattern_ids:
+            finding += f" [known patterns: {', '.join(match.pattern_ids)}]"
+        return finding
+
+    def _log_search_note(self, stats: LogSearchResult) -> Optional[str]:
+        if stats.complete:
+            return None
+        return (f"Log search incomplete: {len(stats.errors)} read(s) failed, "
+                f"{stats.timed_out} not reached before the {self.log_fetcher.deadline:.0f}s deadline")
+
     def _search_error_in_pods(self, error_pattern: str, v1) -> list:
-        """Search for error pattern in pod logs across all namespaces"""
+        """Search for error pattern in pod logs across all namespaces, ranked by hit count"""
         findings = []
         try:
-            pods = v1.list_pod_for_all_namespaces()
-            
-            for pod in pods.items:
-                if pod.status.phase == "Running" or pod.status.phase == "Failed":
-                    try:
-                        logs = v1.read_namespaced_pod_log(
-                            name=pod.metadata.name,
-                            namespace=pod.metadata.namespace,
-                            tail_lines=100
-                        )
-                        
-                        if error_pattern.lower() in logs.lower():
-                            findings.append(f"Pod {pod.metadata.namespace}/{pod.metadata.name}: Found in logs")
-                    except:
-                        pass  # Skip pods without logs
+            stats = LogSearchResult()
+            matches = list(self._iter_pod_log_matches(error_pattern, v1, stats))
+            matches.sort(key=lambda match: match.hits, reverse=True)
+            
+            findings = [self._format_log_match(match) for match in matches]
+            
+            note = self._log_search_note(stats)
+            if note:
+                findings.append(note)
             
         except Exception as e:
             findings.append(f"Error searching pod logs: {str(e)}")
@@ -1825,12 +2478,15 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         """Search for error pattern in cluster events"""
         findings = []
         try:
-            events = v1.list_event_for_all_namespaces()
+            events = self._iter_events(v1)
             
-            for event in events.items:
-                if (error_pattern.lower() in event.message.lower() or 
-                    error_pattern.lower() in event.reason.lower()):
-                    findings.append(f"Event in {event.namespace}: {event.reason} - {event.message[:100]}")
+            pattern = error_pattern.lower()
+            for event in events:
+                reason = event.reason or ''
+                message = event.message or ''
+                if pattern in message.lower() or pattern in reason.lower():
+                    namespace = event.metadata.namespace if event.metadata else ''
+                    findings.append(f"Event in {namespace}: {reason} - {message[:100]}")
             
         except Exception as e:
             findings.append(f"Error searching events: {str(e)}")
@@ -1841,9 +2497,9 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         """Find pods with related issues"""
         issues = []
         try:
-            pods = v1.list_pod_for_all_namespaces()
+            pods = self._iter_pods(v1)
             
-            for pod in pods.items:
+            for pod in pods:
                 pod_issues = []
                 
                 # Check pod status
@@ -1879,9 +2535,9 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         """Check for node-level issues that might be related"""
         issues = []
         try:
-            nodes = v1.list_node()
+            nodes = self._iter_nodes(v1)
             
-            for node in nodes.items:
+            for node in nodes:
                 node_issues = []
                 
                 if node.status.conditions:
@@ -2000,19 +2656,19 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
         try:
             analysis_result = "=== TIMESTAMP CORRELATION ANALYSIS ===\n"
             
-            # Get all events in last hour sorted by time
-            events = v1.list_event_for_all_namespaces()
+            # Get all events in last hour sorted by time (streamed page by page; the API has no time selector)
+            events = self._iter_events(v1)
             recent_events = []
             
             current_time = datetime.now(timezone.utc)
             one_hour_ago = current_time - timedelta(hours=1)
             
-            for event in events.items:
+            for event in events:
                 event_time = event.last_timestamp or event.first_timestamp
                 if event_time and event_time >= one_hour_ago:
                     recent_events.append({
                         'time': event_time,
-                        'namespace': event.namespace,
+                        'namespace': event.metadata.namespace if event.metadata else '',
                         'object': f"{event.involved_object.kind}/{event.involved_object.name}",
                         'reason': event.reason,
                         'message': event.message,
@@ -2058,7 +2714,7 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
     def _analyze_target_pod(self, pod_name: str, namespace: str, v1) -> str:
         """Analyze the target pod in detail"""
         try:
-            pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+            pod = self._read_pod(v1, pod_name, namespace)
             
             analysis = f"Pod: {pod_name}\n"
             analysis += f"Namespace: {namespace}\n"
@@ -2092,39 +2748,31 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
     def _get_timestamped_logs(self, pod_name: str, namespace: str, v1) -> str:
         """Get pod logs with timestamp analysis"""
         try:
-            logs = v1.read_namespaced_pod_log(
-                name=pod_name,
-                namespace=namespace,
-                timestamps=True,
-                tail_lines=50
-            )
-            
-            log_lines = logs.split('\n')
-            error_lines = []
-            warning_lines = []
-            
-            for line in log_lines:
-                line_lower = line.lower()
-                if any(error_word in line_lower for error_word in ['error', 'failed', 'exception', 'fatal']):
-                    error_lines.append(line)
-                elif any(warn_word in line_lower for warn_word in ['warn', 'warning', 'deprecated']):
-                    warning_lines.append(line)
+            # Only lines appended since the previous analysis of this pod are scanned
+            scan = self.log_cursors.scan(v1, namespace, pod_name, scanner=self.log_scanner,
+                                         tail_lines=50, timestamps=True)
+            error_lines = scan.error_lines
+            warning_lines = scan.warning_lines
             
             analysis = f"Log Summary (last 50 lines):\n"
-            analysis += f"Total lines: {len(log_lines)}\n"
-            analysis += f"Error lines: {len(error_lines)}\n"
-            analysis += f"Warning lines: {len(warning_lines)}\n\n"
+            analysis += f"Total lines: {scan.total_lines}\n"
+            analysis += f"Error lines: {scan.error_count}\n"
+            analysis += f"Warning lines: {scan.warning_count}\n"
+            if scan.pattern_hits:
+                patterns = ', '.join(f"{pattern_id} ({hits})" for pattern_id, hits in scan.pattern_hits.items())
+                analysis += f"Known issue patterns: {patterns}\n"
+            analysis += "\n"
             
             if error_lines:
                 analysis += "🚨 Recent Errors:\n"
-                for line in error_lines[-5:]:  # Show last 5 errors
-                    analysis += f"  {line}\n"
+                for match in error_lines[-5:]:  # Show last 5 errors
+                    analysis += f"  {match.text}\n"
                 analysis += "\n"
             
             if warning_lines:
                 analysis += "⚠️ Recent Warnings:\n"
-                for line in warning_lines[-3:]:  # Show last 3 warnings
-                    analysis += f"  {line}\n"
+                for match in warning_lines[-3:]:  # Show last 3 warnings
+                    analysis += f"  {match.text}\n"
             
             return analysis
             
@@ -2134,16 +2782,14 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
     def _correlate_namespace_pods(self, target_pod: str, namespace: str, v1) -> str:
         """Correlate with other pods in the same namespace"""
         try:
-            pods = v1.list_namespaced_pod(namespace=namespace)
+            # Everything except the target pod, filtered by the API server
+            pods = self._iter_pods(v1, namespace=namespace, field_selector=f"metadata.name!={target_pod}")
             
             correlation = f"Pods in namespace '{namespace}':\n"
             healthy_pods = 0
             unhealthy_pods = 0
             
-            for pod in pods.items:
-                if pod.metadata.name == target_pod:
-                    continue
-                
+            for pod in pods:
                 status = "✅ Healthy"
                 if pod.status.phase != 'Running':
                     status = f"❌ {pod.status.phase}"
@@ -2176,24 +2822,20 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
     def _correlate_cluster_events(self, pod_name: str, namespace: str, v1) -> str:
         """Correlate with cluster events in the same timeframe"""
         try:
-            events = v1.list_namespaced_event(namespace=namespace)
-            
-            # Find events related to the target pod
-            pod_events = []
-            related_events = []
-            
             current_time = datetime.now(timezone.utc)
             five_minutes_ago = current_time - timedelta(minutes=5)
             
-            for event in events.items:
-                event_time = event.last_timestamp or event.first_timestamp
-                if not event_time or event_time < five_minutes_ago:
-                    continue
-                
-                if event.involved_object.name == pod_name:
-                    pod_events.append(event)
-                else:
-                    related_events.append(event)
+            def recent(events):
+                # Events have no time-based field selector, so the age filter runs while pages stream in
+                for event in events:
+                    event_time = event.last_timestamp or event.first_timestamp
+                    if event_time and event_time >= five_minutes_ago:
+                        yield event
+            
+            # Split direct and related events on the API server via involvedObject.name selectors
+            pod_events = list(recent(self._iter_events(v1, namespace, involved_object_name=pod_name)))
+            related_events = list(recent(self._iter_events(
+                v1, namespace, field_selector=f"involvedObject.name!={pod_name}")))
             
             correlation = f"Events in last 5 minutes:\n"
             correlation += f"Direct pod events: {len(pod_events)}\n"
@@ -2223,7 +2865,7 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
             recommendations = []
             
             # Get pod creation time and current status
-            pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+            pod = self._read_pod(v1, pod_name, namespace)
             created_time = pod.metadata.creation_timestamp
             current_time = datetime.now(timezone.utc)
             pod_age = current_time - created_time
@@ -2275,18 +2917,19 @@ Focus on being practical, safe, and leveraging the historical patterns and exper
                     response_text += f"❌ {result}"
                 else:
                     # Analyze logs for errors
-                    log_lines = result.split('\n')
-                    error_count = sum(1 for line in log_lines if any(err in line.lower() for err in ['error', 'failed', 'exception', 'fatal']))
+                    scan = self.log_scanner.scan(result)
                     
                     response_text += f"**Log Summary:**\n"
-                    response_text += f"- Total lines: {len(log_lines)}\n"
-                    response_text += f"- Error indicators: {error_count}\n\n"
+                    response_text += f"- Total lines: {scan.total_lines}\n"
+                    response_text += f"- Error indicators: {scan.error_count}\n"
+                    if scan.pattern_hits:
+                        response_text += f"- Known issue patterns: {', '.join(scan.pattern_hits)}\n"
+                    response_text += "\n"
                     
-                    if error_count > 0:
+                    if scan.error_count > 0:
                         response_text += "**Recent Errors Found:**\n"
-                        error_lines = [line for line in log_lines if any(err in line.lower() for err in ['error', 'failed', 'exception', 'fatal'])]
-                        for line in error_lines[-5:]:  # Show last 5 errors
-                            response_text += f"⚠️ {line}\n"
+                        for match in scan.error_lines[-5:]:  # Show last 5 errors
+                            response_text += f"⚠️ {match.text}\n"
                         response_text += "\n"
                     
                     response_text += f"**Full Logs:**\n```\n{result}\n```"
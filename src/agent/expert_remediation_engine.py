@@ -4,8 +4,9 @@ import re
 import subprocess
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any, Iterable
+from collections import Counter
+from dataclasses import dataclass, field
 import os
 import sys
 
@@ -14,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent.issue_history_manager import IssueHistoryManager
 from agent.utils import SafetyValidator, SystemMonitor
+from agent.pattern_matcher import PatternMatcher, PatternScore
 
 @dataclass
 class IssuePattern:
@@ -39,6 +41,16 @@ class MatchResult:
     historical_context: Dict[str, Any]
     root_cause_prediction: str
 
+@dataclass
+class BatchMatchResult:
+    """Represents pattern matches aggregated over a batch of log lines or alerts"""
+    total_lines: int = 0
+    unique_lines: int = 0
+    matched_lines: int = 0
+    pattern_hits: Dict[str, int] = field(default_factory=dict)
+    exemplars: Dict[str, List[str]] = field(default_factory=dict)
+    matches: Dict[str, MatchResult] = field(default_factory=dict)
+
 class ExpertRemediationEngine:
     """
     Expert Remediation Engine - The brain of the expert system
@@ -49,6 +61,7 @@ class ExpertRemediationEngine:
     - Safety-first command execution with validation
     - Real-time system health monitoring
     - Root cause prediction based on historical patterns
+    - Single-pass indexed pattern matcher rebuilt whenever the knowledge base is loaded
     """
     
     def __init__(self, patterns_file: str = None, history_file: str = None):
@@ -62,7 +75,7 @@ class ExpertRemediationEngine:
             
         # Load components
         self.knowledge_base = self.load_knowledge_base(patterns_file)
-        self.issue_history = IssueHistoryManager(history_file)
+        self.issue_history = IssueHistoryManager.shared(history_file)
         self.safety_validator = SafetyValidator()
         self.system_monitor = SystemMonitor()
         
@@ -73,6 +86,9 @@ class ExpertRemediationEngine:
             'pattern_specificity': 0.05
         }
         
+        # pattern_id -> (history version, prediction text)
+        self._prediction_cache: Dict[str, Tuple[int, str]] = {}
+        
         self.logger.info(f"Expert Remediation Engine initialized with {len(self.knowledge_base)} patterns")
 
     def load_knowledge_base(self, patterns_file: str) -> Dict[str, IssuePattern]:
@@ -98,11 +114,15 @@ class ExpertRemediationEngine:
                     remediation_steps=pattern_data['remediation_steps']
                 )
                 knowledge_base[pattern_id] = pattern
+            
+            # Compile regexes and index keywords once instead of on every query
+            self.pattern_matcher = PatternMatcher(knowledge_base)
                 
             return knowledge_base
             
         except Exception as e:
             self.logger.error(f"Error loading knowledge base: {e}")
+            self.pattern_matcher = PatternMatcher({})
             return {}
 
     def recognize_issue_pattern(self, user_input: str, system_context: Dict = None) -> Optional[MatchResult]:
@@ -117,57 +137,130 @@ class ExpertRemediationEngine:
             MatchResult with confidence scoring and historical context
         """
         try:
-            user_input_lower = user_input.lower()
-            best_match = None
-            highest_confidence = 0.0
+            matches = self.match_patterns(user_input, system_context, top_n=1)
+            if not matches:
+                return None
             
-            for pattern_id, pattern in self.knowledge_base.items():
-                confidence = self._calculate_confidence(pattern, user_input_lower, system_context)
-                
-                if confidence > highest_confidence and confidence > 0.5:  # Minimum confidence threshold
-                    matched_keywords = [kw for kw in pattern.keywords if kw.lower() in user_input_lower]
-                    matched_regex = []
-                    
-                    # Check regex patterns
-                    for regex_pattern in pattern.regex_patterns:
-                        if re.search(regex_pattern, user_input_lower, re.IGNORECASE):
-                            matched_regex.append(regex_pattern)
-                    
-                    # Get historical context
-                    historical_context = self.issue_history.get_pattern_history(pattern_id)
-                    
-                    # Predict root cause
-                    root_cause_prediction = self._predict_root_cause(pattern_id, historical_context, system_context)
-                    
-                    best_match = MatchResult(
-                        pattern=pattern,
-                        confidence=confidence,
-                        matched_keywords=matched_keywords,
-                        matched_regex=matched_regex,
-                        historical_context=historical_context,
-                        root_cause_prediction=root_cause_prediction
-                    )
-                    highest_confidence = confidence
-            
-            return best_match
+            best = matches[0]
+            
+            # Get historical context
+            historical_context = self.issue_history.get_pattern_summary(best.pattern_id)['history']
+            
+            # Predict root cause
+            root_cause_prediction = self._predict_root_cause(best.pattern_id, historical_context, system_context)
+            
+            return MatchResult(
+                pattern=self.knowledge_base[best.pattern_id],
+                confidence=best.confidence,
+                matched_keywords=best.matched_keywords,
+                matched_regex=best.matched_regex,
+                historical_context=historical_context,
+                root_cause_prediction=root_cause_prediction
+            )
             
         except Exception as e:
             self.logger.error(f"Error in pattern recognition: {e}")
             return None
 
-    def _calculate_confidence(self, pattern: IssuePattern, user_input: str, system_context: Dict = None) -> float:
-        """Calculate confidence score for pattern match"""
-        base_confidence = pattern.confidence_base
+    def match_patterns(self, user_input: str, system_context: Dict = None, top_n: int = 5,
+                       min_confidence: float = 0.5) -> List[PatternScore]:
+        """
+        Score every pattern against the input in one pass and return the top_n above min_confidence
         
-        # Keyword matching score
-        keyword_matches = sum(1 for kw in pattern.keywords if kw.lower() in user_input)
-        keyword_score = (keyword_matches / len(pattern.keywords)) * 0.4
+        Args:
+            user_input: Natural language description, log line or alert message
+            system_context: Current system state information
+            top_n: Maximum number of matches to return
+            min_confidence: Minimum confidence threshold (exclusive)
+            
+        Returns:
+            PatternScore list, highest confidence first
+        """
+        max_boost = self.confidence_adjustments['historical_match'] + (0.10 if system_context else 0.0)
         
-        # Regex pattern matching score
-        regex_matches = sum(1 for regex in pattern.regex_patterns 
-                          if re.search(regex, user_input, re.IGNORECASE))
-        regex_score = (regex_matches / len(pattern.regex_patterns)) * 0.3
+        return self.pattern_matcher.top_matches(
+            user_input, top_n=top_n, min_confidence=min_confidence,
+            boost=lambda pattern_id, pattern: self._pattern_boost(pattern, system_context),
+            max_boost=max_boost
+        )
+
+    def recognize_batch(self, lines: Iterable[str], system_context: Dict = None, top_n: int = 1,
+                        min_confidence: float = 0.5, max_exemplars: int = 3) -> BatchMatchResult:
+        """
+        Classify many log lines or alert messages against the expert patterns in one call
+        
+        Identical messages are classified once, context boosts and historical lookups are
+        computed once per pattern, and only lines with a keyword or regex hit are attributed.
         
+        Args:
+            lines: Log lines or alert messages
+            system_context: Current system state information
+            top_n: Patterns attributed per line
+            min_confidence: Minimum confidence threshold (exclusive)
+            max_exemplars: Distinct example lines kept per pattern
+            
+        Returns:
+            BatchMatchResult with per-pattern hit counts, exemplar lines and the best MatchResult per pattern
+        """
+        result = BatchMatchResult()
+        
+        try:
+            counts = Counter()
+            for line in lines:
+                result.total_lines += 1
+                line = line.strip()
+                if line:
+                    counts[line] += 1
+            result.unique_lines = len(counts)
+            
+            boosts: Dict[str, float] = {}
+            
+            def boost(pattern_id: str, pattern: IssuePattern) -> float:
+                if pattern_id not in boosts:
+                    boosts[pattern_id] = self._pattern_boost(pattern, system_context)
+                return boosts[pattern_id]
+            
+            max_boost = self.confidence_adjustments['historical_match'] + (0.10 if system_context else 0.0)
+            best_scores: Dict[str, PatternScore] = {}
+            
+            for line, count in counts.items():
+                scores = self.pattern_matcher.top_matches(line, top_n=top_n, min_confidence=min_confidence,
+                                                          boost=boost, max_boost=max_boost, require_hit=True)
+                if not scores:
+                    continue
+                
+                result.matched_lines += count
+                for score in scores:
+                    result.pattern_hits[score.pattern_id] = result.pattern_hits.get(score.pattern_id, 0) + count
+                    
+                    exemplars = result.exemplars.setdefault(score.pattern_id, [])
+                    if len(exemplars) < max_exemplars:
+                        exemplars.append(line)
+                    
+                    if score.pattern_id not in best_scores or score.confidence > best_scores[score.pattern_id].confidence:
+                        best_scores[score.pattern_id] = score
+            
+            # Historical context and root cause prediction once per matched pattern
+            for pattern_id, score in best_scores.items():
+                historical_context = self.issue_history.get_pattern_summary(pattern_id)['history']
+                result.matches[pattern_id] = MatchResult(
+                    pattern=self.knowledge_base[pattern_id],
+                    confidence=score.confidence,
+                    matched_keywords=score.matched_keywords,
+                    matched_regex=score.matched_regex,
+                    historical_context=historical_context,
+                    root_cause_prediction=self._predict_root_cause(pattern_id, historical_context, system_context)
+                )
+            
+            result.pattern_hits = dict(sorted(result.pattern_hits.items(), key=lambda item: item[1], reverse=True))
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Error in batch pattern recognition: {e}")
+            return result
+
+    def _pattern_boost(self, pattern: IssuePattern, system_context: Dict = None) -> float:
+        """Historical and system-context confidence adjustments for a pattern"""
         # Historical match adjustment
         historical_boost = 0.0
         pattern_id = f"{pattern.category.lower().replace(' ', '_')}_{pattern.name.lower().replace(' ', '_')}"
@@ -179,8 +272,23 @@ class ExpertRemediationEngine:
         if system_context:
             context_boost = self._calculate_context_relevance(pattern, system_context)
         
+        return historical_boost + context_boost
+
+    def _calculate_confidence(self, pattern: IssuePattern, user_input: str, system_context: Dict = None) -> float:
+        """Calculate confidence score for pattern match"""
+        base_confidence = pattern.confidence_base
+        
+        # Keyword matching score
+        keyword_matches = sum(1 for kw in pattern.keywords if kw.lower() in user_input)
+        keyword_score = (keyword_matches / len(pattern.keywords)) * 0.4
+        
+        # Regex pattern matching score
+        regex_matches = sum(1 for regex in pattern.regex_patterns 
+                          if re.search(regex, user_input, re.IGNORECASE))
+        regex_score = (regex_matches / len(pattern.regex_patterns)) * 0.3
+        
         # Calculate final confidence
-        final_confidence = min(1.0, base_confidence + keyword_score + regex_score + historical_boost + context_boost)
+        final_confidence = min(1.0, base_confidence + keyword_score + regex_score + self._pattern_boost(pattern, system_context))
         
         return final_confidence
 
@@ -198,7 +306,8 @@ class ExpertRemediationEngine:
         elif pattern.category == "Ubuntu OS":
             if system_context.get('os_type') == 'ubuntu':
                 relevance += 0.05
-            if pattern.name == "Disk Space Issues" and system_context.get('disk_usage', 0) > 80:
+            disk_usage = system_context.get('disk_usage', 0)
+            if pattern.name == "Disk Space Issues" and isinstance(disk_usage, (int, float)) and disk_usage > 80:
                 relevance += 0.10
                 
         elif pattern.category == "GlusterFS":
@@ -208,7 +317,17 @@ class ExpertRemediationEngine:
         return min(0.10, relevance)  # Cap at 10% boost
 
     def _predict_root_cause(self, pattern_id: str, historical_context: Dict, system_context: Dict = None) -> str:
-        """Predict root cause based on historical data and current context"""
+        """Predict root cause based on historical data and current context (memoized per history version)"""
+        version = self.issue_history.get_pattern_version(pattern_id)
+        cached = self._prediction_cache.get(pattern_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        prediction = self._format_root_cause_prediction(historical_context)
+        self._prediction_cache[pattern_id] = (version, prediction)
+        return prediction
+
+    def _format_root_cause_prediction(self, historical_context: Dict) -> str:
         if not historical_context.get('patterns'):
             return "No historical data available for prediction"
         
@@ -471,6 +590,7 @@ class ExpertRemediationEngine:
                 'timestamp': datetime.now(timezone.utc).isoformat(),
                 'system_health': self.get_system_health_status(),
                 'detected_issues': [],
+                'failed_units': [],
                 'recommendations': [],
                 'confidence_scores': {}
             }
@@ -478,20 +598,26 @@ class ExpertRemediationEngine:
             # Get current system context
             system_context = diagnosis['system_health']
             
+            # Watched systemd units in the 'failed' state (from the cached batched query)
+            diagnosis['failed_units'] = self._failed_units(system_context)
+            
             # Check for potential issues based on system state
             potential_issues = self._detect_potential_issues(system_context)
             
             for issue in potential_issues:
                 match_result = self.recognize_issue_pattern(issue['description'], system_context)
                 if match_result:
-                    diagnosis['detected_issues'].append({
+                    detected = {
                         'pattern': match_result.pattern.name,
                         'category': match_result.pattern.category,
                         'confidence': match_result.confidence,
                         'severity': match_result.pattern.severity,
                         'description': match_result.pattern.description,
                         'root_cause_prediction': match_result.root_cause_prediction
-                    })
+                    }
+                    if issue.get('units'):
+                        detected['affected_units'] = issue['units']
+                    diagnosis['detected_issues'].append(detected)
                     
                     diagnosis['confidence_scores'][match_result.pattern.name] = match_result.confidence
             
@@ -504,26 +630,45 @@ class ExpertRemediationEngine:
             self.logger.error(f"Error in expert diagnosis: {e}")
             return {'error': str(e)}
 
-    def _detect_potential_issues(self, system_context: Dict) -> List[Dict[str, str]]:
+    @staticmethod
+    def _failed_units(system_context: Dict) -> List[str]:
+        """Watched systemd units whose ActiveState is 'failed'"""
+        services = system_context.get('services_status', {}) or {}
+        return [unit for unit, info in services.items() if isinstance(info, dict) and info.get('status') == 'failed']
+
+    def _detect_potential_issues(self, system_context: Dict) -> List[Dict[str, Any]]:
         """Detect potential issues based on current system state"""
         potential_issues = []
         
-        # Check disk usage
-        if system_context.get('disk_usage', 0) > 85:
+        # Check disk usage (fullest mounted filesystem)
+        disk_usage = system_context.get('disk_usage', {}) or {}
+        disk_percent = max((info.get('percent', 0) for info in disk_usage.values() if isinstance(info, dict)), default=0)
+        if disk_percent > 85:
             potential_issues.append({
                 'description': 'High disk usage detected, potential disk space issues',
                 'category': 'Ubuntu OS'
             })
         
         # Check memory usage
-        if system_context.get('memory_usage', 0) > 90:
+        resource_usage = system_context.get('resource_usage', {}) or {}
+        if resource_usage.get('memory_percent', 0) > 90:
             potential_issues.append({
                 'description': 'High memory usage detected, potential memory pressure',
                 'category': 'Ubuntu OS'
             })
         
+        # Check watched systemd units
+        failed_units = self._failed_units(system_context)
+        if failed_units:
+            potential_issues.append({
+                'description': f"systemd service failed: {', '.join(failed_units)}",
+                'category': 'Ubuntu OS',
+                'units': failed_units
+            })
+        
         # Check for failed pods (if Kubernetes context available)
-        if system_context.get('kubernetes_available') and system_context.get('failed_pods', 0) > 0:
+        kubernetes = system_context.get('kubernetes_status', {}) or {}
+        if kubernetes.get('available') and kubernetes.get('failed_pods', 0) > 0:
             potential_issues.append({
                 'description': 'Failed pods detected in Kubernetes cluster',
                 'category': 'Kubernetes'
@@ -550,8 +695,11 @@ class ExpertRemediationEngine:
             elif issue['category'] == 'GlusterFS':
                 recommendations.append("Schedule regular GlusterFS health checks")
         
+        for unit in diagnosis.get('failed_units', []):
+            recommendations.append(f"Inspect failed unit {unit}: journalctl -u {unit} -n 50")
+        
         # General recommendations if no issues found
-        if not diagnosis.get('detected_issues'):
+        if not diagnosis.get('detected_issues') and not diagnosis.get('failed_units'):
             recommendations.extend([
                 "System appears healthy - continue regular monitoring",
                 "Consider implementing preventive maintenance schedules",
@@ -0,0 +1,145 @@
+"""
+History Rollups - Bounded hourly/daily aggregates of issue occurrences for long-range trend analysis
+"""
+
+import bisect
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .history_storage import to_epoch
+
+HOUR = 3600
+DAY = 86400
+
+# Buckets kept per tier: two weeks of hours, half a year of days
+DEFAULT_TIERS = {
+    'hourly': (HOUR, 'HISTORY_HOURLY_BUCKETS', 336),
+    'daily': (DAY, 'HISTORY_DAILY_BUCKETS', 180)
+}
+
+def tier_sizes() -> Dict[str, Tuple[int, int]]:
+    """tier name -> (bucket width in seconds, bucket count), configurable through the environment"""
+    return {name: (width, int(os.getenv(env, str(default)))) for name, (width, env, default) in DEFAULT_TIERS.items()}
+
+def new_series() -> Dict[str, Any]:
+    """
+    Empty rollup series: parallel arrays over the non-empty buckets, oldest first
+
+    bucket:          bucket index (epoch seconds // bucket width)
+    count:           occurrences in the bucket
+    success:         successful resolutions in the bucket
+    resolution_time: summed resolution time of the successful ones
+    """
+    return {'bucket': [], 'count': [], 'success': [], 'resolution_time': []}
+
+def add_to_series(series: Dict[str, Any], ts: int, width: int, size: int,
+                  success: bool, resolution_time: float) -> None:
+    """Fold one occurrence into its bucket and drop buckets that fell out of the `size`-bucket window"""
+    bucket = ts // width
+    buckets = series['bucket']
+
+    if buckets and bucket <= buckets[-1] - size:
+        # Older than the retention window
+        return
+
+    position = bisect.bisect_left(buckets, bucket)
+    if position == len(buckets) or buckets[position] != bucket:
+        for key, value in (('bucket', bucket), ('count', 0), ('success', 0), ('resolution_time', 0)):
+            series[key].insert(position, value)
+
+    series['count'][position] += 1
+    if success:
+        series['success'][position] += 1
+        if isinstance(resolution_time, (int, float)) and resolution_time > 0:
+            series['resolution_time'][position] += resolution_time
+
+    expired = bisect.bisect_right(buckets, buckets[-1] - size)
+    if expired:
+        for key in ('bucket', 'count', 'success', 'resolution_time'):
+            del series[key][:expired]
+
+def iter_buckets(series: Dict[str, Any], width: int) -> Iterator[Tuple[int, int, int, float]]:
+    """(bucket start epoch, count, successes, summed resolution time) for every non-empty bucket, oldest first"""
+    if not series:
+        return
+    yield from zip((bucket * width for bucket in series['bucket']),
+                   series['count'], series['success'], series['resolution_time'])
+
+def new_rollups() -> Dict[str, Dict[str, Any]]:
+    return {name: new_series() for name in DEFAULT_TIERS}
+
+def add_occurrence(rollups: Dict[str, Dict[str, Any]], occurrence: Dict[str, Any]) -> None:
+    """Record one occurrence in every tier"""
+    try:
+        ts = to_epoch(occurrence['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return
+    for name, (width, size) in tier_sizes().items():
+        add_to_series(rollups.setdefault(name, new_series()), ts, width, size,
+                      bool(occurrence.get('success')), occurrence.get('resolution_time', 0))
+
+def summarize(rollups: Dict[str, Dict[str, Any]], tier: str = 'daily') -> Dict[str, Any]:
+    """Totals over one tier: occurrences, success rate and mean resolution time"""
+    width = tier_sizes()[tier][0]
+    total = successes = 0
+    resolution_total = 0.0
+    for _, count, success, resolution_time in iter_buckets((rollups or {}).get(tier), width):
+        total += count
+        successes += success
+        resolution_total += resolution_time
+    return {
+        'occurrences': total,
+        'success_rate': successes / total if total else 0.0,
+        'avg_resolution_time': resolution_total / successes if successes else 0.0
+    }
+
+def series_rows(rollups: Dict[str, Dict[str, Any]], tier: str = 'daily') -> List[Dict[str, Any]]:
+    """Non-empty buckets of one tier as rows for display"""
+    width = tier_sizes()[tier][0]
+    return [
+        {
+            'start': datetime.fromtimestamp(start, timezone.utc).isoformat(),
+            'count': count,
+            'success_rate': round(success / count, 3),
+            'avg_resolution_time': round(resolution_time / success, 1) if success else 0
+        }
+        for start, count, success, resolution_time in iter_buckets((rollups or {}).get(tier), width)
+    ]
+
+def frequency_trend(rollups: Dict[str, Dict[str, Any]], now: float, recent_days: int = 7,
+                    baseline_days: int = 28) -> Optional[str]:
+    """
+    Compare the daily rate of the last `recent_days` with the `baseline_days` before them
+
+    Returns None when there are too few occurrences for a rate comparison.
+    """
+    recent = baseline = 0
+    today = int(now) // DAY
+    for start, count, _, _ in iter_buckets((rollups or {}).get('daily'), DAY):
+        age = today - start // DAY
+        if age < recent_days:
+            recent += count
+        elif age < recent_days + baseline_days:
+            baseline += count
+
+    if recent + baseline < 3:
+        return None
+
+    recent_rate = recent / recent_days
+    baseline_rate = baseline / baseline_days
+    if recent_rate > baseline_rate * 1.5:
+        return "increasing"
+    if recent_rate < baseline_rate * 0.5:
+        return "decreasing"
+    return "stable"
+
+def time_profile(rollups: Dict[str, Dict[str, Any]]) -> Tuple[List[int], List[int]]:
+    """Occurrence counts by hour of day (hourly tier) and by weekday (daily tier)"""
+    hours = [0] * 24
+    weekdays = [0] * 7
+    for start, count, _, _ in iter_buckets((rollups or {}).get('hourly'), HOUR):
+        hours[(start // HOUR) % 24] += count
+    for start, count, _, _ in iter_buckets((rollups or {}).get('daily'), DAY):
+        weekdays[datetime.fromtimestamp(start, timezone.utc).weekday()] += count
+    return hours, weekdays
@@ -0,0 +1,729 @@
+"""
+History Storage - Persistence engines for issue history (JSON journal + snapshot, or SQLite)
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # No cross-process locking without fcntl (Windows); threads are still serialized
+    fcntl = None
+
+SEVERITY_SCORES = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+def to_epoch(timestamp: str) -> int:
+    """ISO-8601 timestamp (trailing Z allowed, naive treated as UTC) to epoch seconds"""
+    parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def journal_path_for(snapshot_path: str) -> str:
+    """Journal file kept next to a snapshot (historical_issues.json -> historical_issues.journal)"""
+    root, _ = os.path.splitext(snapshot_path)
+    return f"{root}.journal"
+
+def lock_path_for(snapshot_path: str) -> str:
+    """Lock file serializing writers of one history store across processes"""
+    root, _ = os.path.splitext(snapshot_path)
+    return f"{root}.lock"
+
+class InterProcessLock:
+    """Reentrant exclusive lock: threading.RLock within the process, flock() on a lock file across processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self) -> 'InterProcessLock':
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    self._file = open(self.path, 'a')
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except Exception:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None and self._depth == 0:
+                self._file.close()
+                self._file = None
+
+def _file_identity(path: str) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime_ns, size) of a file, or None; changes whenever a snapshot is replaced"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+def read_journal(journal_path: str) -> List[Dict[str, Any]]:
+    """Read every complete record of a journal; a torn final line from a crash is ignored"""
+    records = []
+    if not os.path.exists(journal_path):
+        return records
+
+    with open(journal_path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logging.getLogger(__name__).warning(f"Ignoring unreadable journal record {journal_path}:{line_number}")
+    return records
+
+class HistoryJournalStorage:
+    """
+    Write-ahead journal for history mutations with periodic compaction into a JSON snapshot
+
+    Features:
+    - Each mutation is one compact JSON line appended to the journal (no full-file rewrite)
+    - fsync is batched: at most once per fsync_interval, at the end of a batch() and at exit
+    - batch() groups many appends into one sequential write
+    - Compaction writes the snapshot to a temp file, fsyncs it and os.replace()s it into place,
+      then truncates the journal, so readers always see a complete snapshot
+    - Loading returns the snapshot plus the journal records to replay on top of it
+    - Multi-process safe: writers hold an flock()ed lock file (exclusive()); poll() returns only the
+      journal records other processes appended since the last read, or a full reload after they compacted
+    """
+
+    supports_queries = False
+
+    def __init__(self, snapshot_path: str, journal_path: str = None, fsync_interval: float = None,
+                 compact_threshold: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.snapshot_path = snapshot_path
+        self.source_path = snapshot_path
+        self.journal_path = journal_path or journal_path_for(snapshot_path)
+        self.fsync_interval = fsync_interval if fsync_interval is not None else float(os.getenv('HISTORY_FSYNC_INTERVAL', '1.0'))
+        self.compact_threshold = compact_threshold or int(os.getenv('HISTORY_COMPACT_RECORDS', '200'))
+
+        self._lock = threading.RLock()
+        self._process_lock = InterProcessLock(lock_path_for(snapshot_path))
+        self._file = None
+        self._batch_depth = 0
+        self._pending: List[str] = []
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+        self.records_since_compaction = 0
+        self.stats = {'appends': 0, 'writes': 0, 'fsyncs': 0, 'compactions': 0, 'polls': 0, 'reloads': 0}
+
+        # What this process has seen: the snapshot it loaded and how far it has read the journal
+        self._snapshot_identity = None
+        self._offset = 0
+
+        atexit.register(self.close)
+
+    def exclusive(self) -> InterProcessLock:
+        """Hold the store's write lock; poll() before mutating so no other process's records are skipped"""
+        return self._process_lock
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (snapshot data or None, journal records written since that snapshot)"""
+        with self.exclusive():
+            snapshot = None
+            self._snapshot_identity = _file_identity(self.snapshot_path)
+            if self._snapshot_identity is not None:
+                with open(self.snapshot_path, 'r') as f:
+                    snapshot = json.load(f)
+
+            self._offset = 0
+            records = self._read_new_records()
+            self.records_since_compaction = len(records)
+            return snapshot, records
+
+    def _read_new_records(self) -> List[Dict[str, Any]]:
+        """Complete journal records after the current offset; advances the offset past them"""
+        records = []
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return records
+
+        # An unterminated tail is a record still being written (or torn); leave it for later
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                self.logger.warning(f"Ignoring unreadable journal record in {self.journal_path}")
+        self._offset += end
+        return records
+
+    def has_changes(self) -> bool:
+        """Cheap check (two stat calls) whether another process changed the store since the last poll"""
+        if _file_identity(self.snapshot_path) != self._snapshot_identity:
+            return True
+        try:
+            return os.path.getsize(self.journal_path) != self._offset
+        except OSError:
+            return self._offset != 0
+
+    def poll(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Changes made by other processes since the last load/poll
+
+        Returns (None, new journal records) normally, or (snapshot, records) like load()
+        when another process compacted and the in-memory state must be rebuilt.
+        """
+        with self.exclusive():
+            self.stats['polls'] += 1
+            if _file_identity(self.snapshot_path) != self._snapshot_identity:
+                self.stats['reloads'] += 1
+                return self.load()
+
+            records = self._read_new_records()
+            self.records_since_compaction += len(records)
+            return None, records
+
+    def _journal(self):
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.journal_path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.journal_path, 'a+')
+            # Terminate a torn final record so it cannot swallow the next one
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != '\n':
+                    self._file.write('\n')
+        return self._file
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one record; written immediately unless inside batch()"""
+        line = json.dumps(record, separators=(',', ':'), default=str) + '\n'
+        with self.exclusive(), self._lock:
+            self._pending.append(line)
+            self.records_since_compaction += 1
+            self.stats['appends'] += 1
+            if self._batch_depth == 0:
+                self._write_pending()
+
+    def record_occurrence(self, issue_id: str, occurrence: Dict[str, Any], patterns: Dict[str, Any] = None,
+                          max_occurrences: int = None, rollups: Dict[str, Any] = None) -> None:
+        """Journal one tracked occurrence (patterns and rollups are recomputed on replay)"""
+        self.append({'op': 'track', 'issue_id': issue_id, 'occurrence': occurrence})
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+
+        with self.exclusive():
+            journal = self._journal()
+            journal.write(''.join(self._pending))
+            journal.flush()
+            # Our own records are already applied in memory; poll() must not return them
+            self._offset = os.fstat(journal.fileno()).st_size
+        self._pending = []
+        self._dirty = True
+        self.stats['writes'] += 1
+
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """fsync everything written so far"""
+        with self._lock:
+            if self._file is not None and self._dirty:
+                os.fsync(self._file.fileno())
+                self._dirty = False
+                self.stats['fsyncs'] += 1
+            self._last_fsync = time.monotonic()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Buffer appends and write + fsync them once when the outermost batch exits (holds exclusive())"""
+        with self.exclusive():
+            with self._lock:
+                self._batch_depth += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._batch_depth -= 1
+                    if self._batch_depth == 0:
+                        self._write_pending()
+                        self.sync()
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.records_since_compaction >= self.compact_threshold
+
+    def compact(self, data: Dict[str, Any]) -> None:
+        """Atomically replace the snapshot with data and start an empty journal (poll() first)"""
+        with self.exclusive(), self._lock:
+            # Anything still buffered is already reflected in data
+            self._pending = []
+
+            directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+            os.makedirs(directory, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.history_snapshot.')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+            self._fsync_directory(directory)
+
+            # The snapshot now covers every journal record, so the journal can start over
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.journal_path, 'w'):
+                pass
+
+            self._snapshot_identity = _file_identity(self.snapshot_path)
+            self._offset = 0
+            self._dirty = False
+            self.records_since_compaction = 0
+            self.stats['compactions'] += 1
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        """Write anything buffered, fsync and close the journal"""
+        with self.exclusive(), self._lock:
+            try:
+                self._write_pending()
+                self.sync()
+            except Exception as e:
+                self.logger.error(f"Error flushing history journal: {e}")
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self._process_lock.close()
+
+class SQLiteHistoryStorage:
+    """
+    SQLite (WAL mode) storage engine for issue history
+
+    Features:
+    - One row per occurrence with an epoch-integer ts column and an (issue_id, ts) index
+    - Learned patterns and hourly/daily rollups per issue, top-level sections (baselines, analytics) stored as JSON
+    - Retention of the last max_occurrences rows per issue enforced on insert
+    - Trending issues and learning analytics answered with SQL aggregates, no timestamp parsing
+    - batch() wraps many inserts in one transaction
+    - Multi-process safe: writers use BEGIN IMMEDIATE transactions (exclusive()); PRAGMA data_version
+      tells poll() that another connection committed, and only the issues it touched are re-read
+    """
+
+    supports_queries = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS occurrences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            issue_id TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            severity TEXT,
+            resolution_time NUMERIC,
+            success INTEGER NOT NULL DEFAULT 0,
+            root_cause TEXT,
+            resolution_method TEXT,
+            confidence_score REAL,
+            system_context TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_occurrences_issue_ts ON occurrences (issue_id, ts);
+        CREATE INDEX IF NOT EXISTS idx_occurrences_ts ON occurrences (ts);
+        CREATE TABLE IF NOT EXISTS issues (
+            issue_id TEXT PRIMARY KEY,
+            patterns TEXT NOT NULL,
+            rollups TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.source_path = db_path
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        # Autocommit mode; transactions are opened explicitly
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+
+        # Databases created before rollups were stored
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(issues)')}
+        if 'rollups' not in columns:
+            self._conn.execute("ALTER TABLE issues ADD COLUMN rollups TEXT NOT NULL DEFAULT '{}'")
+
+        self.records_since_compaction = 0
+        self.stats = {'appends': 0, 'transactions': 0, 'polls': 0, 'reloads': 0}
+
+        # What this connection has seen: data_version after the last load/poll and the newest occurrence id
+        self._data_version = None
+        self._last_id = 0
+
+        atexit.register(self.close)
+
+    @property
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM issues LIMIT 1').fetchone() is None and \
+                   self._conn.execute('SELECT 1 FROM metadata LIMIT 1').fetchone() is None
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (history data or None when the database is empty, []); there is nothing to replay"""
+        with self._lock:
+            self._data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            self._last_id = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM occurrences').fetchone()[0]
+            if self.is_empty:
+                return None, []
+
+            data: Dict[str, Any] = {
+                key: json.loads(value) for key, value in self._conn.execute('SELECT key, value FROM metadata')
+            }
+            issue_history = {}
+            for row in self._conn.execute('SELECT issue_id, patterns, rollups FROM issues ORDER BY rowid'):
+                issue_history[row['issue_id']] = {'occurrences': [], 'patterns': json.loads(row['patterns'])}
+                rollups = json.loads(row['rollups'])
+                if rollups:
+                    issue_history[row['issue_id']]['rollups'] = rollups
+
+            for row in self._conn.execute('SELECT * FROM occurrences ORDER BY id'):
+                issue = issue_history.setdefault(row['issue_id'], {'occurrences': [], 'patterns': {}})
+                issue['occurrences'].append(self._row_to_occurrence(row))
+
+            data['issue_history'] = issue_history
+            return data, []
+
+    def _load_issue(self, issue_id: str) -> Dict[str, Any]:
+        row = self._conn.execute('SELECT patterns, rollups FROM issues WHERE issue_id = ?', (issue_id,)).fetchone()
+        history = {
+            'occurrences': [
+                self._row_to_occurrence(occurrence) for occurrence in
+                self._conn.execute('SELECT * FROM occurrences WHERE issue_id = ? ORDER BY id', (issue_id,))
+            ],
+            'patterns': json.loads(row['patterns']) if row else {}
+        }
+        rollups = json.loads(row['rollups']) if row else {}
+        if rollups:
+            history['rollups'] = rollups
+        return history
+
+    def has_changes(self) -> bool:
+        """Cheap check whether another connection committed since the last load/poll"""
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0] != self._data_version
+
+    def poll(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Changes committed by other connections since the last load/poll
+
+        Returns (None, [{'op': 'replace', 'issue_id', 'history'}]) for the issues that gained occurrences,
+        or (data, []) like load() when the database was rewritten underneath (e.g. a re-import).
+        """
+        with self._transaction():
+            self.stats['polls'] += 1
+            version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if version == self._data_version:
+                return None, []
+
+            last_id = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM occurrences').fetchone()[0]
+            if last_id < self._last_id:
+                self.stats['reloads'] += 1
+                return self.load()
+
+            changed = [row[0] for row in self._conn.execute(
+                'SELECT DISTINCT issue_id FROM occurrences WHERE id > ?', (self._last_id,))]
+            self._data_version = version
+            self._last_id = last_id
+            return None, [{'op': 'replace', 'issue_id': issue_id, 'history': self._load_issue(issue_id)}
+                          for issue_id in changed]
+
+    @staticmethod
+    def _row_to_occurrence(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'timestamp': row['timestamp'],
+            'severity': row['severity'],
+            'resolution_time': row['resolution_time'],
+            'success': bool(row['success']),
+            'root_cause': row['root_cause'],
+            'resolution_method': row['resolution_method'],
+            'confidence_score': row['confidence_score'],
+            'system_context': json.loads(row['system_context'] or '{}')
+        }
+
+    def _insert_occurrence(self, issue_id: str, occurrence: Dict[str, Any]) -> int:
+        resolution_time = occurrence.get('resolution_time', 0)
+        return self._conn.execute(
+            'INSERT INTO occurrences (issue_id, ts, timestamp, severity, resolution_time, success, root_cause, '
+            'resolution_method, confidence_score, system_context) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (issue_id, to_epoch(occurrence['timestamp']), occurrence['timestamp'], occurrence.get('severity'),
+             resolution_time if isinstance(resolution_time, (int, float)) else 0,
+             1 if occurrence.get('success') else 0, occurrence.get('root_cause'), occurrence.get('resolution_method'),
+             occurrence.get('confidence_score'), json.dumps(occurrence.get('system_context', {}), default=str))
+        ).lastrowid
+
+    def _upsert_issue(self, issue_id: str, patterns: Dict[str, Any], rollups: Dict[str, Any] = None) -> None:
+        self._conn.execute(
+            'INSERT INTO issues (issue_id, patterns, rollups) VALUES (?, ?, ?) '
+            'ON CONFLICT(issue_id) DO UPDATE SET patterns = excluded.patterns, rollups = excluded.rollups',
+            (issue_id, json.dumps(patterns or {}, default=str), json.dumps(rollups or {}, separators=(',', ':')))
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._conn.in_transaction:
+                # Part of an open batch or outer transaction
+                yield
+                return
+            # IMMEDIATE takes the write lock up front, so concurrent writers queue on the busy timeout
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+                self._conn.execute('COMMIT')
+                self.stats['transactions'] += 1
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def exclusive(self):
+        """Hold the database write lock (one IMMEDIATE transaction); poll() before mutating"""
+        return self._transaction()
+
+    def record_occurrence(self, issue_id: str, occurrence: Dict[str, Any], patterns: Dict[str, Any] = None,
+                          max_occurrences: int = None, rollups: Dict[str, Any] = None) -> None:
+        """Insert one occurrence, store the issue's updated patterns/rollups and apply per-issue retention"""
+        with self._transaction():
+            self._upsert_issue(issue_id, patterns, rollups)
+            # Our own rows are already applied in memory; poll() must not return them
+            self._last_id = max(self._last_id, self._insert_occurrence(issue_id, occurrence))
+            if max_occurrences:
+                self._conn.execute(
+                    'DELETE FROM occurrences WHERE issue_id = ? AND id NOT IN '
+                    '(SELECT id FROM occurrences WHERE issue_id = ? ORDER BY id DESC LIMIT ?)',
+                    (issue_id, issue_id, max_occurrences)
+                )
+            self.stats['appends'] += 1
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run every record_occurrence inside one transaction"""
+        with self._transaction():
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    @property
+    def needs_compaction(self) -> bool:
+        # Rows are written in place; there is no journal to fold in
+        return False
+
+    def compact(self, data: Dict[str, Any]) -> None:
+        """Persist the non-occurrence sections (baselines, analytics) of data"""
+        with self._transaction():
+            for key, value in data.items():
+                if key != 'issue_history':
+                    self._conn.execute(
+                        'INSERT INTO metadata (key, value) VALUES (?, ?) '
+                        'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                        (key, json.dumps(value, default=str))
+                    )
+
+    def import_data(self, data: Dict[str, Any]) -> int:
+        """Replace the database contents with a JSON-format history structure; returns occurrences imported"""
+        imported = 0
+        with self._transaction():
+            self._conn.execute('DELETE FROM occurrences')
+            self._conn.execute('DELETE FROM issues')
+            self._conn.execute('DELETE FROM metadata')
+            for issue_id, history in data.get('issue_history', {}).items():
+                self._upsert_issue(issue_id, history.get('patterns', {}), history.get('rollups'))
+                for occurrence in history.get('occurrences', []):
+                    self._insert_occurrence(issue_id, occurrence)
+                    imported += 1
+            self.compact(data)
+        return imported
+
+    def trending_issues(self, days: int = 30, limit: int = 10) -> List[Dict[str, Any]]:
+        """Issues with occurrences in the last `days` days ranked by frequency x mean severity"""
+        cutoff = int(time.time()) - days * 86400
+        severity_case = 'CASE o.severity ' + ' '.join(
+            f"WHEN '{severity}' THEN {score}" for severity, score in SEVERITY_SCORES.items()) + ' ELSE 2 END'
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT o.issue_id, COUNT(*) AS frequency, AVG({severity_case}) AS avg_severity,
+                       AVG(o.success) AS success_rate, MAX(o.id) AS last_id
+                FROM occurrences o JOIN issues i ON i.issue_id = o.issue_id
+                WHERE o.ts > ?
+                GROUP BY o.issue_id
+                ORDER BY COUNT(*) * AVG({severity_case}) DESC, MIN(i.rowid)
+                LIMIT ?
+                """,
+                (cutoff, limit)
+            ).fetchall()
+
+            last_ids = [row['last_id'] for row in rows]
+            last_timestamps = dict(self._conn.execute(
+                f"SELECT id, timestamp FROM occurrences WHERE id IN ({','.join('?' * len(last_ids))})", last_ids
+            ).fetchall()) if last_ids else {}
+
+        return [
+            {
+                'issue_id': row['issue_id'],
+                'frequency': row['frequency'],
+                'avg_severity': row['avg_severity'],
+                'success_rate': row['success_rate'],
+                'last_occurrence': last_timestamps.get(row['last_id'])
+            }
+            for row in rows
+        ]
+
+    def aggregate_analytics(self) -> Dict[str, Any]:
+        """Totals, success rate, mean resolution time and category ranking as SQL aggregates"""
+        with self._lock:
+            totals = self._conn.execute(
+                """
+                SELECT COUNT(*) AS occurrences, COALESCE(SUM(success), 0) AS successful,
+                       AVG(CASE WHEN success AND resolution_time > 0 THEN resolution_time END) AS avg_resolution_time
+                FROM occurrences
+                """
+            ).fetchone()
+            issues = self._conn.execute('SELECT COUNT(*) FROM issues').fetchone()[0]
+            categories = self._conn.execute(
+                """
+                SELECT CASE WHEN issue_id LIKE '%ubuntu%' THEN 'Ubuntu OS'
+                            WHEN issue_id LIKE '%k8s%' THEN 'Kubernetes'
+                            WHEN issue_id LIKE '%gluster%' THEN 'GlusterFS' END AS category,
+                       COUNT(*) AS issues, MIN(rowid) AS first_seen
+                FROM issues GROUP BY category HAVING category IS NOT NULL
+                ORDER BY issues DESC, first_seen
+                """
+            ).fetchall()
+
+        return {
+            'total_issues_tracked': issues,
+            'overall_success_rate': round(totals['successful'] / totals['occurrences'], 3) if totals['occurrences'] else 0,
+            'avg_resolution_time': int(totals['avg_resolution_time'] or 0),
+            'most_common_categories': [row['category'] for row in categories][:3]
+        }
+
+    def sync(self) -> None:
+        """Checkpoint the WAL into the main database file"""
+        with self._lock:
+            self._conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.close()
+            except Exception as e:
+                self.logger.error(f"Error closing history database: {e}")
+            self._conn = None
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """Import a JSON history file (snapshot plus any journal) into a SQLite database"""
+    from .issue_history_manager import IssueHistoryManager
+
+    manager = IssueHistoryManager(json_path, backend='json')
+    storage = SQLiteHistoryStorage(db_path)
+    try:
+        return storage.import_data(manager.data)
+    finally:
+        storage.close()
+        manager.storage.close()
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Issue history storage tools')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    migrate = subcommands.add_parser('migrate', help='Import historical_issues.json into a SQLite database')
+    migrate.add_argument('json_path', help='Path to historical_issues.json')
+    migrate.add_argument('db_path', help='SQLite database to create or overwrite')
+
+    verify = subcommands.add_parser('verify', help='Check incremental learning analytics against a full recomputation')
+    verify.add_argument('json_path', help='Path to historical_issues.json')
+    verify.add_argument('--backend', choices=['json', 'sqlite'], help='Storage backend (default: HISTORY_BACKEND)')
+    verify.add_argument('--repair', action='store_true', help='Rebuild and persist the analytics if they disagree')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'migrate':
+        count = migrate_json_to_sqlite(args.json_path, args.db_path)
+        print(f"Imported {count} occurrences from {args.json_path} into {args.db_path}")
+    elif args.command == 'verify':
+        from .issue_history_manager import IssueHistoryManager
+
+        result = IssueHistoryManager(args.json_path, backend=args.backend).verify_analytics(repair=args.repair)
+        for key, (incremental, recomputed) in result['mismatches'].items():
+            print(f"{key}: incremental={incremental} recomputed={recomputed}")
+        print('consistent' if result['consistent'] else ('repaired' if result['repaired'] else 'inconsistent'))
+        raise SystemExit(0 if result['consistent'] or result['repaired'] else 1)
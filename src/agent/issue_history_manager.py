@@ -4,6 +4,7 @@ Issue History Manager - Enhanced with continuous learning and predictive analyti
 
 import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -11,6 +12,11 @@ from collections import defaultdict
 import os
 import subprocess
 import re
+import threading
+import time
+
+from .history_storage import HistoryJournalStorage, SQLiteHistoryStorage
+from . import history_rollups
 
 @dataclass
 class IssueOccurrence:
@@ -38,22 +44,62 @@ class IssueHistoryManager:
     Enhanced Issue History Manager with continuous learning and predictive analytics
     
     Features:
-    - Tracks last 3 occurrences of each issue type
+    - Tracks the last N occurrences of each issue type (HISTORY_MAX_OCCURRENCES, default 3)
+    - Bounded hourly/daily rollups (count, success rate, mean resolution time) kept for months
+      and used for frequency trend and seasonality
+    - Learning analytics maintained incrementally (O(1) per occurrence); verify_analytics() recomputes
     - Continuous learning from system logs (Kubernetes, Ubuntu, GlusterFS)
     - Root cause prediction with confidence scoring
     - Pattern recognition across 14 expert issue types
     - Trend analysis and issue frequency tracking
     - Historical success rate tracking for recommendations
+    - Versioned per-pattern summary cache, invalidated only when that pattern is tracked
+    - Append-only journal persistence with batched fsync and atomic snapshot compaction
+    - Optional SQLite (WAL) backend with indexed time-range queries (HISTORY_BACKEND=sqlite)
+    - Safe to share between processes: writes hold the store's lock after catching up, and readers pick
+      up other processes' changes incrementally (journal tail / changed SQLite rows) on refresh()
+    - One instance per store within a process via IssueHistoryManager.shared()
     """
     
-    def __init__(self, history_file: str = None):
+    _shared_instances: Dict[Tuple[str, str], 'IssueHistoryManager'] = {}
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls, history_file: str = None, backend: str = None) -> 'IssueHistoryManager':
+        """Process-wide manager for a history store, so the dashboard, agent and engine share one view"""
+        if history_file is None:
+            history_file = os.path.join(os.path.dirname(__file__), '../data/historical_issues.json')
+        key = (os.path.abspath(history_file), (backend or os.getenv('HISTORY_BACKEND', 'json')).lower())
+        
+        with cls._shared_lock:
+            if key not in cls._shared_instances:
+                cls._shared_instances[key] = cls(history_file, backend=key[1])
+            return cls._shared_instances[key]
+    
+    def __init__(self, history_file: str = None, backend: str = None):
         self.logger = logging.getLogger(__name__)
         
         if history_file is None:
             history_file = os.path.join(os.path.dirname(__file__), '../data/historical_issues.json')
         
         self.history_file = history_file
-        self.max_occurrences = 3  # Keep last 3 occurrences per issue type
+        # Full-resolution occurrences kept per issue type; older ones live on in the rollups
+        self.max_occurrences = int(os.getenv('HISTORY_MAX_OCCURRENCES', '3'))
+        
+        # Per-pattern version counters and the summaries computed for them
+        self._pattern_versions: Dict[str, int] = {}
+        self._summary_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        
+        # Running totals behind learning_analytics, maintained per tracked/evicted occurrence
+        self._aggregates = self._empty_aggregates()
+        
+        # How often readers check the store for other processes' writes
+        self.refresh_interval = float(os.getenv('HISTORY_REFRESH_INTERVAL', '1.0'))
+        self._last_refresh = time.monotonic()
+        
+        self.backend = (backend or os.getenv('HISTORY_BACKEND', 'json')).lower()
+        self.storage = self._create_storage(history_file)
+        
         self.data = self._load_history()
         
         # Initialize learning weights
@@ -66,18 +112,71 @@ class IssueHistoryManager:
         
         self.logger.info("Issue History Manager initialized with continuous learning")
 
+    def _create_storage(self, history_file: str):
+        """Storage engine for the configured backend ('json' journal + snapshot, or 'sqlite')"""
+        if self.backend != 'sqlite':
+            return HistoryJournalStorage(history_file)
+        
+        db_path = os.getenv('HISTORY_DB') or os.path.splitext(history_file)[0] + '.db'
+        storage = SQLiteHistoryStorage(db_path)
+        
+        # First start on SQLite: carry over the existing JSON history (once, even with several processes starting)
+        with storage.exclusive():
+            if storage.is_empty and os.path.exists(history_file):
+                snapshot, records = HistoryJournalStorage(history_file).load()
+                if snapshot is not None:
+                    self.data = snapshot
+                    self._seed_rollups()
+                    self._rebuild_aggregates()
+                    for record in records:
+                        if record.get('op') == 'track':
+                            self._apply_occurrence(record['issue_id'], record['occurrence'])
+                    count = storage.import_data(self.data)
+                    self.logger.info(f"Imported {count} occurrences from {history_file} into {db_path}")
+        
+        return storage
+
     def _load_history(self) -> Dict[str, Any]:
-        """Load historical issues data"""
+        """Load historical issues data (snapshot plus journal records written since)"""
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            else:
-                return self._create_default_structure()
+            snapshot, records = self.storage.load()
+            self.data = self._with_defaults(snapshot)
+            self._seed_rollups()
+            self._rebuild_aggregates()
+            
+            for record in records:
+                if record.get('op') == 'track':
+                    self._apply_occurrence(record['issue_id'], record['occurrence'])
+            
+            if records:
+                self.logger.info(f"Replayed {len(records)} history journal records")
+            
+            # Refresh instead of trusting the stored copy
+            self._update_analytics()
+            
+            return self.data
         except Exception as e:
             self.logger.error(f"Error loading history: {e}")
             return self._create_default_structure()
 
+    def _seed_rollups(self) -> None:
+        """Build rollups for issues recorded before rollups existed, from their retained occurrences"""
+        for issue_id, issue_history in self.data['issue_history'].items():
+            if 'rollups' in issue_history:
+                continue
+            rollups = history_rollups.new_rollups()
+            for occurrence in issue_history.get('occurrences', []):
+                history_rollups.add_occurrence(rollups, occurrence)
+            issue_history['rollups'] = rollups
+
+    def _with_defaults(self, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Loaded data with any missing top-level section (e.g. analytics not yet stored) filled in"""
+        if data is None:
+            return self._create_default_structure()
+        for key, value in self._create_default_structure().items():
+            data.setdefault(key, value)
+        return data
+
     def _create_default_structure(self) -> Dict[str, Any]:
         """Create default data structure"""
         return {
@@ -121,13 +220,97 @@ class IssueHistoryManager:
         }
 
     def _save_history(self) -> None:
-        """Save history data to file"""
+        """Compact the journal into a new snapshot (atomic replace)"""
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            with self.storage.exclusive():
+                # Other processes' records must be in self.data before the journal is truncated
+                self._catch_up()
+                self.storage.compact(self.data)
         except Exception as e:
             self.logger.error(f"Error saving history: {e}")
 
+    def _catch_up(self) -> bool:
+        """Apply changes other processes made to the store; returns True if anything changed"""
+        snapshot, records = self.storage.poll()
+        
+        if snapshot is not None:
+            # Another process compacted (or rewrote) the store: rebuild from the new snapshot
+            previous = set(self.data['issue_history'])
+            self.data = self._with_defaults(snapshot)
+            self._seed_rollups()
+            self._rebuild_aggregates()
+            for issue_id in previous | set(self.data['issue_history']):
+                self._invalidate_pattern(issue_id)
+        
+        for record in records:
+            if record.get('op') == 'track':
+                self._apply_occurrence(record['issue_id'], record['occurrence'])
+            elif record.get('op') == 'replace':
+                self._replace_issue(record['issue_id'], record['history'])
+        
+        if snapshot is not None or records:
+            self._update_analytics()
+            self.logger.info(f"Picked up {len(records)} history changes from other processes"
+                             + (" after a snapshot reload" if snapshot is not None else ""))
+            return True
+        return False
+
+    def _replace_issue(self, issue_id: str, history: Dict[str, Any]) -> None:
+        """Swap in an issue's history as stored by another process, keeping the aggregates exact"""
+        previous = self.data['issue_history'].get(issue_id)
+        if previous is None:
+            self._aggregate_issue(issue_id)
+        else:
+            for occurrence in previous['occurrences']:
+                self._aggregate_occurrence(occurrence, -1)
+        
+        if 'rollups' not in history:
+            history['rollups'] = previous.get('rollups', history_rollups.new_rollups()) if previous else history_rollups.new_rollups()
+        self.data['issue_history'][issue_id] = history
+        for occurrence in history['occurrences']:
+            self._aggregate_occurrence(occurrence, 1)
+        self._invalidate_pattern(issue_id)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Pick up writes from other processes; cheap when nothing changed
+        
+        Checks at most once per refresh_interval (HISTORY_REFRESH_INTERVAL seconds) unless forced;
+        the check itself is a stat of the snapshot/journal or a SQLite data_version read.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+        
+        try:
+            if not self.storage.has_changes():
+                return False
+            with self.storage.exclusive():
+                return self._catch_up()
+        except Exception as e:
+            self.logger.error(f"Error refreshing history: {e}")
+            return False
+
+    def _maybe_compact(self) -> None:
+        if self.storage.needs_compaction:
+            self._save_history()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group many track_issue calls into one journal write and fsync
+        
+        Analytics are refreshed and compaction considered once, when the outermost batch exits.
+        """
+        with self.storage.batch():
+            self._catch_up()
+            yield
+        
+        if not self.storage.in_batch:
+            self._update_analytics()
+            self._maybe_compact()
+
     def track_issue(self, issue_id: str, occurrence_data: Dict[str, Any]) -> None:
         """
         Track a new issue occurrence with enhanced data
@@ -137,20 +320,6 @@ class IssueHistoryManager:
             occurrence_data: Detailed occurrence information
         """
         try:
-            if issue_id not in self.data['issue_history']:
-                self.data['issue_history'][issue_id] = {
-                    'occurrences': [],
-                    'patterns': {
-                        'common_causes': [],
-                        'success_rate': 0.0,
-                        'avg_resolution_time': 0,
-                        'frequency_trend': 'stable',
-                        'seasonal_pattern': 'none'
-                    }
-                }
-            
-            issue_history = self.data['issue_history'][issue_id]
-            
             # Add new occurrence
             new_occurrence = {
                 'timestamp': occurrence_data.get('timestamp', datetime.now(timezone.utc).isoformat()),
@@ -163,28 +332,60 @@ class IssueHistoryManager:
                 'system_context': occurrence_data.get('system_context', {})
             }
             
-            issue_history['occurrences'].append(new_occurrence)
-            
-            # Keep only last N occurrences
-            if len(issue_history['occurrences']) > self.max_occurrences:
-                issue_history['occurrences'] = issue_history['occurrences'][-self.max_occurrences:]
-            
-            # Update patterns
-            self._update_patterns(issue_id)
-            
-            # Update analytics
-            self._update_analytics()
+            with self.storage.exclusive():
+                # Apply on top of everything other processes wrote, then persist under the same lock
+                self._catch_up()
+                self._apply_occurrence(issue_id, new_occurrence)
+                
+                # Persist just this occurrence (journal append or one SQLite insert) instead of rewriting the whole file
+                issue_history = self.data['issue_history'][issue_id]
+                self.storage.record_occurrence(issue_id, new_occurrence, issue_history['patterns'],
+                                               self.max_occurrences, issue_history['rollups'])
             
-            # Save changes
-            self._save_history()
+            # Inside a batch, analytics and compaction run once when the batch exits
+            if not self.storage.in_batch:
+                self._update_analytics()
+                self._maybe_compact()
             
             self.logger.info(f"Tracked new occurrence for issue: {issue_id}")
             
         except Exception as e:
             self.logger.error(f"Error tracking issue {issue_id}: {e}")
 
+    def _apply_occurrence(self, issue_id: str, occurrence: Dict[str, Any]) -> None:
+        """Apply one occurrence to the in-memory history (shared by track_issue and journal replay)"""
+        if issue_id not in self.data['issue_history']:
+            self.data['issue_history'][issue_id] = {
+                'occurrences': [],
+                'patterns': {
+                    'common_causes': [],
+                    'success_rate': 0.0,
+                    'avg_resolution_time': 0,
+                    'frequency_trend': 'stable',
+                    'seasonal_pattern': 'none'
+                },
+                'rollups': history_rollups.new_rollups()
+            }
+            self._aggregate_issue(issue_id)
+        
+        issue_history = self.data['issue_history'][issue_id]
+        issue_history['occurrences'].append(occurrence)
+        history_rollups.add_occurrence(issue_history.setdefault('rollups', history_rollups.new_rollups()), occurrence)
+        self._aggregate_occurrence(occurrence, 1)
+        
+        # Keep only last N occurrences; evicted ones are subtracted from the running aggregates
+        if len(issue_history['occurrences']) > self.max_occurrences:
+            for evicted in issue_history['occurrences'][:-self.max_occurrences]:
+                self._aggregate_occurrence(evicted, -1)
+            issue_history['occurrences'] = issue_history['occurrences'][-self.max_occurrences:]
+        
+        # Update patterns
+        self._update_patterns(issue_id)
+        self._invalidate_pattern(issue_id)
+
     def get_pattern_history(self, issue_id: str) -> Dict[str, Any]:
         """Get historical pattern data for an issue type"""
+        self.refresh()
         try:
             if issue_id in self.data['issue_history']:
                 return self.data['issue_history'][issue_id]
@@ -194,8 +395,66 @@ class IssueHistoryManager:
             self.logger.error(f"Error getting pattern history for {issue_id}: {e}")
             return {'occurrences': [], 'patterns': {}}
 
+    def _invalidate_pattern(self, issue_id: str) -> None:
+        """Bump the pattern's version so its cached summary is recomputed on next use"""
+        self._pattern_versions[issue_id] = self._pattern_versions.get(issue_id, 0) + 1
+
+    def get_pattern_version(self, issue_id: str) -> int:
+        """Version of an issue's history; changes whenever track_issue (here or in another process) mutates it"""
+        self.refresh()
+        return self._pattern_versions.get(issue_id, 0)
+
+    def get_pattern_summary(self, issue_id: str) -> Dict[str, Any]:
+        """
+        Precomputed per-pattern summary, recomputed only after track_issue changed the pattern
+        
+        Args:
+            issue_id: The issue type
+            
+        Returns:
+            Dictionary with history, success rate, top causes, predicted root cause and
+            successful resolutions (treat as read-only, it is shared between callers)
+        """
+        self.refresh()
+        version = self._pattern_versions.get(issue_id, 0)
+        cached = self._summary_cache.get(issue_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        history = self.get_pattern_history(issue_id)
+        occurrences = history.get('occurrences', [])
+        patterns = history.get('patterns', {})
+        has_history = len(occurrences) > 0
+        
+        predicted_cause, prediction_confidence = (
+            self.predict_root_cause(issue_id) if has_history else ("No historical data available", 0.1)
+        )
+        
+        summary = {
+            'issue_id': issue_id,
+            'version': version,
+            'has_history': has_history,
+            'history': history,
+            'occurrence_count': len(occurrences),
+            'success_rate': patterns.get('success_rate', 0.0),
+            'avg_resolution_time': patterns.get('avg_resolution_time', 0),
+            'top_causes': patterns.get('common_causes', []),
+            'frequency_trend': patterns.get('frequency_trend', 'stable'),
+            'long_term': history_rollups.summarize(history.get('rollups')),
+            'predicted_cause': predicted_cause,
+            'prediction_confidence': prediction_confidence,
+            'successful_resolutions': [
+                {'action': occ.get('resolution_method'), 'confidence': occ.get('confidence_score', 0.0)}
+                for occ in occurrences if occ.get('success')
+            ]
+        }
+        
+        self._summary_cache[issue_id] = (version, summary)
+        return summary
+
     def has_similar_issue(self, issue_id: str) -> bool:
         """Check if similar issue has occurred before"""
+        self.refresh()
         return issue_id in self.data['issue_history'] and len(self.data['issue_history'][issue_id]['occurrences']) > 0
 
     def record_resolution(self, issue_id: str, resolution_data: Dict[str, Any]) -> None:
@@ -239,8 +498,12 @@ class IssueHistoryManager:
             causes = [occ['root_cause'] for occ in occurrences if occ['root_cause'] != 'Unknown']
             common_causes = list(set(causes))  # Unique causes
             
-            # Determine frequency trend
-            if len(occurrences) >= 2:
+            # Determine frequency trend: daily rollup rates when there are enough of them,
+            # otherwise the gap between the last two occurrences
+            rollup_trend = history_rollups.frequency_trend(issue_data.get('rollups'), datetime.now(timezone.utc).timestamp())
+            if rollup_trend is not None:
+                frequency_trend = rollup_trend
+            elif len(occurrences) >= 2:
                 recent_timestamps = [datetime.fromisoformat(occ['timestamp'].replace('Z', '+00:00')) 
                                    for occ in occurrences[-2:]]
                 time_diff = (recent_timestamps[-1] - recent_timestamps[-2]).days
@@ -260,24 +523,30 @@ class IssueHistoryManager:
                 'success_rate': success_rate,
                 'avg_resolution_time': int(avg_resolution_time),
                 'frequency_trend': frequency_trend,
-                'seasonal_pattern': self._detect_seasonal_pattern(occurrences)
+                'seasonal_pattern': self._detect_seasonal_pattern(occurrences, issue_data.get('rollups'))
             }
             
         except Exception as e:
             self.logger.error(f"Error updating patterns for {issue_id}: {e}")
 
-    def _detect_seasonal_pattern(self, occurrences: List[Dict]) -> str:
-        """Detect seasonal patterns in issue occurrences"""
+    def _detect_seasonal_pattern(self, occurrences: List[Dict], rollups: Dict[str, Any] = None) -> str:
+        """Detect seasonal patterns in issue occurrences (hour/weekday profile from the rollups when available)"""
         try:
-            if len(occurrences) < 2:
-                return "none"
-            
-            timestamps = [datetime.fromisoformat(occ['timestamp'].replace('Z', '+00:00')) 
-                         for occ in occurrences]
+            hour_counts, weekday_counts = history_rollups.time_profile(rollups)
             
-            # Simple pattern detection based on time of day/week
-            hours = [ts.hour for ts in timestamps]
-            weekdays = [ts.weekday() for ts in timestamps]
+            if sum(hour_counts) >= 2 and sum(weekday_counts) >= 2:
+                hours = [hour for hour, count in enumerate(hour_counts) for _ in range(count)]
+                weekdays = [weekday for weekday, count in enumerate(weekday_counts) for _ in range(count)]
+            else:
+                if len(occurrences) < 2:
+                    return "none"
+                
+                timestamps = [datetime.fromisoformat(occ['timestamp'].replace('Z', '+00:00')) 
+                             for occ in occurrences]
+                
+                # Simple pattern detection based on time of day/week
+                hours = [ts.hour for ts in timestamps]
+                weekdays = [ts.weekday() for ts in timestamps]
             
             # Check for business hours pattern (9-17)
             business_hours = sum(1 for h in hours if 9 <= h <= 17)
@@ -300,55 +569,153 @@ class IssueHistoryManager:
             self.logger.error(f"Error detecting seasonal pattern: {e}")
             return "none"
 
+    @staticmethod
+    def _issue_category(issue_id: str) -> Optional[str]:
+        if 'ubuntu' in issue_id:
+            return 'Ubuntu OS'
+        elif 'k8s' in issue_id:
+            return 'Kubernetes'
+        elif 'gluster' in issue_id:
+            return 'GlusterFS'
+        return None
+
+    @staticmethod
+    def _empty_aggregates() -> Dict[str, Any]:
+        return {
+            'occurrences': 0,
+            'successful': 0,
+            'resolved': 0,  # successful with a positive resolution time
+            'resolution_time_total': 0,
+            'categories': {}  # category -> issue types, in first-seen order
+        }
+
+    def _aggregate_occurrence(self, occurrence: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one occurrence's contribution to the running aggregates"""
+        aggregates = self._aggregates
+        aggregates['occurrences'] += sign
+        if occurrence.get('success'):
+            aggregates['successful'] += sign
+            resolution_time = occurrence.get('resolution_time', 0)
+            if isinstance(resolution_time, (int, float)) and resolution_time > 0:
+                aggregates['resolved'] += sign
+                aggregates['resolution_time_total'] += sign * resolution_time
+
+    def _aggregate_issue(self, issue_id: str) -> None:
+        category = self._issue_category(issue_id)
+        if category:
+            categories = self._aggregates['categories']
+            categories[category] = categories.get(category, 0) + 1
+
+    def _rebuild_aggregates(self) -> None:
+        """Recompute the running aggregates from scratch (load and repair only)"""
+        self._aggregates = self._empty_aggregates()
+        for issue_id, issue in self.data['issue_history'].items():
+            self._aggregate_issue(issue_id)
+            for occurrence in issue['occurrences']:
+                self._aggregate_occurrence(occurrence, 1)
+
+    def _analytics_from_aggregates(self) -> Dict[str, Any]:
+        aggregates = self._aggregates
+        categories = aggregates['categories']
+        occurrences = aggregates['occurrences']
+        resolved = aggregates['resolved']
+        
+        return {
+            'total_issues_tracked': len(self.data['issue_history']),
+            'overall_success_rate': round(aggregates['successful'] / occurrences, 3) if occurrences > 0 else 0,
+            'avg_resolution_time': int(aggregates['resolution_time_total'] / resolved) if resolved else 0,
+            'most_common_categories': sorted(categories, key=lambda k: categories[k], reverse=True)[:3]
+        }
+
     def _update_analytics(self) -> None:
-        """Update overall analytics and insights"""
+        """Update overall analytics from the running aggregates (O(1) per call)"""
         try:
-            all_issues = self.data['issue_history']
-            
-            if not all_issues:
+            if not self.data['issue_history']:
                 return
             
-            # Calculate overall metrics
-            total_occurrences = sum(len(issue['occurrences']) for issue in all_issues.values())
-            total_successful = sum(sum(1 for occ in issue['occurrences'] if occ['success']) 
-                                 for issue in all_issues.values())
-            
-            overall_success_rate = total_successful / total_occurrences if total_occurrences > 0 else 0
-            
-            # Calculate average resolution time
-            all_resolution_times = []
-            for issue in all_issues.values():
-                for occ in issue['occurrences']:
-                    if occ['success'] and occ['resolution_time'] > 0:
-                        all_resolution_times.append(occ['resolution_time'])
-            
-            avg_resolution_time = sum(all_resolution_times) / len(all_resolution_times) if all_resolution_times else 0
-            
-            # Determine most common categories
-            categories = defaultdict(int)
-            for issue_id in all_issues.keys():
-                if 'ubuntu' in issue_id:
-                    categories['Ubuntu OS'] += 1
-                elif 'k8s' in issue_id:
-                    categories['Kubernetes'] += 1
-                elif 'gluster' in issue_id:
-                    categories['GlusterFS'] += 1
-            
-            most_common_categories = sorted(categories.keys(), key=lambda k: categories[k], reverse=True)
-            
-            # Update analytics
-            self.data['learning_analytics'].update({
-                'total_issues_tracked': len(all_issues),
-                'overall_success_rate': round(overall_success_rate, 3),
-                'avg_resolution_time': int(avg_resolution_time),
-                'most_common_categories': most_common_categories[:3]
-            })
+            self.data['learning_analytics'].update(self._analytics_from_aggregates())
             
         except Exception as e:
             self.logger.error(f"Error updating analytics: {e}")
 
+    def _compute_analytics(self) -> Dict[str, Any]:
+        """Full recomputation of the overall analytics by walking every issue and occurrence"""
+        all_issues = self.data['issue_history']
+        
+        # Calculate overall metrics
+        total_occurrences = sum(len(issue['occurrences']) for issue in all_issues.values())
+        total_successful = sum(sum(1 for occ in issue['occurrences'] if occ['success']) 
+                             for issue in all_issues.values())
+        
+        overall_success_rate = total_successful / total_occurrences if total_occurrences > 0 else 0
+        
+        # Calculate average resolution time
+        all_resolution_times = []
+        for issue in all_issues.values():
+            for occ in issue['occurrences']:
+                if occ['success'] and occ['resolution_time'] > 0:
+                    all_resolution_times.append(occ['resolution_time'])
+        
+        avg_resolution_time = sum(all_resolution_times) / len(all_resolution_times) if all_resolution_times else 0
+        
+        # Determine most common categories
+        categories = defaultdict(int)
+        for issue_id in all_issues.keys():
+            category = self._issue_category(issue_id)
+            if category:
+                categories[category] += 1
+        
+        most_common_categories = sorted(categories.keys(), key=lambda k: categories[k], reverse=True)
+        
+        return {
+            'total_issues_tracked': len(all_issues),
+            'overall_success_rate': round(overall_success_rate, 3),
+            'avg_resolution_time': int(avg_resolution_time),
+            'most_common_categories': most_common_categories[:3]
+        }
+
+    def verify_analytics(self, repair: bool = False) -> Dict[str, Any]:
+        """
+        Check the incrementally maintained analytics against a full recomputation
+        
+        Args:
+            repair: Rebuild the running aggregates (and stored analytics) when they disagree
+            
+        Returns:
+            Dictionary with consistent flag, per-field mismatches (incremental, recomputed) and repaired flag
+        """
+        self.refresh(force=True)
+        incremental = self._analytics_from_aggregates()
+        recomputed = self._compute_analytics()
+        if self.storage.supports_queries:
+            # The database is the source of truth for this backend
+            recomputed = self.storage.aggregate_analytics()
+        
+        mismatches = {
+            key: (incremental[key], recomputed[key])
+            for key in recomputed if incremental.get(key) != recomputed[key]
+        }
+        
+        repaired = False
+        if mismatches:
+            self.logger.warning(f"Learning analytics drifted from full recomputation: {mismatches}")
+            if repair:
+                self._rebuild_aggregates()
+                self._update_analytics()
+                self._save_history()
+                repaired = True
+        
+        return {'consistent': not mismatches, 'mismatches': mismatches, 'repaired': repaired}
+
+    def get_issue_rollups(self, issue_id: str, tier: str = 'daily') -> List[Dict[str, Any]]:
+        """Non-empty hourly or daily buckets of an issue type, oldest first"""
+        self.refresh()
+        issue_history = self.data['issue_history'].get(issue_id, {})
+        return history_rollups.series_rows(issue_history.get('rollups'), tier)
+
     def get_learning_analytics(self) -> Dict[str, Any]:
         """Get comprehensive learning analytics and insights"""
+        self.refresh()
         return self.data.get('learning_analytics', {})
 
     def predict_root_cause(self, issue_id: str, current_context: Dict[str, Any] = None) -> Tuple[str, float]:
@@ -482,7 +849,16 @@ class IssueHistoryManager:
         Returns:
             List of trending issue data
         """
+        self.refresh()
         try:
+            if self.storage.supports_queries:
+                # Index range scan on ts; only the trend label comes from the in-memory patterns
+                trending_issues = self.storage.trending_issues(days, limit=10)
+                for trending_data in trending_issues:
+                    issue_data = self.data['issue_history'].get(trending_data['issue_id'], {})
+                    trending_data['trend'] = issue_data.get('patterns', {}).get('frequency_trend', 'stable')
+                return trending_issues
+            
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
             trending_issues = []
             
@@ -538,18 +914,20 @@ class IssueHistoryManager:
             # Scan system logs for new patterns
             log_patterns = self._scan_system_logs()
             
-            for pattern in log_patterns:
-                if pattern['confidence'] > 0.7:
-                    # Update or create issue pattern
-                    issue_id = pattern['issue_id']
-                    
-                    if issue_id in self.data['issue_history']:
-                        learning_summary['updated_patterns'] += 1
-                    else:
-                        learning_summary['new_patterns_detected'] += 1
-                    
-                    # Track the pattern
-                    self.track_issue(issue_id, pattern['data'])
+            # One journal write and one analytics pass for the whole scan
+            with self.batch():
+                for pattern in log_patterns:
+                    if pattern['confidence'] > 0.7:
+                        # Update or create issue pattern
+                        issue_id = pattern['issue_id']
+                        
+                        if issue_id in self.data['issue_history']:
+                            learning_summary['updated_patterns'] += 1
+                        else:
+                            learning_summary['new_patterns_detected'] += 1
+                        
+                        # Track the pattern
+                        self.track_issue(issue_id, pattern['data'])
             
             # Generate proactive recommendations
             learning_summary['recommendations'] = self._generate_proactive_recommendations()
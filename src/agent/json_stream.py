@@ -0,0 +1,131 @@
+"""
+JSON Stream - Incremental parser for JSON objects streamed token by token from the LLM
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+class IncrementalJSONObjectParser:
+    """
+    Emits the top-level fields of a streamed JSON object as soon as each one is complete
+
+    Features:
+    - Fed arbitrary text chunks (LLM tokens); never re-scans text it has already seen
+    - Tracks strings, escapes and nesting so commas/braces inside values are ignored
+    - Each completed "key": value pair is decoded with json.loads and returned once
+    - Exposes the partially streamed value of the field currently being generated
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.buffer = ''
+        self.fields = {}
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._key: Optional[str] = None
+        self._token_start: Optional[int] = None  # start of the current top-level key or value
+        self._expect = 'key'                      # 'key' | 'colon' | 'value' | 'comma'
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk and return the (key, value) pairs completed by it"""
+        completed = []
+        self.buffer += chunk
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and not self.done:
+            char = buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == 'key':
+                        self._key = json.loads(buffer[self._token_start:self._pos + 1])
+                        self._token_start = None
+                        self._expect = 'colon'
+                    elif self._depth == 1 and self._expect == 'value':
+                        completed.extend(self._complete_value(self._pos + 1))
+                self._pos += 1
+                continue
+
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect in ('key', 'value') and self._token_start is None:
+                    self._token_start = self._pos
+            elif char in '{[':
+                if self._depth == 1 and self._expect == 'value' and self._token_start is None:
+                    self._token_start = self._pos
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._expect == 'value' and self._token_start is not None:
+                    completed.extend(self._complete_value(self._pos + 1))
+                elif self._depth == 0:
+                    # Scalar value terminated by the closing brace
+                    if self._expect == 'value' and self._token_start is not None:
+                        completed.extend(self._complete_value(self._pos))
+                    self.done = True
+            elif self._depth == 1:
+                if char == ':' and self._expect == 'colon':
+                    self._expect = 'value'
+                elif char == ',':
+                    if self._expect == 'value' and self._token_start is not None:
+                        completed.extend(self._complete_value(self._pos))
+                    self._expect = 'key'
+                elif not char.isspace() and self._expect == 'value' and self._token_start is None:
+                    # Start of a number / true / false / null
+                    self._token_start = self._pos
+
+            self._pos += 1
+
+        return completed
+
+    def _complete_value(self, end: int) -> List[Tuple[str, Any]]:
+        raw = self.buffer[self._token_start:end].strip()
+        key = self._key
+        self._token_start = None
+        self._key = None
+        self._expect = 'comma'
+
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self.logger.debug(f"Could not decode streamed value for '{key}': {e}")
+            return []
+
+        self.fields[key] = value
+        return [(key, value)]
+
+    def partial_value(self) -> Tuple[Optional[str], Optional[str]]:
+        """Return (key, raw text so far) of the top-level string value currently being streamed"""
+        if self._key is None or self._token_start is None or self._expect != 'value':
+            return None, None
+
+        raw = self.buffer[self._token_start:]
+        if not raw.startswith('"'):
+            return self._key, raw
+
+        # Best-effort unescape of the unfinished string
+        text = raw[1:]
+        if text.endswith('\\'):
+            text = text[:-1]
+        try:
+            return self._key, json.loads(f'"{text}"')
+        except json.JSONDecodeError:
+            return self._key, text
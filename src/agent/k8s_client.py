@@ -0,0 +1,182 @@
+"""
+Kubernetes Client Factory - Shared, pooled Kubernetes API clients for the expert system
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+SERVICE_ACCOUNT_TOKEN = '/var/run/secrets/kubernetes.io/serviceaccount/token'
+
+class KubernetesClientFactory:
+    """
+    Process-wide factory for Kubernetes API clients
+
+    Features:
+    - One ApiClient per process backed by a keep-alive urllib3 connection pool
+    - Lazy construction of the individual API group objects (CoreV1Api, AppsV1Api, ...)
+    - In-cluster config when a service account token is mounted, kubeconfig otherwise
+    - Configuration reload only when the credential source changes on disk
+    """
+
+    API_CLASSES = {
+        'core_v1': 'CoreV1Api',
+        'apps_v1': 'AppsV1Api',
+        'networking_v1': 'NetworkingV1Api',
+        'rbac_v1': 'RbacAuthorizationV1Api',
+        'events_v1': 'EventsV1Api',
+        'version': 'VersionApi'
+    }
+
+    def __init__(self, pool_maxsize: int = None, kubeconfig: str = None,
+                 credential_check_interval: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+
+        if pool_maxsize is None:
+            pool_maxsize = int(os.getenv('K8S_CONNECTION_POOL_SIZE', '32'))
+
+        self.pool_maxsize = pool_maxsize
+        self.kubeconfig = kubeconfig
+        self.credential_check_interval = credential_check_interval
+
+        self._lock = threading.RLock()
+        self._api_client = None
+        self._apis: Dict[str, Any] = {}
+        self._credential_stamp: Optional[Tuple] = None
+        self._last_credential_check = 0.0
+        self.mode: Optional[str] = None
+
+    def _credential_source(self) -> Tuple[str, str]:
+        """Return (mode, path) of the credentials this process should use"""
+        if self.kubeconfig is None and os.path.exists(SERVICE_ACCOUNT_TOKEN):
+            return 'incluster', SERVICE_ACCOUNT_TOKEN
+
+        path = self.kubeconfig or os.getenv('KUBECONFIG', '~/.kube/config').split(os.pathsep)[0]
+        return 'kubeconfig', os.path.expanduser(path)
+
+    def _current_stamp(self) -> Tuple:
+        """Fingerprint the credential source so rotations can be detected cheaply"""
+        mode, path = self._credential_source()
+        try:
+            stat = os.stat(path)
+            return (mode, path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (mode, path, None, None)
+
+    def _credentials_changed(self) -> bool:
+        """Check the credential fingerprint at most once per check interval"""
+        now = time.monotonic()
+        if now - self._last_credential_check < self.credential_check_interval:
+            return False
+
+        self._last_credential_check = now
+        return self._current_stamp() != self._credential_stamp
+
+    def get_api_client(self):
+        """Get the shared ApiClient, (re)building it only when credentials rotate"""
+        api_client = self._api_client
+        if api_client is not None and not self._credentials_changed():
+            return api_client
+
+        with self._lock:
+            stamp = self._current_stamp()
+            if self._api_client is not None and stamp == self._credential_stamp:
+                return self._api_client
+
+            from kubernetes import client, config
+
+            mode, path = stamp[0], stamp[1]
+            configuration = client.Configuration()
+
+            if mode == 'incluster':
+                config.load_incluster_config(client_configuration=configuration)
+            else:
+                config.load_kube_config(config_file=path, client_configuration=configuration)
+
+            # A single pool shared by every API object keeps connections alive between requests
+            configuration.connection_pool_maxsize = self.pool_maxsize
+
+            if self._api_client is not None:
+                self.logger.info(f"Kubernetes credentials changed ({path}), reloading client configuration")
+
+            self._api_client = client.ApiClient(configuration)
+            self._apis = {}
+            self._credential_stamp = stamp
+            self._last_credential_check = time.monotonic()
+            self.mode = mode
+
+            self.logger.info(f"Kubernetes API client initialized ({mode}, pool size {self.pool_maxsize})")
+            return self._api_client
+
+    def get_api(self, name: str):
+        """Get a lazily constructed API group object bound to the shared ApiClient"""
+        api_client = self.get_api_client()
+
+        api = self._apis.get(name)
+        if api is not None:
+            return api
+
+        with self._lock:
+            api = self._apis.get(name)
+            if api is None:
+                if name not in self.API_CLASSES:
+                    raise ValueError(f"Unknown Kubernetes API: {name}")
+
+                from kubernetes import client
+                api = getattr(client, self.API_CLASSES[name])(api_client)
+                self._apis[name] = api
+
+            return api
+
+    @property
+    def core_v1(self):
+        return self.get_api('core_v1')
+
+    @property
+    def apps_v1(self):
+        return self.get_api('apps_v1')
+
+    @property
+    def networking_v1(self):
+        return self.get_api('networking_v1')
+
+    @property
+    def rbac_v1(self):
+        return self.get_api('rbac_v1')
+
+    @property
+    def events_v1(self):
+        return self.get_api('events_v1')
+
+    def is_available(self) -> bool:
+        """Check whether Kubernetes credentials can be loaded (no API round trip)"""
+        try:
+            self.get_api_client()
+            return True
+        except Exception as e:
+            self.logger.debug(f"Kubernetes client not available: {e}")
+            return False
+
+    def reset(self) -> None:
+        """Drop the cached client so the next call reloads configuration"""
+        with self._lock:
+            self._api_client = None
+            self._apis = {}
+            self._credential_stamp = None
+            self.mode = None
+
+_factory: Optional[KubernetesClientFactory] = None
+_factory_lock = threading.Lock()
+
+def get_k8s_client_factory() -> KubernetesClientFactory:
+    """Get the process-wide Kubernetes client factory"""
+    global _factory
+
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                _factory = KubernetesClientFactory()
+
+    return _factory
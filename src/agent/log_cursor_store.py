@@ -0,0 +1,281 @@
+"""
+Log Cursor Store - Incremental pod log tailing with per-container cursors and ring buffers
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, List, Optional, Pattern, Tuple
+
+from .log_scanner import LineMatch, ScanResult
+
+LogKey = Tuple[str, str, str]
+
+# Scan results memoized per cursor (distinct search patterns / scanners)
+MAX_MEMOS_PER_CURSOR = 8
+
+def timestamp_key(timestamp: str) -> Optional[Tuple[int, int]]:
+    """
+    (epoch seconds, nanoseconds) of an RFC3339(Nano) kubelet timestamp, or None if unparsable
+
+    Kubelet trims trailing zeros from the fraction ("...:00.12Z", "...:01Z"), so the raw
+    strings do not sort chronologically; this key does.
+    """
+    try:
+        fraction, zone = '', timestamp[19:]
+        if zone.startswith('.'):
+            digits = len(zone) - len(zone[1:].lstrip('0123456789')) - 1
+            fraction, zone = zone[1:digits + 1], zone[digits + 1:]
+        if zone in ('', 'Z', 'z'):
+            zone = '+00:00'
+        parsed = datetime.fromisoformat(timestamp[:19] + zone)
+        return int(parsed.timestamp()), int(fraction[:9].ljust(9, '0')) if fraction else 0
+    except (ValueError, TypeError):
+        return None
+
+class LogCursor:
+    """Read position and recent lines for one (namespace, pod, container)"""
+
+    def __init__(self, buffer_lines: int):
+        self.lines: Deque[Tuple[str, str]] = deque(maxlen=buffer_lines)
+        self.last_timestamp: Optional[str] = None
+        self.last_key: Optional[Tuple[int, int]] = None
+        self.seen_at_last_timestamp: set = set()
+        self.seq = 0  # lines ever appended; the newest buffered line has this sequence number
+        self.depth = 0  # tail_lines requested by the full read that seeded this cursor
+        self.last_fetch = 0.0
+        self.skew = 0.0  # how far the node's clock was observed to run ahead of ours
+        self.memos: "OrderedDict[Any, Tuple[int, Deque[Tuple[int, Any]]]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        self.lines.clear()
+        self.last_timestamp = None
+        self.last_key = None
+        self.seen_at_last_timestamp = set()
+        self.memos.clear()
+
+    def append(self, timestamp: str, text: str) -> None:
+        """Append a line unless it was already delivered by a previous, overlapping read"""
+        key = timestamp_key(timestamp)
+        if key is not None and self.last_key is not None:
+            if key < self.last_key:
+                return
+            if key == self.last_key:
+                if text in self.seen_at_last_timestamp:
+                    return
+            else:
+                self.seen_at_last_timestamp = set()
+
+        self.lines.append((timestamp, text))
+        self.seq += 1
+        if key is not None:
+            self.last_timestamp = timestamp
+            self.last_key = key
+        self.seen_at_last_timestamp.add(text)
+
+    def memoized(self, memo_key: Any, evaluate: Callable[[int, List[Tuple[str, str]]], List[Tuple[int, Any]]],
+                 tail_lines: int) -> List[Tuple[int, Any]]:
+        """
+        (sequence number, result) entries of a per-line evaluation over the last tail_lines lines
+
+        Only lines appended since the previous call with the same memo_key are evaluated;
+        evaluate(first_seq, lines) returns entries for the lines that produced a result.
+        """
+        first_buffered = self.seq - len(self.lines) + 1
+        scanned_to, entries = self.memos.pop(memo_key, (first_buffered - 1, deque()))
+
+        new_from = max(scanned_to + 1, first_buffered)
+        if new_from <= self.seq:
+            new_lines = list(self.lines)[new_from - first_buffered:]
+            entries.extend(evaluate(new_from, new_lines))
+        while entries and entries[0][0] < first_buffered:
+            entries.popleft()
+
+        self.memos[memo_key] = (self.seq, entries)
+        while len(self.memos) > MAX_MEMOS_PER_CURSOR:
+            self.memos.popitem(last=False)
+
+        window_start = self.seq - min(tail_lines, len(self.lines)) + 1
+        return [entry for entry in entries if entry[0] >= window_start]
+
+class LogCursorStore:
+    """
+    Remembers where each pod container's log was last read
+
+    Features:
+    - First read pulls the requested tail; follow-up reads use since_seconds so only new lines are transferred
+    - Overlap from second-granularity since_seconds is removed using the kubelet timestamps
+      (compared as parsed RFC3339Nano values, not strings)
+    - since_seconds is widened by a configurable overlap plus the node clock skew observed on earlier reads
+    - Regex matches and LogScanner results are memoized per cursor, so only appended lines are scanned
+    - Recent lines are kept in a bounded ring buffer per container
+    - Reads within the refresh interval are served from the buffer without an API call
+    - Bounded number of cursors with least-recently-used eviction
+    """
+
+    def __init__(self, buffer_lines: int = 1000, max_cursors: int = 2000,
+                 refresh_interval: float = 2.0, overlap_seconds: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.buffer_lines = buffer_lines
+        self.max_cursors = max_cursors
+        self.refresh_interval = refresh_interval
+        self.overlap_seconds = overlap_seconds if overlap_seconds is not None else int(os.getenv('LOG_CURSOR_OVERLAP_SECONDS', '2'))
+
+        self._cursors: "OrderedDict[LogKey, LogCursor]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'full_reads': 0, 'incremental_reads': 0, 'buffer_hits': 0, 'lines_transferred': 0}
+
+    def _get_cursor(self, key: LogKey) -> LogCursor:
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None:
+                cursor = LogCursor(self.buffer_lines)
+                self._cursors[key] = cursor
+                while len(self._cursors) > self.max_cursors:
+                    self._cursors.popitem(last=False)
+            else:
+                self._cursors.move_to_end(key)
+            return cursor
+
+    @staticmethod
+    def _split_timestamp(line: str) -> Tuple[str, str]:
+        """Split a 'timestamps=True' log line into (RFC3339 timestamp, text)"""
+        timestamp, _, text = line.partition(' ')
+        return timestamp, text
+
+    def _since_seconds(self, cursor: LogCursor) -> int:
+        """
+        Seconds to request so the next read starts at (or just before) the last seen line
+
+        The kubelet applies since_seconds against its own clock, so a node running ahead
+        of this host would otherwise skip lines; the observed skew is added to the overlap.
+        """
+        if cursor.last_key is None:
+            return 0
+        elapsed = time.time() - cursor.last_key[0]
+        return max(1, math.ceil(elapsed + cursor.skew) + self.overlap_seconds)
+
+    def read_lines(self, v1, namespace: str, pod: str, container: str = None, tail_lines: int = 100,
+                   request_timeout: float = None) -> List[Tuple[str, str]]:
+        """Return the last tail_lines (timestamp, text) pairs, fetching only what is new"""
+        key = (namespace, pod, container or '')
+        cursor = self._get_cursor(key)
+
+        with cursor.lock:
+            params = {'name': pod, 'namespace': namespace, 'timestamps': True}
+            if container:
+                params['container'] = container
+            if request_timeout:
+                params['_request_timeout'] = request_timeout
+
+            needs_full_read = cursor.last_timestamp is None or (
+                tail_lines > cursor.depth and len(cursor.lines) < min(tail_lines, self.buffer_lines)
+            )
+
+            if needs_full_read:
+                params['tail_lines'] = min(max(tail_lines, 1), self.buffer_lines)
+                since = None
+            elif time.monotonic() - cursor.last_fetch < self.refresh_interval:
+                self.stats['buffer_hits'] += 1
+                return list(cursor.lines)[-tail_lines:]
+            else:
+                since = self._since_seconds(cursor)
+                if since:
+                    params['since_seconds'] = since
+                # Never transfer more than the buffer can hold, however long the gap
+                params['tail_lines'] = self.buffer_lines
+
+            logs = v1.read_namespaced_pod_log(**params)
+            cursor.last_fetch = time.monotonic()
+
+            if needs_full_read:
+                cursor.reset()
+                cursor.depth = params['tail_lines']
+                self.stats['full_reads'] += 1
+            else:
+                self.stats['incremental_reads'] += 1
+
+            transferred = 0
+            for line in (logs or '').splitlines():
+                if not line:
+                    continue
+                transferred += 1
+                cursor.append(*self._split_timestamp(line))
+
+            # A line stamped later than our clock shows the node clock is ahead by at least that much
+            if cursor.last_key is not None:
+                cursor.skew = max(cursor.skew, cursor.last_key[0] - time.time())
+
+            self.stats['lines_transferred'] += transferred
+            return list(cursor.lines)[-tail_lines:]
+
+    def read(self, v1, namespace: str, pod: str, container: str = None, tail_lines: int = 100,
+             timestamps: bool = False, request_timeout: float = None) -> str:
+        """Drop-in replacement for read_namespaced_pod_log(tail_lines=...) returning log text"""
+        lines = self.read_lines(v1, namespace, pod, container, tail_lines, request_timeout)
+
+        if timestamps:
+            return '\n'.join(f"{timestamp} {text}" for timestamp, text in lines)
+        return '\n'.join(text for _, text in lines)
+
+    def match_lines(self, v1, namespace: str, pod: str, container: str = None, regex: Pattern = None,
+                    tail_lines: int = 100, request_timeout: float = None) -> List[str]:
+        """Lines among the last tail_lines matching regex; lines already checked by an earlier call are not rescanned"""
+        self.read_lines(v1, namespace, pod, container, tail_lines, request_timeout)
+        cursor = self._get_cursor((namespace, pod, container or ''))
+
+        def evaluate(first_seq: int, lines: List[Tuple[str, str]]) -> List[Tuple[int, str]]:
+            return [(first_seq + i, text) for i, (_, text) in enumerate(lines) if regex.search(text)]
+
+        with cursor.lock:
+            return [text for _, text in cursor.memoized(('match', regex.pattern, regex.flags), evaluate, tail_lines)]
+
+    def scan(self, v1, namespace: str, pod: str, container: str = None, scanner=None, tail_lines: int = 100,
+             timestamps: bool = False, request_timeout: float = None) -> ScanResult:
+        """
+        scanner.scan() over the last tail_lines lines, scanning only lines appended since the previous call
+
+        LogScanner classifies each line independently, so per-line results are kept and
+        reassembled into a ScanResult for the requested window.
+        """
+        self.read_lines(v1, namespace, pod, container, tail_lines, request_timeout)
+        cursor = self._get_cursor((namespace, pod, container or ''))
+
+        def render(timestamp: str, text: str) -> str:
+            return f"{timestamp} {text}" if timestamps else text
+
+        def evaluate(first_seq: int, lines: List[Tuple[str, str]]) -> List[Tuple[int, LineMatch]]:
+            result = scanner.scan('\n'.join(render(timestamp, text) for timestamp, text in lines))
+            return [(first_seq + match.line_number, match) for match in result.matches]
+
+        with cursor.lock:
+            entries = cursor.memoized(('scan', id(scanner), timestamps), evaluate, tail_lines)
+            window = list(cursor.lines)[-tail_lines:]
+            window_start = cursor.seq - len(window) + 1
+
+        result = ScanResult(total_lines=len(window))
+        offsets = [0]
+        for timestamp, text in window:
+            offsets.append(offsets[-1] + len(render(timestamp, text)) + 1)
+
+        for seq, match in entries:
+            line_number = seq - window_start
+            if match.severity == 'error':
+                result.error_count += 1
+            elif match.severity == 'warning':
+                result.warning_count += 1
+            for pattern_id in match.pattern_ids:
+                result.pattern_hits[pattern_id] = result.pattern_hits.get(pattern_id, 0) + 1
+            result.matches.append(LineMatch(line_number, offsets[line_number], match.severity,
+                                            match.pattern_ids, match.text))
+        return result
+
+    def forget(self, namespace: str, pod: str, container: str = None) -> None:
+        """Drop the cursor for a container (e.g. after the pod was deleted)"""
+        with self._lock:
+            self._cursors.pop((namespace, pod, container or ''), None)
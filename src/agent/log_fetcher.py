@@ -0,0 +1,191 @@
+"""
+Concurrent Log Fetcher - Bounded-concurrency pod log fan-out for root cause analysis
+"""
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+@dataclass
+class PodLogResult:
+    """Logs (or the error) for a single pod container; logs holds the reader's result as returned"""
+    namespace: str
+    pod: str
+    container: Optional[str]
+    logs: Any
+    error: Optional[str]
+    elapsed: float
+
+@dataclass
+class LogMatch:
+    """A pod container whose logs matched the search pattern"""
+    namespace: str
+    pod: str
+    container: Optional[str]
+    hits: int
+    sample_lines: List[str]
+    pattern_ids: List[str] = field(default_factory=list)
+
+@dataclass
+class LogSearchResult:
+    """Ranked matches plus accounting for what could not be searched"""
+    matches: List[LogMatch] = field(default_factory=list)
+    scanned: int = 0
+    errors: List[str] = field(default_factory=list)
+    timed_out: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors and self.timed_out == 0
+
+class ConcurrentLogFetcher:
+    """
+    Fetches pod logs with bounded concurrency
+
+    Features:
+    - Thread pool fan-out (the Kubernetes client is synchronous) sharing the pooled ApiClient
+    - Per-request timeout on every log read and a global deadline for the whole fan-out
+    - Results are yielded as they complete so callers can stream partial output
+    - Pattern search that ranks pods by number of matching lines
+    """
+
+    def __init__(self, max_workers: int = None, request_timeout: float = 5.0,
+                 deadline: float = 30.0, tail_lines: int = 100):
+        self.logger = logging.getLogger(__name__)
+
+        if max_workers is None:
+            max_workers = int(os.getenv('LOG_FETCH_CONCURRENCY', '16'))
+
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.deadline = deadline
+        self.tail_lines = tail_lines
+
+    def _targets(self, pods: List[Any]) -> List[Tuple[str, str, Optional[str]]]:
+        """Expand pods into (namespace, pod, container) targets; multi-container pods need one read each"""
+        targets = []
+
+        for pod in pods:
+            containers = [c.name for c in (pod.spec.containers or [])] if pod.spec else []
+            if len(containers) > 1:
+                for container in containers:
+                    targets.append((pod.metadata.namespace, pod.metadata.name, container))
+            else:
+                targets.append((pod.metadata.namespace, pod.metadata.name, None))
+
+        return targets
+
+    def _fetch_one(self, read_log: Callable, namespace: str, pod: str, container: Optional[str],
+                   tail_lines: int) -> PodLogResult:
+        start = time.monotonic()
+
+        try:
+            logs = read_log(namespace, pod, container, tail_lines, self.request_timeout)
+            return PodLogResult(namespace, pod, container, logs, None, time.monotonic() - start)
+        except Exception as e:
+            reason = getattr(e, 'reason', None) or str(e)
+            return PodLogResult(namespace, pod, container, None, reason, time.monotonic() - start)
+
+    def _api_reader(self, v1) -> Callable:
+        """Default log reader: one read_namespaced_pod_log call with a per-request timeout"""
+        def read_log(namespace, pod, container, tail_lines, timeout):
+            params = {
+                'name': pod,
+                'namespace': namespace,
+                'tail_lines': tail_lines,
+                '_request_timeout': timeout
+            }
+            if container:
+                params['container'] = container
+            return v1.read_namespaced_pod_log(**params)
+
+        return read_log
+
+    def iter_logs(self, v1, pods: List[Any], tail_lines: int = None, deadline: float = None,
+                  read_log: Callable = None, stats: LogSearchResult = None) -> Iterator[PodLogResult]:
+        """
+        Yield PodLogResult objects as soon as each read completes
+
+        Reads that have not finished when the global deadline expires are abandoned and
+        counted in stats.timed_out (when a stats object is supplied).
+        """
+        tail_lines = tail_lines or self.tail_lines
+        deadline = deadline or self.deadline
+        read_log = read_log or self._api_reader(v1)
+        targets = self._targets(pods)
+
+        if not targets:
+            return
+
+        end_time = time.monotonic() + deadline
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets)),
+                                      thread_name_prefix='log-fetch')
+        futures = [executor.submit(self._fetch_one, read_log, ns, pod, container, tail_lines)
+                   for ns, pod, container in targets]
+        completed = 0
+
+        try:
+            for future in as_completed(futures, timeout=max(0.0, end_time - time.monotonic())):
+                completed += 1
+                yield future.result()
+        except FuturesTimeoutError:
+            self.logger.warning(f"Log fan-out deadline of {deadline}s reached after {completed}/{len(futures)} reads")
+            if stats is not None:
+                stats.timed_out += len(futures) - completed
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_search(self, v1, pods: List[Any], pattern: str, stats: LogSearchResult = None,
+                    scanner=None, match_log: Callable = None, **kwargs) -> Iterator[LogMatch]:
+        """
+        Yield a LogMatch for every pod container whose logs contain the pattern (case-insensitive)
+
+        When a LogScanner is supplied, matching logs are also classified against the
+        expert patterns in the same pass and the pattern IDs are attached to the match.
+
+        match_log(namespace, pod, container, tail_lines, timeout, regex) may replace the
+        read-and-scan step with a reader that returns (matching lines, pattern IDs) itself,
+        e.g. one that memoizes results and only searches newly appended lines.
+        """
+        regex = re.compile(re.escape(pattern), re.IGNORECASE)
+        if match_log is not None:
+            kwargs['read_log'] = lambda namespace, pod, container, tail_lines, timeout: match_log(
+                namespace, pod, container, tail_lines, timeout, regex)
+
+        for result in self.iter_logs(v1, pods, stats=stats, **kwargs):
+            if stats is not None:
+                stats.scanned += 1
+
+            if result.error is not None:
+                if stats is not None:
+                    stats.errors.append(f"{result.namespace}/{result.pod}: {result.error}")
+                continue
+
+            if match_log is not None:
+                matching_lines, pattern_ids = result.logs
+            else:
+                if not result.logs or not regex.search(result.logs):
+                    continue
+                matching_lines = [line for line in result.logs.splitlines() if regex.search(line)]
+                pattern_ids = list(scanner.scan(result.logs).pattern_hits) if scanner is not None else []
+
+            if not matching_lines:
+                continue
+            yield LogMatch(result.namespace, result.pod, result.container,
+                           len(matching_lines), matching_lines[-3:], pattern_ids)
+
+    def search(self, v1, pods: List[Any], pattern: str, **kwargs) -> LogSearchResult:
+        """Search logs of all pods and return matches ranked by hit count"""
+        start = time.monotonic()
+        result = LogSearchResult()
+
+        result.matches = list(self.iter_search(v1, pods, pattern, stats=result, **kwargs))
+        result.matches.sort(key=lambda match: match.hits, reverse=True)
+        result.elapsed = time.monotonic() - start
+
+        return result
@@ -0,0 +1,284 @@
+"""
+Log Scanner - Single-pass error/warning classification and expert pattern detection for logs
+"""
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from .pattern_matcher import required_literal
+
+ERROR_KEYWORDS = ('error', 'failed', 'exception', 'fatal')
+WARNING_KEYWORDS = ('warn', 'warning', 'deprecated')
+
+@dataclass
+class LineMatch:
+    """Classification of a single log line"""
+    line_number: int
+    offset: int
+    severity: Optional[str]
+    pattern_ids: List[str]
+    text: str
+
+@dataclass
+class ScanResult:
+    """Aggregated result of scanning one log text"""
+    total_lines: int = 0
+    error_count: int = 0
+    warning_count: int = 0
+    pattern_hits: Dict[str, int] = field(default_factory=dict)
+    matches: List[LineMatch] = field(default_factory=list)
+
+    @property
+    def error_lines(self) -> List[LineMatch]:
+        return [match for match in self.matches if match.severity == 'error']
+
+    @property
+    def warning_lines(self) -> List[LineMatch]:
+        return [match for match in self.matches if match.severity == 'warning']
+
+class LogScanner:
+    """
+    Classifies log lines against error/warning keywords and expert regex patterns in one pass
+
+    Features:
+    - One compiled alternation over every keyword and every regex's anchor literal
+    - The text is lowercased once and scanned once; hits are mapped to lines incrementally
+    - Expert regexes are only evaluated on the few lines that contain their anchor literal
+    - Returns per-line severity, matched pattern IDs and line offsets plus aggregate counts
+    """
+
+    def __init__(self, patterns_file: str = None, error_keywords: Tuple[str, ...] = ERROR_KEYWORDS,
+                 warning_keywords: Tuple[str, ...] = WARNING_KEYWORDS):
+        self.logger = logging.getLogger(__name__)
+
+        if patterns_file is None:
+            patterns_file = os.path.join(os.path.dirname(__file__), '../data/expert_patterns.yaml')
+
+        self.error_keywords = tuple(kw.lower() for kw in error_keywords)
+        self.warning_keywords = tuple(kw.lower() for kw in warning_keywords)
+        self.expert_regexes = self._load_expert_regexes(patterns_file)
+        self._compile()
+
+    def _load_expert_regexes(self, patterns_file: str) -> List[Tuple[str, str]]:
+        """Load (pattern_id, regex) pairs from expert_patterns.yaml"""
+        try:
+            with open(patterns_file, 'r') as f:
+                data = yaml.safe_load(f) or {}
+
+            return [
+                (pattern_id, regex)
+                for pattern_id, pattern_data in data.get('patterns', {}).items()
+                for regex in pattern_data.get('regex_patterns', [])
+            ]
+        except Exception as e:
+            self.logger.error(f"Error loading expert regex patterns: {e}")
+            return []
+
+    def _compile(self) -> None:
+        """Build the combined literal automaton and the anchor -> regex verification table"""
+        # literal -> set of ('error' | 'warning' | regex index)
+        literal_targets: Dict[str, set] = {}
+
+        for keyword in self.error_keywords:
+            literal_targets.setdefault(keyword, set()).add('error')
+        for keyword in self.warning_keywords:
+            literal_targets.setdefault(keyword, set()).add('warning')
+
+        self._compiled_regexes = []
+        self._unanchored = []
+
+        for index, (pattern_id, regex) in enumerate(self.expert_regexes):
+            try:
+                compiled = re.compile(regex, re.IGNORECASE)
+            except re.error as e:
+                self.logger.warning(f"Skipping invalid regex '{regex}' for {pattern_id}: {e}")
+                compiled = None
+            self._compiled_regexes.append(compiled)
+
+            if compiled is None:
+                continue
+
+            # Same anchor analysis as PatternMatcher: classes, groups, braces and escapes stay unanchored
+            anchor = required_literal(regex)
+            if anchor:
+                literal_targets.setdefault(anchor, set()).add(index)
+            else:
+                self._unanchored.append(index)
+
+        # A match of a long literal also proves every literal it contains is present
+        literals = sorted(literal_targets, key=len, reverse=True)
+        self._literal_targets = {
+            literal: frozenset().union(*(literal_targets[other] for other in literals if other in literal))
+            for literal in literals
+        }
+        self._automaton = re.compile('|'.join(re.escape(literal) for literal in literals)) if literals else None
+
+    def _classify_line(self, result: ScanResult, line_number: int, offset: int,
+                       line_lower: str, line: str, targets: set) -> None:
+        severity = 'error' if 'error' in targets else ('warning' if 'warning' in targets else None)
+
+        pattern_ids = []
+        candidates = [target for target in targets if isinstance(target, int)] + self._unanchored
+        for index in sorted(set(candidates)):
+            pattern_id = self.expert_regexes[index][0]
+            if pattern_id not in pattern_ids and self._compiled_regexes[index].search(line_lower):
+                pattern_ids.append(pattern_id)
+
+        if severity == 'error':
+            result.error_count += 1
+        elif severity == 'warning':
+            result.warning_count += 1
+
+        for pattern_id in pattern_ids:
+            result.pattern_hits[pattern_id] = result.pattern_hits.get(pattern_id, 0) + 1
+
+        if severity or pattern_ids:
+            result.matches.append(LineMatch(line_number, offset, severity, pattern_ids, line))
+
+    def scan(self, text: str) -> ScanResult:
+        """Scan a log text once and classify every line that has a hit"""
+        result = ScanResult()
+        if not text:
+            return result
+
+        lower = text.lower()
+        result.total_lines = lower.count('\n') + (0 if lower.endswith('\n') else 1)
+
+        if self._automaton is None:
+            return result
+
+        def line_bounds(position: int) -> Tuple[int, int]:
+            start = lower.rfind('\n', 0, position) + 1
+            end = lower.find('\n', position)
+            return start, (len(lower) if end == -1 else end)
+
+        line_number = 0
+        scanned_to = 0
+        current_start = current_end = -1
+        current_targets: set = set()
+
+        for match in self._automaton.finditer(lower):
+            position = match.start()
+
+            if position >= current_end:
+                if current_targets:
+                    self._classify_line(result, current_number, current_start,
+                                        lower[current_start:current_end], text[current_start:current_end],
+                                        current_targets)
+
+                line_number += lower.count('\n', scanned_to, position)
+                scanned_to = position
+                current_number = line_number
+                current_start, current_end = line_bounds(position)
+                current_targets = set()
+
+            current_targets |= self._literal_targets[match.group()]
+
+        if current_targets:
+            self._classify_line(result, current_number, current_start,
+                                lower[current_start:current_end], text[current_start:current_end],
+                                current_targets)
+
+        # Regexes without a usable anchor have to look at lines the automaton skipped
+        if self._unanchored:
+            classified = {match.line_number for match in result.matches}
+            offset = 0
+            for number, line in enumerate(text.split('\n')):
+                if number not in classified:
+                    self._classify_line(result, number, offset, line.lower(), line, set())
+                offset += len(line) + 1
+            result.matches.sort(key=lambda match: match.line_number)
+
+        return result
+
+_scanners: Dict[str, LogScanner] = {}
+
+def get_log_scanner(patterns_file: str = None) -> LogScanner:
+    """Get a shared scanner for a patterns file (compiled once per process)"""
+    key = patterns_file or ''
+    scanner = _scanners.get(key)
+    if scanner is None:
+        scanner = _scanners[key] = LogScanner(patterns_file)
+    return scanner
+
+def _legacy_scan(text: str, scanner: LogScanner) -> Tuple[int, int, Dict[str, int]]:
+    """The pre-scanner approach: lowercase each line, keyword any() loops, every regex on every line"""
+    errors = warnings = 0
+    hits: Dict[str, int] = {}
+
+    for line in text.split('\n'):
+        line_lower = line.lower()
+        if any(word in line_lower for word in scanner.error_keywords):
+            errors += 1
+        elif any(word in line_lower for word in scanner.warning_keywords):
+            warnings += 1
+
+        matched = set()
+        for pattern_id, regex in scanner.expert_regexes:
+            if pattern_id not in matched and re.search(regex, line_lower, re.IGNORECASE):
+                matched.add(pattern_id)
+        for pattern_id in matched:
+            hits[pattern_id] = hits.get(pattern_id, 0) + 1
+
+    return errors, warnings, hits
+
+def benchmark(size_mb: float = 4.0, repeat: int = 3, seed: int = 7) -> Dict[str, float]:
+    """Micro-benchmark the scanner against the legacy per-line loops on a synthetic log"""
+    import random
+
+    rng = random.Random(seed)
+    words = ("GET POST /api/v1/pods 200 204 latency ms request served cache hit miss user session "
+             "worker thread started completed queue depth bytes upstream handler").split()
+    noisy = ["ERROR upstream timed out", "WARNING deprecated flag --foo", "Exception in thread main",
+             "no space left on device", "pod crashing: CrashLoopBackOff", "OOM killer invoked",
+             "brick offline on gluster-2", "node not ready"]
+
+    lines = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        line = f"2024-05-01T12:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.000000000Z " + \
+               ' '.join(rng.choice(words) for _ in range(12))
+        if rng.random() < 0.05:
+            line += ' ' + rng.choice(noisy)
+        lines.append(line)
+        size += len(line) + 1
+    text = '\n'.join(lines)
+
+    scanner = LogScanner()
+
+    def best_of(func) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    result = scanner.scan(text)
+    legacy_errors, legacy_warnings, legacy_hits = _legacy_scan(text, scanner)
+
+    return {
+        'size_mb': round(len(text) / (1024 * 1024), 2),
+        'lines': len(lines),
+        'scanner_seconds': round(best_of(lambda: scanner.scan(text)), 4),
+        'legacy_seconds': round(best_of(lambda: _legacy_scan(text, scanner)), 4),
+        'results_agree': (result.error_count, result.warning_count, result.pattern_hits) ==
+                         (legacy_errors, legacy_warnings, legacy_hits)
+    }
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Log scanner micro-benchmark')
+    parser.add_argument('--size-mb', type=float, default=4.0, help='Synthetic log size in MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.size_mb, args.repeat), indent=2))
@@ -0,0 +1,221 @@
+"""
+Metrics Sampler - Background collection of host CPU, memory, disk and network metrics into a ring buffer
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+GB = 1024 ** 3
+
+def read_resource_usage(cpu_percent: float) -> Dict[str, Any]:
+    """Memory and swap usage plus an already measured CPU percentage"""
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+
+    return {
+        'cpu_percent': cpu_percent,
+        'memory_total_gb': round(memory.total / GB, 2),
+        'memory_used_gb': round(memory.used / GB, 2),
+        'memory_percent': memory.percent,
+        'memory_available_gb': round(memory.available / GB, 2),
+        'swap_total_gb': round(swap.total / GB, 2),
+        'swap_used_gb': round(swap.used / GB, 2),
+        'swap_percent': swap.percent
+    }
+
+def read_disk_usage() -> Dict[str, Any]:
+    """Usage of every mounted partition"""
+    disk_usage = {}
+    for partition in psutil.disk_partitions():
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+            disk_usage[partition.mountpoint] = {
+                'device': partition.device,
+                'fstype': partition.fstype,
+                'total_gb': round(usage.total / GB, 2),
+                'used_gb': round(usage.used / GB, 2),
+                'free_gb': round(usage.free / GB, 2),
+                'percent': round((usage.used / usage.total) * 100, 2)
+            }
+        except (PermissionError, ZeroDivisionError):
+            continue
+    return disk_usage
+
+def read_network_status() -> Dict[str, Any]:
+    """Cumulative I/O counters per network interface"""
+    return {
+        interface: {
+            'bytes_sent': stats.bytes_sent,
+            'bytes_recv': stats.bytes_recv,
+            'packets_sent': stats.packets_sent,
+            'packets_recv': stats.packets_recv,
+            'errors_in': stats.errin,
+            'errors_out': stats.errout
+        }
+        for interface, stats in psutil.net_io_counters(pernic=True).items()
+    }
+
+class MetricsSampler:
+    """
+    Samples host metrics on a fixed interval in a daemon thread
+
+    Features:
+    - Non-blocking CPU measurement: psutil.cpu_percent(interval=None) over the time since the last sample
+    - Ring buffer of the last `capacity` samples (resource usage, disk usage, network counters)
+    - snapshot() is a lock-free read of the newest sample, so status calls cost microseconds
+    - Short-term history: per-interface network rates and CPU/memory averages over a window
+    - Listeners are called with every new sample (e.g. to persist it)
+    """
+
+    def __init__(self, interval: float = None, capacity: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval or float(os.getenv('METRICS_SAMPLE_INTERVAL', '5'))
+        self.capacity = capacity or int(os.getenv('METRICS_HISTORY_SAMPLES', '720'))
+
+        self._samples: deque = deque(maxlen=self.capacity)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'samples': 0, 'errors': 0, 'last_duration_ms': 0.0}
+
+    # ===== LIFECYCLE =====
+
+    def start(self) -> None:
+        """Take a first sample synchronously, then keep sampling in a daemon thread"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            # Prime the CPU counters so the first reading covers a real interval
+            psutil.cpu_percent(interval=None)
+            self._stopped.clear()
+            if not self._samples:
+                time.sleep(0.1)
+                self.sample()
+
+            self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    # ===== SAMPLING =====
+
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """Collect one sample into the ring buffer and notify listeners"""
+        started = time.perf_counter()
+        try:
+            sample = {
+                'timestamp': time.time(),
+                'resource_usage': read_resource_usage(psutil.cpu_percent(interval=None)),
+                'disk_usage': read_disk_usage(),
+                'network_status': read_network_status()
+            }
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Error sampling system metrics: {e}")
+            return None
+
+        # Samples are never mutated after this point, so readers can share them without copying
+        self._samples.append(sample)
+        self.stats['samples'] += 1
+        self.stats['last_duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+        for listener in list(self._listeners):
+            try:
+                listener(sample)
+            except Exception as e:
+                self.logger.error(f"Metrics listener failed: {e}")
+
+        return sample
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call listener(sample) for every sample taken from now on"""
+        self._listeners.append(listener)
+
+    # ===== READS =====
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Newest sample (treat as read-only), or None before the first one"""
+        try:
+            return self._samples[-1]
+        except IndexError:
+            return None
+
+    def history(self, seconds: float = None) -> List[Dict[str, Any]]:
+        """Samples of the last `seconds` (all buffered samples by default), oldest first"""
+        samples = list(self._samples)
+        if seconds is None or not samples:
+            return samples
+        cutoff = samples[-1]['timestamp'] - seconds
+        return [sample for sample in samples if sample['timestamp'] >= cutoff]
+
+    def rates(self, seconds: float = 60) -> Dict[str, Any]:
+        """
+        Deltas over the last `seconds`: per-interface bytes/packets/errors per second
+        and average CPU/memory percentages. Empty until two samples exist.
+        """
+        samples = self.history(seconds)
+        if len(samples) < 2:
+            return {}
+
+        first, last = samples[0], samples[-1]
+        elapsed = last['timestamp'] - first['timestamp']
+        if elapsed <= 0:
+            return {}
+
+        network = {}
+        for interface, counters in last['network_status'].items():
+            previous = first['network_status'].get(interface)
+            if previous is None:
+                continue
+            network[interface] = {
+                f"{counter}_per_sec": round(max(counters[counter] - previous[counter], 0) / elapsed, 2)
+                for counter in ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv', 'errors_in', 'errors_out')
+            }
+
+        return {
+            'window_seconds': round(elapsed, 1),
+            'samples': len(samples),
+            'cpu_percent_avg': round(sum(s['resource_usage']['cpu_percent'] for s in samples) / len(samples), 1),
+            'memory_percent_avg': round(sum(s['resource_usage']['memory_percent'] for s in samples) / len(samples), 1),
+            'network': network
+        }
+
+_sampler: Optional[MetricsSampler] = None
+_sampler_lock = threading.Lock()
+
+def get_metrics_sampler(start: bool = True) -> Optional[MetricsSampler]:
+    """
+    Get the process-wide metrics sampler, starting it on first use
+
+    Returns None when background sampling is disabled (METRICS_SAMPLER=0).
+    """
+    global _sampler
+
+    if os.getenv('METRICS_SAMPLER', '1').lower() in ('0', 'false', 'no'):
+        return None
+
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = MetricsSampler()
+
+    if start:
+        _sampler.start()
+
+    return _sampler
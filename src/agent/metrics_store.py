@@ -0,0 +1,492 @@
+"""
+Metrics Store - Embedded time-series store for host metrics (delta/varint-compressed chunks, memory-mapped reads)
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .history_storage import InterProcessLock
+from .metrics_sampler import get_metrics_sampler
+
+try:
+    import fcntl
+except ImportError:  # Without fcntl every process may write; readers still work
+    fcntl = None
+
+# Values are stored as integers at this resolution (0.01 for percentages)
+VALUE_SCALE = 100
+
+# One fixed-size record per sealed chunk
+INDEX_DTYPE = np.dtype([
+    ('start', '<i8'), ('end', '<i8'), ('count', '<u4'), ('ts_bytes', '<u4'), ('value_bytes', '<u4'),
+    ('offset', '<u8'), ('min', '<f8'), ('max', '<f8'), ('sum', '<f8')
+])
+
+# Unsealed head points, appended one record per point until the chunk is sealed
+HEAD_DTYPE = np.dtype([('timestamp', '<i8'), ('value', '<f8')])
+
+_VARINT_LIMITS = [np.uint64(1 << (7 * k)) for k in range(1, 10)]
+
+def zigzag_encode(values: np.ndarray) -> np.ndarray:
+    """Signed to unsigned so small negative deltas also get short varints"""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+def zigzag_decode(values: np.ndarray) -> np.ndarray:
+    return (values >> np.uint64(1)).astype(np.int64) ^ -(values & np.uint64(1)).astype(np.int64)
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """LEB128 varints of unsigned 64-bit integers, vectorized over byte positions"""
+    if not len(values):
+        return b''
+    values = values.astype(np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for limit in _VARINT_LIMITS:
+        lengths += values >= limit
+
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    out = np.empty(int(ends[-1]), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        mask = lengths > k
+        byte = ((values[mask] >> np.uint64(7 * k)) & np.uint64(0x7f)).astype(np.uint8)
+        byte[lengths[mask] > k + 1] |= 0x80
+        out[starts[mask] + k] = byte
+    return out.tobytes()
+
+def decode_varints(buffer: np.ndarray) -> np.ndarray:
+    """Inverse of encode_varints; a truncated trailing varint is ignored"""
+    buffer = np.asarray(buffer, dtype=np.uint8)
+    ends = np.flatnonzero(buffer < 0x80)
+    if not len(ends):
+        return np.empty(0, dtype=np.uint64)
+    buffer = buffer[:ends[-1] + 1]
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    positions = np.arange(len(buffer)) - np.repeat(starts, ends - starts + 1)
+    shifted = (buffer & 0x7f).astype(np.uint64) << (positions * 7).astype(np.uint64)
+    return np.bitwise_or.reduceat(shifted, starts)
+
+def encode_chunk(timestamps: np.ndarray, values: np.ndarray) -> Tuple[bytes, bytes]:
+    """(timestamp bytes, value bytes): zigzag varints of the deltas, the first delta taken from zero"""
+    quantized = np.round(values * VALUE_SCALE).astype(np.int64)
+    return (encode_varints(zigzag_encode(np.diff(timestamps, prepend=0))),
+            encode_varints(zigzag_encode(np.diff(quantized, prepend=0))))
+
+def decode_chunks(buffer: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode consecutive chunks (each: `count` timestamp varints then `count` value varints) in one pass
+
+    Deltas restart at every chunk, so the running sums are rebased per chunk.
+    """
+    counts = counts.astype(np.int64)
+    decoded = zigzag_decode(decode_varints(buffer))
+    if len(decoded) != 2 * int(counts.sum()):
+        raise ValueError(f"expected {2 * int(counts.sum())} varints, decoded {len(decoded)}")
+
+    is_timestamp = np.repeat(np.tile([True, False], len(counts)), np.repeat(counts, 2))
+    chunk_starts = np.cumsum(counts) - counts
+
+    def rebased_cumsum(deltas: np.ndarray) -> np.ndarray:
+        totals = np.cumsum(deltas)
+        before = np.concatenate(([0], totals[chunk_starts[1:] - 1])) if len(counts) else np.empty(0, dtype=np.int64)
+        return totals - np.repeat(before, counts)
+
+    timestamps = rebased_cumsum(decoded[is_timestamp])
+    values = rebased_cumsum(decoded[~is_timestamp]) / VALUE_SCALE
+    return timestamps, values
+
+def sample_metrics(sample: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """Scalar metrics of one MetricsSampler sample; network throughput needs the previous sample"""
+    resources = sample.get('resource_usage', {}) or {}
+    metrics = {
+        name: float(resources[name])
+        for name in ('cpu_percent', 'memory_percent', 'swap_percent') if name in resources
+    }
+
+    disks = [info.get('percent', 0) for info in (sample.get('disk_usage', {}) or {}).values()
+             if isinstance(info, dict) and info.get('fstype') != 'squashfs']
+    if disks:
+        metrics['disk_percent'] = float(max(disks))
+
+    if previous:
+        elapsed = sample['timestamp'] - previous['timestamp']
+        network, previous_network = sample.get('network_status', {}), previous.get('network_status', {})
+        if elapsed > 0:
+            transferred = sum(
+                max(counters['bytes_sent'] - previous_network[interface]['bytes_sent'], 0)
+                + max(counters['bytes_recv'] - previous_network[interface]['bytes_recv'], 0)
+                for interface, counters in network.items()
+                if interface != 'lo' and interface in previous_network
+            )
+            metrics['network_bytes_per_sec'] = transferred / elapsed
+
+    return metrics
+
+class MetricsStore:
+    """
+    Append-only time series per metric under one directory
+
+    Features:
+    - Sampler readings averaged into fixed `resolution`-second points (default: one per minute)
+    - Columnar NumPy head buffer per metric, sealed every `chunk_points` points
+    - Head points also appended to a small per-metric head log (16 bytes each) that is truncated on
+      seal and replayed when the writer restarts, so a crash loses at most the open resolution bucket
+      and other processes see the newest points too
+    - Sealed chunks: zigzag/varint-encoded deltas of timestamps and quantized values (~2-3 bytes per point,
+      plus one 60-byte index record per chunk)
+    - Fixed-record NumPy index per metric (time range, offsets, min/max/sum) to select chunks without decoding
+    - Reads through np.memmap; all selected chunks decoded in one vectorized pass
+    - Downsampling to min/max/avg/count per bucket
+    - One writing process per directory (non-blocking flock election); other processes only read
+    - Chunks older than the retention window are dropped when a chunk is sealed
+    """
+
+    def __init__(self, directory: str = None, resolution: int = None, chunk_points: int = None,
+                 retention_days: float = None):
+        self.logger = logging.getLogger(__name__)
+
+        if directory is None:
+            directory = os.getenv('METRICS_STORE_DIR') or os.path.join(os.path.dirname(__file__), '../data/metrics')
+        self.directory = directory
+        self.resolution = resolution or int(os.getenv('METRICS_STORE_RESOLUTION', '60'))
+        self.chunk_points = chunk_points or int(os.getenv('METRICS_CHUNK_POINTS', '60'))
+        self.retention_days = retention_days or float(os.getenv('METRICS_RETENTION_DAYS', '35'))
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._file_lock = InterProcessLock(os.path.join(self.directory, 'metrics.lock'))
+        self._lock = threading.RLock()
+
+        # Head: unsealed points per metric
+        self._head_ts: Dict[str, np.ndarray] = {}
+        self._head_values: Dict[str, np.ndarray] = {}
+        self._head_len: Dict[str, int] = {}
+
+        # Readings of the resolution bucket being filled
+        self._bucket: Optional[int] = None
+        self._bucket_sums: Dict[str, float] = {}
+        self._bucket_counts: Dict[str, int] = {}
+        self._previous_sample: Optional[Dict[str, Any]] = None
+
+        # Reader caches, keyed by (inode, size) of the files they were read from
+        self._index_cache: Dict[str, Tuple[Tuple[int, int], np.ndarray]] = {}
+        self._data_cache: Dict[str, Tuple[Tuple[int, int], Optional[np.memmap]]] = {}
+
+        self.stats = {'points': 0, 'chunks_sealed': 0, 'bytes_written': 0, 'queries': 0, 'pruned_chunks': 0}
+
+        self._writer_file = None
+        self.writable = self._claim_writer()
+        if self.writable:
+            self._recover_heads()
+            atexit.register(self.close)
+
+    def _claim_writer(self) -> bool:
+        if fcntl is None:
+            return True
+        try:
+            self._writer_file = open(os.path.join(self.directory, 'writer.lock'), 'a')
+            fcntl.flock(self._writer_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            if self._writer_file is not None:
+                self._writer_file.close()
+                self._writer_file = None
+            self.logger.info(f"Metrics store {self.directory} is written by another process; opened read-only")
+            return False
+
+    def _paths(self, metric: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, metric)
+        return f"{base}.chunks", f"{base}.index"
+
+    def _head_path(self, metric: str) -> str:
+        return os.path.join(self.directory, f"{metric}.head")
+
+    def _read_head_log(self, metric: str) -> np.ndarray:
+        """Whole records of a metric's head log (a torn trailing record is ignored)"""
+        path = self._head_path(metric)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return np.empty(0, dtype=HEAD_DTYPE)
+        return np.fromfile(path, dtype=HEAD_DTYPE, count=size // HEAD_DTYPE.itemsize)
+
+    def _recover_heads(self) -> None:
+        """Reload head points a previous writer logged but did not seal"""
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith('.head'):
+                continue
+            metric = name[:-len('.head')]
+            with self._file_lock:
+                records = self._read_head_log(metric)
+                index, _ = self._load_index(metric)
+            if len(index):
+                # A crash between writing a chunk and truncating the log leaves already sealed points behind
+                records = records[records['timestamp'] > index['end'][-1]]
+
+            open(self._head_path(metric), 'wb').close()
+            for timestamp, value in records:
+                self.append(metric, int(timestamp), float(value))
+            if len(records):
+                self.logger.info(f"Recovered {len(records)} unsealed {metric} points")
+
+    # ===== WRITES =====
+
+    def record_sample(self, sample: Dict[str, Any]) -> None:
+        """MetricsSampler listener: fold one sample into the current resolution bucket"""
+        if not self.writable:
+            return
+
+        with self._lock:
+            metrics = sample_metrics(sample, self._previous_sample)
+            self._previous_sample = sample
+
+            bucket = int(sample['timestamp']) // self.resolution
+            if self._bucket is not None and bucket != self._bucket:
+                self._close_bucket()
+            self._bucket = bucket
+
+            for name, value in metrics.items():
+                self._bucket_sums[name] = self._bucket_sums.get(name, 0.0) + value
+                self._bucket_counts[name] = self._bucket_counts.get(name, 0) + 1
+
+    def _close_bucket(self) -> None:
+        timestamp = self._bucket * self.resolution
+        for name, total in self._bucket_sums.items():
+            self.append(name, timestamp, total / self._bucket_counts[name])
+        self._bucket_sums = {}
+        self._bucket_counts = {}
+
+    def append(self, metric: str, timestamp: int, value: float) -> None:
+        """Add one point to a metric's head (and head log), sealing the head into a chunk when it is full"""
+        with self._lock:
+            if metric not in self._head_ts:
+                self._head_ts[metric] = np.empty(self.chunk_points, dtype=np.int64)
+                self._head_values[metric] = np.empty(self.chunk_points, dtype=np.float64)
+                self._head_len[metric] = 0
+
+            position = self._head_len[metric]
+            self._head_ts[metric][position] = timestamp
+            self._head_values[metric][position] = value
+            self._head_len[metric] = position + 1
+            self.stats['points'] += 1
+
+            try:
+                with open(self._head_path(metric), 'ab') as f:
+                    f.write(np.array([(timestamp, value)], dtype=HEAD_DTYPE).tobytes())
+            except OSError as e:
+                self.logger.error(f"Error writing metrics head log for {metric}: {e}")
+
+            if self._head_len[metric] >= self.chunk_points:
+                self._seal(metric)
+
+    def _seal(self, metric: str) -> None:
+        count = self._head_len.get(metric, 0)
+        if not count:
+            return
+
+        timestamps = self._head_ts[metric][:count]
+        values = self._head_values[metric][:count]
+        # Stored values are the quantized ones, so chunk statistics match what queries return
+        stored = np.round(values * VALUE_SCALE) / VALUE_SCALE
+        ts_bytes, value_bytes = encode_chunk(timestamps, values)
+        data_path, index_path = self._paths(metric)
+
+        try:
+            with self._file_lock:
+                with open(data_path, 'ab') as f:
+                    offset = f.tell()
+                    f.write(ts_bytes)
+                    f.write(value_bytes)
+
+                record = np.array([(timestamps[0], timestamps[-1], count, len(ts_bytes), len(value_bytes),
+                                    offset, stored.min(), stored.max(), stored.sum())], dtype=INDEX_DTYPE)
+                with open(index_path, 'ab') as f:
+                    f.write(record.tobytes())
+                # The sealed points now live in the chunk; readers holding the lock never see them twice
+                open(self._head_path(metric), 'wb').close()
+
+                self._prune(metric, int(timestamps[-1]))
+        except Exception as e:
+            self.logger.error(f"Error writing metrics chunk for {metric}: {e}")
+            return
+
+        self._head_len[metric] = 0
+        self.stats['chunks_sealed'] += 1
+        self.stats['bytes_written'] += len(ts_bytes) + len(value_bytes) + INDEX_DTYPE.itemsize
+
+    def _prune(self, metric: str, now: int) -> None:
+        """Rewrite a metric's files without the chunks that ended before the retention window"""
+        data_path, index_path = self._paths(metric)
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+        cutoff = now - self.retention_days * 86400
+        expired = index['end'] < cutoff
+        if not expired.any():
+            return
+
+        kept = index[~expired].copy()
+        data = np.fromfile(data_path, dtype=np.uint8)
+        lengths = kept['ts_bytes'].astype(np.int64) + kept['value_bytes']
+        pieces = [data[start:start + length] for start, length in zip(kept['offset'].astype(np.int64), lengths)]
+        kept['offset'] = np.cumsum(lengths) - lengths
+
+        # Readers hold the file lock while they read the index and map the data file
+        for path, payload in ((data_path, np.concatenate(pieces) if pieces else np.empty(0, np.uint8)),
+                              (index_path, kept)):
+            temp_path = f"{path}.tmp"
+            payload.tofile(temp_path)
+            os.replace(temp_path, path)
+
+        self.stats['pruned_chunks'] += int(expired.sum())
+
+    def flush(self) -> None:
+        """Write the current bucket and seal every head, e.g. before shutdown"""
+        if not self.writable:
+            return
+        with self._lock:
+            if self._bucket is not None:
+                self._close_bucket()
+                self._bucket = None
+            for metric in list(self._head_len):
+                self._seal(metric)
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer_file is not None:
+            self._writer_file.close()
+            self._writer_file = None
+        self._file_lock.close()
+
+    # ===== READS =====
+
+    def _load_index(self, metric: str) -> Tuple[np.ndarray, Optional[np.memmap]]:
+        """Index records and a memory map of the chunk file, re-read only when a file grew or was replaced"""
+        data_path, index_path = self._paths(metric)
+        with self._file_lock:
+            try:
+                index_stat = os.stat(index_path)
+                data_stat = os.stat(data_path)
+            except OSError:
+                return np.empty(0, dtype=INDEX_DTYPE), None
+
+            # Appends keep the inode, pruning replaces the file
+            index_key = (index_stat.st_ino, index_stat.st_size)
+            data_key = (data_stat.st_ino, data_stat.st_size)
+
+            cached = self._index_cache.get(metric)
+            if cached is None or cached[0] != index_key:
+                index = np.fromfile(index_path, dtype=INDEX_DTYPE, count=index_stat.st_size // INDEX_DTYPE.itemsize)
+                self._index_cache[metric] = (index_key, index)
+
+            cached_data = self._data_cache.get(metric)
+            if cached_data is None or cached_data[0] != data_key:
+                data = np.memmap(data_path, dtype=np.uint8, mode='r') if data_stat.st_size else None
+                self._data_cache[metric] = (data_key, data)
+
+            return self._index_cache[metric][1], self._data_cache[metric][1]
+
+    def query(self, metric: str, start: float = None, end: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values) of a metric within [start, end], oldest first"""
+        self.stats['queries'] += 1
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+
+        timestamps = np.empty(0, dtype=np.int64)
+        values = np.empty(0, dtype=np.float64)
+        head = np.empty(0, dtype=HEAD_DTYPE)
+
+        try:
+            with self._file_lock:
+                index, data = self._load_index(metric)
+                if not self.writable:
+                    # The writer lives in another process, so its unsealed points come from the head log;
+                    # reading it under the same lock as the index sees a concurrent seal entirely or not at all
+                    head = self._read_head_log(metric)
+                    if len(index):
+                        head = head[head['timestamp'] > index['end'][-1]]
+
+            selected = index[(index['end'] >= start) & (index['start'] <= end)]
+            if len(selected) and data is not None:
+                offsets = selected['offset'].astype(np.int64)
+                lengths = selected['ts_bytes'].astype(np.int64) + selected['value_bytes']
+                buffer = np.concatenate([data[offset:offset + length] for offset, length in zip(offsets, lengths)])
+                timestamps, values = decode_chunks(buffer, selected['count'])
+        except Exception as e:
+            self.logger.error(f"Error reading metrics for {metric}: {e}")
+
+        head_ts, head_values = head['timestamp'], head['value']
+        if self.writable:
+            with self._lock:
+                count = self._head_len.get(metric, 0)
+                head_ts = self._head_ts[metric][:count].copy() if count else head_ts
+                head_values = self._head_values[metric][:count].copy() if count else head_values
+
+        if len(head_ts):
+            timestamps = np.concatenate((timestamps, head_ts))
+            values = np.concatenate((values, np.round(head_values * VALUE_SCALE) / VALUE_SCALE))
+
+        if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, values = timestamps[order], values[order]
+
+        mask = (timestamps >= start) & (timestamps <= end)
+        return timestamps[mask], values[mask]
+
+    def downsample(self, metric: str, bucket_seconds: int, start: float = None,
+                   end: float = None) -> Dict[str, np.ndarray]:
+        """Per-bucket 'timestamp' (bucket start), 'min', 'max', 'avg' and 'count' arrays"""
+        timestamps, values = self.query(metric, start, end)
+        if not len(timestamps):
+            empty = np.empty(0, dtype=np.float64)
+            return {'timestamp': np.empty(0, dtype=np.int64), 'min': empty, 'max': empty, 'avg': empty,
+                    'count': np.empty(0, dtype=np.int64)}
+
+        buckets = timestamps // int(bucket_seconds)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        counts = np.diff(np.append(starts, len(values)))
+        return {
+            'timestamp': buckets[starts] * int(bucket_seconds),
+            'min': np.minimum.reduceat(values, starts),
+            'max': np.maximum.reduceat(values, starts),
+            'avg': np.add.reduceat(values, starts) / counts,
+            'count': counts
+        }
+
+    def metrics(self) -> List[str]:
+        """Metrics with stored or buffered points"""
+        stored = {name.rsplit('.', 1)[0] for name in os.listdir(self.directory)
+                  if name.endswith('.index') or (name.endswith('.head') and os.path.getsize(os.path.join(self.directory, name)))}
+        return sorted(stored | {metric for metric, count in self._head_len.items() if count})
+
+_store: Optional[MetricsStore] = None
+_store_lock = threading.Lock()
+
+def get_metrics_store() -> Optional[MetricsStore]:
+    """
+    Get the process-wide metrics store, attached to the metrics sampler on first use
+
+    Returns None when the store is disabled (METRICS_STORE=0) or cannot be opened.
+    """
+    global _store
+
+    if os.getenv('METRICS_STORE', '1').lower() in ('0', 'false', 'no'):
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    store = MetricsStore()
+                except Exception as e:
+                    logging.getLogger(__name__).error(f"Error opening metrics store: {e}")
+                    return None
+
+                sampler = get_metrics_sampler()
+                if sampler is not None and store.writable:
+                    sampler.add_listener(store.record_sample)
+                _store = store
+
+    return _store
@@ -0,0 +1,224 @@
+"""
+Pattern Matcher - Precompiled, indexed keyword/regex matching for expert issue patterns
+"""
+
+import heapq
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Regex syntax that makes the literal-anchor analysis unsafe; such regexes are always verified
+_COMPLEX_REGEX = re.compile(r'[|()\[\]{}\\^$]')
+
+@dataclass
+class PatternScore:
+    """Confidence of one pattern for one input, with the evidence behind it"""
+    pattern_id: str
+    confidence: float
+    matched_keywords: List[str] = field(default_factory=list)
+    matched_regex: List[str] = field(default_factory=list)
+
+def required_literal(regex: str) -> Optional[str]:
+    """
+    Longest literal that every match of a simple regex must contain, or None
+
+    Only handles the dotted wildcards used by expert_patterns.yaml ("no.*space.*left");
+    a character followed by '?' or '*' is optional and ends the literal before it.
+    """
+    regex = regex.lower()
+    if _COMPLEX_REGEX.search(regex):
+        return None
+
+    literals = []
+    current = ''
+    for index, char in enumerate(regex):
+        following = regex[index + 1] if index + 1 < len(regex) else ''
+        if char in '.*+?':
+            literals.append(current)
+            current = ''
+        elif following in ('?', '*'):
+            literals.append(current)
+            current = ''
+        else:
+            current += char
+    literals.append(current)
+
+    literals = [literal for literal in literals if literal]
+    return max(literals, key=len) if literals else None
+
+class PatternMatcher:
+    """
+    Matches text against every expert pattern in a single pass
+
+    Features:
+    - Built once per knowledge base: regexes are compiled and keywords/regex anchors indexed up front
+    - One combined trie-shaped lookahead regex (empty named group per literal, longest first)
+      finds every keyword and regex anchor occurrence, overlapping ones included
+    - Inverted index literal -> (pattern, keyword) / (pattern, regex) so only hit patterns are touched
+    - Regexes are only verified for patterns whose anchor literal occurred
+    - Top-N selection with heapq; patterns without any hit are ranked from a base-confidence
+      ordering and pruned early, so cost stays proportional to the hits, not the pattern count
+    """
+
+    def __init__(self, patterns: Dict[str, Any]):
+        self.logger = logging.getLogger(__name__)
+
+        self.pattern_ids: List[str] = list(patterns)
+        self.patterns = [patterns[pattern_id] for pattern_id in self.pattern_ids]
+
+        # literal -> [(pattern index, keyword index)] and [(pattern index, regex index)]
+        keyword_index: Dict[str, List[Tuple[int, int]]] = {}
+        regex_index: Dict[str, List[Tuple[int, int]]] = {}
+        self._compiled: List[List[Optional[re.Pattern]]] = []
+        self._unanchored: List[Tuple[int, int]] = []
+
+        for pattern_index, pattern in enumerate(self.patterns):
+            for keyword_position, keyword in enumerate(pattern.keywords):
+                if keyword:
+                    keyword_index.setdefault(keyword.lower(), []).append((pattern_index, keyword_position))
+
+            compiled = []
+            for regex_position, regex in enumerate(pattern.regex_patterns):
+                try:
+                    compiled.append(re.compile(regex, re.IGNORECASE))
+                except re.error as e:
+                    self.logger.warning(f"Skipping invalid regex '{regex}' for {self.pattern_ids[pattern_index]}: {e}")
+                    compiled.append(None)
+                    continue
+
+                anchor = required_literal(regex)
+                if anchor:
+                    regex_index.setdefault(anchor, []).append((pattern_index, regex_position))
+                else:
+                    self._unanchored.append((pattern_index, regex_position))
+            self._compiled.append(compiled)
+
+        # Literal trie: the combined regex branches character by character, so each text position
+        # costs the depth of the trie rather than the number of literals
+        trie: Dict[Optional[str], Any] = {}
+        self._keyword_postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._regex_postings: Dict[str, List[Tuple[int, int]]] = {}
+        literals = sorted(set(keyword_index) | set(regex_index))
+
+        for number, literal in enumerate(literals):
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[None] = f"l{number}"
+
+        for literal in literals:
+            # Every literal that is a prefix of this one starts at the same position, and only
+            # the longest is reported by the lookahead, so their postings are merged in
+            node = trie
+            keyword_hits: List[Tuple[int, int]] = []
+            regex_hits: List[Tuple[int, int]] = []
+            for position, char in enumerate(literal):
+                node = node[char]
+                if None in node:
+                    prefix = literal[:position + 1]
+                    keyword_hits.extend(keyword_index.get(prefix, []))
+                    regex_hits.extend(regex_index.get(prefix, []))
+            self._keyword_postings[node[None]] = keyword_hits
+            self._regex_postings[node[None]] = regex_hits
+
+        self._automaton = re.compile(f"(?={self._trie_regex(trie)})") if literals else None
+
+        # Pattern indexes by descending base confidence, for ranking patterns with no hits
+        self._by_base = sorted(range(len(self.patterns)), key=lambda index: (-self.patterns[index].confidence_base, index))
+
+        self.logger.debug(f"Pattern matcher compiled {len(literals)} literals for {len(self.patterns)} patterns")
+
+    @classmethod
+    def _trie_regex(cls, node: Dict[Optional[str], Any]) -> str:
+        """Regex for a literal trie; longer continuations are tried first and each literal ends in an empty named group"""
+        branches = [re.escape(char) + cls._trie_regex(child) for char, child in node.items() if char is not None]
+        if None in node:
+            branches.append(f"(?P<{node[None]}>)")
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def scan(self, text: str) -> Dict[int, Tuple[Set[int], Set[int]]]:
+        """Single pass over the text: pattern index -> (matched keyword positions, matched regex positions)"""
+        text = (text or '').lower()
+        hits: Dict[int, Tuple[Set[int], Set[int]]] = {}
+        if not text:
+            return hits
+
+        seen_groups = set()
+        regex_candidates: Set[Tuple[int, int]] = set(self._unanchored)
+
+        if self._automaton is not None:
+            for match in self._automaton.finditer(text):
+                group = match.lastgroup
+                if group in seen_groups:
+                    continue
+                seen_groups.add(group)
+
+                for pattern_index, keyword_position in self._keyword_postings[group]:
+                    hits.setdefault(pattern_index, (set(), set()))[0].add(keyword_position)
+                regex_candidates.update(self._regex_postings[group])
+
+        for pattern_index, regex_position in regex_candidates:
+            compiled = self._compiled[pattern_index][regex_position]
+            if compiled is not None and compiled.search(text):
+                hits.setdefault(pattern_index, (set(), set()))[1].add(regex_position)
+
+        return hits
+
+    def _score(self, pattern_index: int, keyword_hits: Set[int], regex_hits: Set[int], boost: float) -> float:
+        """Same formula as ExpertRemediationEngine._calculate_confidence"""
+        pattern = self.patterns[pattern_index]
+        keyword_score = (len(keyword_hits) / len(pattern.keywords)) * 0.4 if pattern.keywords else 0.0
+        regex_score = (len(regex_hits) / len(pattern.regex_patterns)) * 0.3 if pattern.regex_patterns else 0.0
+        return min(1.0, pattern.confidence_base + keyword_score + regex_score + boost)
+
+    def top_matches(self, text: str, top_n: int = 5, min_confidence: float = 0.5,
+                    boost: Callable[[str, Any], float] = None, max_boost: float = 0.0,
+                    require_hit: bool = False) -> List[PatternScore]:
+        """
+        Best top_n patterns for the text, highest confidence first (ties keep knowledge-base order)
+
+        boost(pattern_id, pattern) adds context-dependent confidence and must never exceed max_boost;
+        the bound lets patterns without any keyword/regex hit be skipped once they cannot qualify.
+        With require_hit only patterns with at least one keyword or regex hit are returned.
+        """
+        hits = self.scan(text)
+
+        def pattern_boost(pattern_index: int) -> float:
+            return boost(self.pattern_ids[pattern_index], self.patterns[pattern_index]) if boost else 0.0
+
+        # (confidence, -pattern index) so equal scores prefer the earlier pattern
+        scored: List[Tuple[float, int]] = []
+        for pattern_index, (keyword_hits, regex_hits) in hits.items():
+            confidence = self._score(pattern_index, keyword_hits, regex_hits, pattern_boost(pattern_index))
+            if confidence > min_confidence:
+                scored.append((confidence, -pattern_index))
+
+        best = heapq.nlargest(top_n, scored)
+        floor = best[-1][0] if len(best) >= top_n else min_confidence
+
+        for pattern_index in ([] if require_hit else self._by_base):
+            base = self.patterns[pattern_index].confidence_base
+            if min(1.0, base + max_boost) < floor:
+                break
+            if pattern_index in hits:
+                continue
+            confidence = self._score(pattern_index, set(), set(), pattern_boost(pattern_index))
+            if confidence > min_confidence:
+                scored.append((confidence, -pattern_index))
+
+        results = []
+        for confidence, negative_index in heapq.nlargest(top_n, scored):
+            pattern_index = -negative_index
+            pattern = self.patterns[pattern_index]
+            keyword_hits, regex_hits = hits.get(pattern_index, (set(), set()))
+            results.append(PatternScore(
+                pattern_id=self.pattern_ids[pattern_index],
+                confidence=confidence,
+                matched_keywords=[pattern.keywords[position] for position in sorted(keyword_hits)],
+                matched_regex=[pattern.regex_patterns[position] for position in sorted(regex_hits)]
+            ))
+        return results
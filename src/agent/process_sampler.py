@@ -0,0 +1,147 @@
+"""
+Process Sampler - Incremental process table sampling with real CPU deltas and top-K selection
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+
+class ProcessSampler:
+    """
+    Keeps psutil.Process objects alive between calls so CPU percentages are real deltas
+
+    Features:
+    - New PIDs are primed once; known PIDs reuse their Process object and cached name
+    - Exited PIDs (and reused PIDs, detected by create time) are dropped from the table
+    - Per-process reads batched with Process.oneshot(); memory percent from RSS / total memory
+    - Top-K by CPU and by memory with heapq.nlargest instead of two full sorts
+    - Results reused for calls closer together than min_interval (CPU deltas over a few
+      milliseconds are noise anyway)
+    - CPU is only read once a process has been primed for at least min_cpu_window seconds;
+      the first sample waits out the window, later newcomers report 0 until it has passed
+    - Shared process-wide through get_process_sampler()
+    """
+
+    def __init__(self, top_k: int = 10, min_interval: float = None, min_cpu_window: float = None):
+        self.logger = logging.getLogger(__name__)
+        self.top_k = top_k
+        self.min_interval = min_interval if min_interval is not None else float(os.getenv('PROCESS_SAMPLE_INTERVAL', '2'))
+        self.min_cpu_window = (min_cpu_window if min_cpu_window is not None
+                               else float(os.getenv('PROCESS_CPU_MIN_WINDOW', '0.5')))
+
+        self._processes: Dict[int, psutil.Process] = {}
+        self._names: Dict[int, str] = {}
+        self._create_times: Dict[int, float] = {}
+        self._primed_at: Dict[int, float] = {}
+        self._memory_total = psutil.virtual_memory().total
+        self._lock = threading.Lock()
+        self._last_result: Optional[Dict[str, Any]] = None
+        self._last_sample = 0.0
+        self.stats = {'samples': 0, 'new_processes': 0, 'exited_processes': 0, 'last_duration_ms': 0.0}
+
+        # Prime every current process so the first sample already has CPU deltas
+        self._refresh_table()
+
+    def _refresh_table(self) -> None:
+        """Add new PIDs (priming their CPU counters) and drop exited ones"""
+        current = set(psutil.pids())
+
+        for pid in list(self._processes):
+            if pid not in current:
+                self._forget(pid)
+                self.stats['exited_processes'] += 1
+
+        for pid in current:
+            if pid in self._processes:
+                continue
+            try:
+                process = psutil.Process(pid)
+                with process.oneshot():
+                    self._create_times[pid] = process.create_time()
+                    self._names[pid] = process.name()
+                    process.cpu_percent(interval=None)
+                self._primed_at[pid] = time.monotonic()
+                self._processes[pid] = process
+                self.stats['new_processes'] += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+    def _forget(self, pid: int) -> None:
+        self._processes.pop(pid, None)
+        self._names.pop(pid, None)
+        self._create_times.pop(pid, None)
+        self._primed_at.pop(pid, None)
+
+    def sample(self) -> Dict[str, Any]:
+        """total_processes, top_cpu_processes and top_memory_processes (lists of pid/name/cpu/memory dicts)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._last_result is not None and now - self._last_sample < self.min_interval:
+                return self._last_result
+
+            if self._last_result is None and self._primed_at:
+                # Counters primed in __init__ may be only milliseconds old; wait out the window once
+                wait = self.min_cpu_window - (now - min(self._primed_at.values()))
+                if wait > 0:
+                    time.sleep(wait)
+
+            started = time.perf_counter()
+            self._refresh_table()
+            measured_at = time.monotonic()
+
+            entries = []
+            for pid, process in list(self._processes.items()):
+                try:
+                    with process.oneshot():
+                        if process.create_time() != self._create_times[pid]:
+                            # PID reused by a new process: start over with a fresh object
+                            raise psutil.NoSuchProcess(pid)
+                        if measured_at - self._primed_at[pid] < self.min_cpu_window:
+                            # Primed just now: leave the counter alone so the next sample covers the full window
+                            cpu_percent = 0.0
+                        else:
+                            cpu_percent = process.cpu_percent(interval=None)
+                        rss = process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    self._forget(pid)
+                    continue
+                except psutil.AccessDenied:
+                    continue
+
+                entries.append({
+                    'pid': pid,
+                    'name': self._names[pid],
+                    'cpu_percent': cpu_percent,
+                    'memory_percent': rss * 100.0 / self._memory_total
+                })
+
+            result = {
+                'total_processes': len(entries),
+                'top_cpu_processes': heapq.nlargest(self.top_k, entries, key=lambda entry: entry['cpu_percent']),
+                'top_memory_processes': heapq.nlargest(self.top_k, entries, key=lambda entry: entry['memory_percent'])
+            }
+
+            self._last_result = result
+            self._last_sample = now
+            self.stats['samples'] += 1
+            self.stats['last_duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            return result
+
+_process_sampler: Optional[ProcessSampler] = None
+_process_sampler_lock = threading.Lock()
+
+def get_process_sampler() -> ProcessSampler:
+    """Get the process-wide process sampler (one primed process table per process)"""
+    global _process_sampler
+
+    if _process_sampler is None:
+        with _process_sampler_lock:
+            if _process_sampler is None:
+                _process_sampler = ProcessSampler()
+
+    return _process_sampler
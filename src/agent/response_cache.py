@@ -0,0 +1,204 @@
+"""
+Response Cache - TTL/LRU cache for expert LLM responses keyed on query, intent and cluster state
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace so trivially different phrasings share a key"""
+    query = re.sub(r"[^\w\s/.-]", ' ', (query or '').lower())
+    return ' '.join(query.split())
+
+def _bucket(value: Any, size: float) -> Optional[int]:
+    try:
+        return int(float(value) // size)
+    except (TypeError, ValueError):
+        return None
+
+def cluster_fingerprint(system_status: Dict[str, Any], active_issues: List[Any] = None) -> str:
+    """
+    Coarse fingerprint of the system state an answer depends on
+
+    Only values that change the diagnosis are included, bucketed so normal metric
+    jitter does not invalidate every cached response.
+    """
+    status = system_status or {}
+    resources = status.get('resource_usage', {}) or {}
+    disk = status.get('disk_usage', {}) or {}
+    kubernetes = status.get('kubernetes_status', {}) or {}
+    services = status.get('services_status', {}) or {}
+
+    state = {
+        'cpu': _bucket(resources.get('cpu_percent'), 25),
+        'memory': _bucket(resources.get('memory_percent'), 10),
+        'disk': sorted(
+            (mount, _bucket(info.get('percent'), 10))
+            for mount, info in disk.items() if isinstance(info, dict)
+        ),
+        'k8s': [kubernetes.get(key) for key in ('available', 'nodes_count', 'failed_pods', 'pending_pods')],
+        'services': sorted(
+            (name, info.get('status') if isinstance(info, dict) else info) for name, info in services.items()
+        ),
+        'issues': len(active_issues or [])
+    }
+
+    return hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+class ResponseCache:
+    """
+    Caches LLM responses for repeated expert queries
+
+    Features:
+    - Key = normalized query + detected intent/systems + cluster state fingerprint
+    - TTL expiry and least-recently-used eviction
+    - Optional on-disk persistence (atomic rewrite) so the cache survives restarts
+    - Hit/miss/eviction metrics
+    - Invalidation hook that fires when the cluster fingerprint changes
+    """
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None, persist_path: str = None):
+        self.logger = logging.getLogger(__name__)
+
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('RESPONSE_CACHE_TTL', '900'))
+        self.persist_path = persist_path if persist_path is not None else os.getenv('RESPONSE_CACHE_FILE')
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._fingerprint: Optional[str] = None
+        self._listeners: List[Callable[[Optional[str], str], None]] = []
+
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0, 'stores': 0}
+
+        if self.persist_path:
+            self._load()
+
+    def make_key(self, query: str, analysis: Dict[str, Any] = None, fingerprint: str = None) -> str:
+        """Build a cache key from the query, its analysis and the cluster fingerprint"""
+        analysis = analysis or {}
+        material = {
+            'query': normalize_query(query),
+            'intent': analysis.get('intent'),
+            'systems': sorted(analysis.get('detected_systems', [])),
+            'fingerprint': fingerprint if fingerprint is not None else self._fingerprint
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None (expired entries are dropped)"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            if time.time() - entry['created'] > self.ttl_seconds:
+                del self._entries[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry['value']
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond max_entries"""
+        with self._lock:
+            self._entries[key] = {'created': time.time(), 'fingerprint': self._fingerprint, 'value': value}
+            self._entries.move_to_end(key)
+            self.stats['stores'] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+            if self.persist_path:
+                self._save()
+
+    def on_invalidate(self, callback: Callable[[Optional[str], str], None]) -> None:
+        """Register a callback(old_fingerprint, new_fingerprint) fired when the cluster state changes"""
+        self._listeners.append(callback)
+
+    def update_fingerprint(self, fingerprint: str) -> bool:
+        """Record the current cluster fingerprint; invalidates the cache when it changed"""
+        with self._lock:
+            previous = self._fingerprint
+            if fingerprint == previous:
+                return False
+
+            self._fingerprint = fingerprint
+            if previous is None:
+                # First observation: keep persisted entries that were stored for this same state
+                stale = [key for key, entry in self._entries.items() if entry['fingerprint'] != fingerprint]
+                for key in stale:
+                    del self._entries[key]
+                return False
+
+            self.invalidate()
+
+        for callback in list(self._listeners):
+            try:
+                callback(previous, fingerprint)
+            except Exception as e:
+                self.logger.error(f"Error in cache invalidation callback: {e}")
+
+        self.logger.info(f"Cluster state changed ({previous} -> {fingerprint}), response cache invalidated")
+        return True
+
+    def invalidate(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+            self.stats['invalidations'] += 1
+            if self.persist_path:
+                self._save()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current size and hit rate"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'size': len(self._entries),
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+            }
+
+    def _load(self) -> None:
+        try:
+            if not os.path.exists(self.persist_path):
+                return
+
+            with open(self.persist_path, 'r') as f:
+                entries = json.load(f)
+
+            now = time.time()
+            for key, entry in entries.items():
+                if now - entry.get('created', 0) <= self.ttl_seconds:
+                    self._entries[key] = entry
+
+            self.logger.info(f"Loaded {len(self._entries)} cached responses from {self.persist_path}")
+        except Exception as e:
+            self.logger.error(f"Error loading response cache: {e}")
+
+    def _save(self) -> None:
+        try:
+            directory = os.path.dirname(os.path.abspath(self.persist_path))
+            os.makedirs(directory, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.response_cache.')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.persist_path)
+        except Exception as e:
+            self.logger.error(f"Error saving response cache: {e}")
@@ -0,0 +1,305 @@
+"""
+Retrieval Index - BM25 passage retrieval over expert patterns and historical resolutions
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from .history_storage import journal_path_for, read_journal
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python scoring is used without NumPy
+    np = None
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9_./-]*[a-z0-9]|[a-z0-9]")
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'has', 'have',
+    'how', 'i', 'in', 'is', 'it', 'its', 'my', 'of', 'on', 'or', 'the', 'this', 'to', 'was', 'what',
+    'when', 'why', 'with', 'you', 'your'
+))
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; path/flag-like tokens are also split into their parts"""
+    tokens = []
+    for token in _TOKEN.findall((text or '').lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if any(sep in token for sep in '/.-_'):
+            tokens.extend(part for part in re.split(r'[/._-]+', token) if part and part not in STOPWORDS)
+    return tokens
+
+@dataclass
+class Passage:
+    """One retrievable unit of expert knowledge"""
+    pattern: str
+    kind: str
+    text: str
+    source: str
+
+@dataclass
+class SearchHit:
+    """A passage with its BM25 score"""
+    passage: Passage
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pattern': self.passage.pattern,
+            'kind': self.passage.kind,
+            'text': self.passage.text,
+            'score': round(self.score, 3)
+        }
+
+class _Segment:
+    """Passages of one source file with their postings; rebuilt as a whole when the file changes"""
+
+    def __init__(self, passages: List[Passage]):
+        self.passages = passages
+        self.lengths = [0] * len(passages)
+        postings: Dict[str, Dict[int, int]] = {}
+
+        for index, passage in enumerate(passages):
+            counts = Counter(tokenize(passage.text))
+            self.lengths[index] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.setdefault(term, {})[index] = tf
+
+        self.vectorized = np is not None
+        if self.vectorized:
+            self.postings = {
+                term: (np.fromiter(docs.keys(), dtype=np.int32, count=len(docs)),
+                       np.fromiter(docs.values(), dtype=np.float32, count=len(docs)))
+                for term, docs in postings.items()
+            }
+            self.length_array = np.asarray(self.lengths, dtype=np.float32)
+        else:
+            self.postings = postings
+
+        self.total_length = sum(self.lengths)
+
+    def df(self, term: str) -> int:
+        posting = self.postings.get(term)
+        if posting is None:
+            return 0
+        return len(posting[0]) if self.vectorized else len(posting)
+
+class RetrievalIndex:
+    """
+    Local BM25 index over expert_patterns.yaml and the issue history (JSON or SQLite)
+
+    Features:
+    - Passages: pattern description/keywords, each symptom, each remediation step,
+      and every distinct historical root cause with its resolution
+    - One segment per source file, rebuilt only when that file's (or its journal/WAL's) mtime changes
+    - Collection statistics (N, avgdl, document frequencies) combined across segments at query time
+    - NumPy-vectorized scoring when available, pure Python otherwise
+    - Top-k via heapq over all segments
+    """
+
+    def __init__(self, patterns_file: str = None, history_file: str = None,
+                 k1: float = 1.5, b: float = 0.75, check_interval: float = 2.0):
+        self.logger = logging.getLogger(__name__)
+
+        if patterns_file is None:
+            patterns_file = os.path.join(os.path.dirname(__file__), '../data/expert_patterns.yaml')
+        if history_file is None:
+            history_file = os.path.join(os.path.dirname(__file__), '../data/historical_issues.json')
+
+        self.k1 = k1
+        self.b = b
+        self.check_interval = check_interval
+
+        self._sources: Dict[str, Tuple[str, Callable[[str], List[Passage]]]] = {
+            'patterns': (patterns_file, self._pattern_passages),
+            'history': (history_file, self._history_passages)
+        }
+        self._segments: Dict[str, _Segment] = {}
+        self._mtimes: Dict[str, Optional[float]] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'builds': 0, 'searches': 0}
+
+        self.refresh(force=True)
+
+    # Passage extraction
+
+    @staticmethod
+    def _pattern_passages(path: str) -> List[Passage]:
+        with open(path, 'r') as f:
+            data = yaml.safe_load(f) or {}
+
+        passages = []
+        for key, pattern in (data.get('patterns', {}) or {}).items():
+            passages.append(Passage(key, 'description',
+                                    f"{pattern.get('name', key)} ({pattern.get('category', '')}): "
+                                    f"{pattern.get('description', '')} Keywords: {', '.join(pattern.get('keywords', []))}",
+                                    'patterns'))
+            for symptom in pattern.get('symptoms', []):
+                passages.append(Passage(key, 'symptom', symptom, 'patterns'))
+            for step in pattern.get('remediation_steps', []):
+                passages.append(Passage(key, 'remediation',
+                                        f"{step.get('action', '')}: {step.get('description', '')} "
+                                        f"`{step.get('command', '')}` [{step.get('safety_level', 'MEDIUM')}]",
+                                        'patterns'))
+
+        for extra in data.get('additional_patterns', []) or []:
+            name = extra.get('pattern', '')
+            passages.append(Passage(name, 'description', f"{name}: {extra.get('description', '')}", 'patterns'))
+            for step in extra.get('remediation_steps', []):
+                passages.append(Passage(name, 'remediation', str(step), 'patterns'))
+
+        return passages
+
+    @staticmethod
+    def _history_passages(path: str) -> List[Passage]:
+        occurrences_by_issue: Dict[str, List[Dict[str, Any]]] = {}
+
+        if path.endswith('.db'):
+            # SQLite history backend; read-only connection so the writer's WAL is not disturbed
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                for issue_id, root_cause, success, method in conn.execute(
+                        'SELECT issue_id, root_cause, success, resolution_method FROM occurrences ORDER BY id'):
+                    occurrences_by_issue.setdefault(issue_id, []).append(
+                        {'root_cause': root_cause, 'success': bool(success), 'resolution_method': method})
+            finally:
+                conn.close()
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
+
+            # Occurrences journaled since the last snapshot compaction
+            occurrences_by_issue = {
+                issue_id: list(history.get('occurrences', []))
+                for issue_id, history in (data.get('issue_history', {}) or {}).items()
+            }
+            for record in read_journal(journal_path_for(path)):
+                if record.get('op') == 'track':
+                    occurrences_by_issue.setdefault(record['issue_id'], []).append(record['occurrence'])
+
+        passages = []
+        for issue_id, occurrences in occurrences_by_issue.items():
+            seen = set()
+            for occurrence in occurrences:
+                root_cause = occurrence.get('root_cause')
+                if not root_cause or root_cause in seen:
+                    continue
+                seen.add(root_cause)
+                outcome = 'resolved' if occurrence.get('success') else 'not resolved'
+                passages.append(Passage(issue_id, 'root_cause',
+                                        f"{issue_id}: {root_cause}; {outcome} by {occurrence.get('resolution_method', 'unknown')}",
+                                        'history'))
+        return passages
+
+    # Maintenance
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the segments whose source file changed; returns True if anything was rebuilt"""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            rebuilt = False
+
+            for name, (path, extract) in self._sources.items():
+                try:
+                    mtime = os.path.getmtime(path)
+                    if name == 'history':
+                        # Recent writes live in the JSON journal or the SQLite write-ahead log
+                        companion = path + '-wal' if path.endswith('.db') else journal_path_for(path)
+                        if os.path.exists(companion):
+                            mtime = max(mtime, os.path.getmtime(companion))
+                except OSError:
+                    mtime = None
+
+                if not force and mtime == self._mtimes.get(name):
+                    continue
+
+                try:
+                    passages = extract(path) if mtime is not None else []
+                except Exception as e:
+                    self.logger.error(f"Error indexing {path}: {e}")
+                    continue
+
+                self._segments[name] = _Segment(passages)
+                self._mtimes[name] = mtime
+                self.stats['builds'] += 1
+                rebuilt = True
+                self.logger.info(f"Indexed {len(passages)} {name} passages from {path}")
+
+            return rebuilt
+
+    def __len__(self) -> int:
+        return sum(len(segment.passages) for segment in self._segments.values())
+
+    # Search
+
+    def search(self, query: str, top_k: int = 5, min_score: float = 0.0,
+               sources: List[str] = None) -> List[SearchHit]:
+        """Top-k passages for a query, best first"""
+        self.refresh()
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            segments = self._segments
+            total_docs = sum(len(segment.passages) for segment in segments.values())
+            if not total_docs:
+                return []
+
+            avgdl = sum(segment.total_length for segment in segments.values()) / total_docs
+            idf = {}
+            for term in terms:
+                df = sum(segment.df(term) for segment in segments.values())
+                if df:
+                    idf[term] = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+            self.stats['searches'] += 1
+            candidates = []
+            for name, segment in segments.items():
+                if sources and name not in sources:
+                    continue
+                candidates.extend(self._score_segment(segment, idf, avgdl))
+
+        return heapq.nlargest(top_k, (hit for hit in candidates if hit.score > min_score), key=lambda hit: hit.score)
+
+    def _score_segment(self, segment: _Segment, idf: Dict[str, float], avgdl: float) -> List[SearchHit]:
+        k1, b = self.k1, self.b
+
+        if segment.vectorized:
+            scores = np.zeros(len(segment.passages), dtype=np.float32)
+            for term, weight in idf.items():
+                posting = segment.postings.get(term)
+                if posting is None:
+                    continue
+                docs, tf = posting
+                norm = k1 * (1 - b + b * segment.length_array[docs] / avgdl)
+                scores[docs] += weight * tf * (k1 + 1) / (tf + norm)
+            matched = np.nonzero(scores)[0]
+            return [SearchHit(segment.passages[index], float(scores[index])) for index in matched]
+
+        scores: Dict[int, float] = {}
+        for term, weight in idf.items():
+            for index, tf in segment.postings.get(term, {}).items():
+                norm = k1 * (1 - b + b * segment.lengths[index] / avgdl)
+                scores[index] = scores.get(index, 0.0) + weight * tf * (k1 + 1) / (tf + norm)
+        return [SearchHit(segment.passages[index], score) for index, score in scores.items()]
@@ -0,0 +1,126 @@
+"""
+Service Status - Batched systemd unit status for a configurable watch list
+"""
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_WATCHED_UNITS = 'ssh,networking,systemd-resolved'
+
+SHOW_PROPERTIES = ('Id', 'LoadState', 'ActiveState', 'SubState')
+
+def watched_units_from_env() -> List[str]:
+    """Units listed in WATCHED_SYSTEMD_UNITS (comma or whitespace separated)"""
+    raw = os.getenv('WATCHED_SYSTEMD_UNITS', DEFAULT_WATCHED_UNITS)
+    return list(dict.fromkeys(unit for unit in raw.replace(',', ' ').split() if unit))
+
+def parse_systemctl_show(output: str, units: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Split `systemctl show` output for several units into per-unit property dicts
+
+    systemctl prints one blank-line separated block per unit, in argument order,
+    so blocks are matched to the requested names positionally (aliases such as
+    ssh -> sshd.service would not match by Id).
+    """
+    blocks = []
+    current: Dict[str, str] = {}
+    for line in output.splitlines():
+        if not line.strip():
+            if current:
+                blocks.append(current)
+                current = {}
+            continue
+        key, _, value = line.partition('=')
+        current[key] = value
+    if current:
+        blocks.append(current)
+
+    return {unit: properties for unit, properties in zip(units, blocks)}
+
+class ServiceStatusMonitor:
+    """
+    Status of the watched systemd units from one `systemctl show` call
+
+    Features:
+    - Watch list from WATCHED_SYSTEMD_UNITS (default: ssh, networking, systemd-resolved)
+    - One subprocess for all units instead of one `systemctl is-active` per unit
+    - Results cached for SERVICES_STATUS_TTL seconds (default 10)
+    - Failed units listed for diagnosis
+    - Shared process-wide through get_service_monitor()
+    """
+
+    def __init__(self, units: List[str] = None, ttl: float = None):
+        self.logger = logging.getLogger(__name__)
+        self.units = units or watched_units_from_env()
+        self.ttl = ttl if ttl is not None else float(os.getenv('SERVICES_STATUS_TTL', '10'))
+
+        self._lock = threading.Lock()
+        self._status: Optional[Dict[str, Dict[str, Any]]] = None
+        self._fetched_at = 0.0
+        self.stats = {'queries': 0, 'cache_hits': 0, 'errors': 0}
+
+    def _query(self) -> Dict[str, Dict[str, Any]]:
+        result = subprocess.run(
+            ['systemctl', 'show', '--no-pager', '-p', ','.join(SHOW_PROPERTIES), *self.units],
+            capture_output=True, text=True, timeout=5
+        )
+        self.stats['queries'] += 1
+        properties = parse_systemctl_show(result.stdout, self.units)
+        if result.returncode != 0 and not properties:
+            raise RuntimeError(result.stderr.strip() or f"systemctl exited with {result.returncode}")
+
+        status = {}
+        for unit in self.units:
+            unit_properties = properties.get(unit, {})
+            active_state = unit_properties.get('ActiveState', 'unknown')
+            status[unit] = {
+                'active': active_state == 'active',
+                'status': active_state,
+                'sub_state': unit_properties.get('SubState', 'unknown'),
+                'load_state': unit_properties.get('LoadState', 'unknown'),
+                'unit': unit_properties.get('Id', unit)
+            }
+        return status
+
+    def get_status(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """unit -> {'active', 'status', 'sub_state', 'load_state', 'unit'}; cached for `ttl` seconds"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._status is not None and now - self._fetched_at < self.ttl:
+                self.stats['cache_hits'] += 1
+                return self._status
+
+            try:
+                self._status = self._query()
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"Error querying systemd units: {e}")
+                self._status = {
+                    unit: {'active': False, 'status': 'unknown', 'sub_state': 'unknown',
+                           'load_state': 'unknown', 'unit': unit}
+                    for unit in self.units
+                }
+            self._fetched_at = now
+            return self._status
+
+    def failed_units(self) -> List[str]:
+        """Watched units whose ActiveState is 'failed'"""
+        return [unit for unit, info in self.get_status().items() if info['status'] == 'failed']
+
+_service_monitor: Optional[ServiceStatusMonitor] = None
+_service_monitor_lock = threading.Lock()
+
+def get_service_monitor() -> ServiceStatusMonitor:
+    """Get the process-wide service status monitor (one cached `systemctl show` per TTL)"""
+    global _service_monitor
+
+    if _service_monitor is None:
+        with _service_monitor_lock:
+            if _service_monitor is None:
+                _service_monitor = ServiceStatusMonitor()
+
+    return _service_monitor
@@ -2,7 +2,6 @@
 Utility classes for the Expert Remediation Engine
 """
 
-import subprocess
 import shlex
 import psutil
 import os
@@ -11,7 +10,13 @@ import platform
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 import re
-import json
+
+from .cluster_cache import get_cluster_cache
+from .k8s_client import get_k8s_client_factory
+from .metrics_sampler import get_metrics_sampler, read_disk_usage, read_network_status, read_resource_usage
+from .metrics_store import get_metrics_store
+from .process_sampler import get_process_sampler
+from .service_status import get_service_monitor
 
 def log_message(message: str) -> None:
     """Logs a message to the console."""
@@ -210,10 +215,32 @@ class SafetyValidator:
 class SystemMonitor:
     """
     Monitors system health and provides real-time metrics
+    
+    Resource, disk and network figures come from the shared background MetricsSampler
+    (METRICS_SAMPLER=0 falls back to direct, non-blocking reads); its samples are also
+    persisted in the MetricsStore time series.
     """
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.k8s_clients = get_k8s_client_factory()
+        self.sampler = get_metrics_sampler()
+        if self.sampler is None:
+            # Prime the CPU counters for non-blocking cpu_percent() reads
+            psutil.cpu_percent(interval=None)
+        else:
+            # Persist the sampler's readings for trend analysis and forecasting
+            get_metrics_store()
+        # Process-wide: one primed process table and one cached systemctl query shared by every SystemMonitor
+        self.process_sampler = get_process_sampler()
+        self.service_monitor = get_service_monitor()
+    
+    def _latest_sample(self) -> Dict[str, Any]:
+        return (self.sampler.snapshot() if self.sampler else None) or {}
+    
+    def get_metric_rates(self, seconds: float = 60) -> Dict[str, Any]:
+        """Network rates and CPU/memory averages over the sampler's recent history"""
+        return self.sampler.rates(seconds) if self.sampler else {}
     
     def get_comprehensive_status(self) -> Dict[str, Any]:
         """Get comprehensive system status"""
@@ -249,19 +276,12 @@ class SystemMonitor:
     def _get_resource_usage(self) -> Dict[str, Any]:
         """Get resource usage information"""
         try:
-            memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=1)
+            sample = self._latest_sample()
+            if sample:
+                return dict(sample['resource_usage'])
             
-            return {
-                'cpu_percent': cpu_percent,
-                'memory_total_gb': round(memory.total / (1024**3), 2),
-                'memory_used_gb': round(memory.used / (1024**3), 2),
-                'memory_percent': memory.percent,
-                'memory_available_gb': round(memory.available / (1024**3), 2),
-                'swap_total_gb': round(psutil.swap_memory().total / (1024**3), 2),
-                'swap_used_gb': round(psutil.swap_memory().used / (1024**3), 2),
-                'swap_percent': psutil.swap_memory().percent
-            }
+            # CPU since the previous call; never sleeps
+            return read_resource_usage(psutil.cpu_percent(interval=None))
         except Exception as e:
             self.logger.error(f"Error getting resource usage: {e}")
             return {}
@@ -269,46 +289,28 @@ class SystemMonitor:
     def _get_disk_usage(self) -> Dict[str, Any]:
         """Get disk usage information"""
         try:
-            disk_usage = {}
-            partitions = psutil.disk_partitions()
+            sample = self._latest_sample()
+            if sample:
+                return dict(sample['disk_usage'])
             
-            for partition in partitions:
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    disk_usage[partition.mountpoint] = {
-                        'device': partition.device,
-                        'fstype': partition.fstype,
-                        'total_gb': round(usage.total / (1024**3), 2),
-                        'used_gb': round(usage.used / (1024**3), 2),
-                        'free_gb': round(usage.free / (1024**3), 2),
-                        'percent': round((usage.used / usage.total) * 100, 2)
-                    }
-                except PermissionError:
-                    continue
-            
-            return disk_usage
+            return read_disk_usage()
             
         except Exception as e:
             self.logger.error(f"Error getting disk usage: {e}")
             return {}
     
     def _get_network_status(self) -> Dict[str, Any]:
-        """Get network status information"""
+        """Get network status information (counters plus per-second rates once history exists)"""
         try:
-            network_info = {}
-            network_stats = psutil.net_io_counters(pernic=True)
-            
-            for interface, stats in network_stats.items():
-                network_info[interface] = {
-                    'bytes_sent': stats.bytes_sent,
-                    'bytes_recv': stats.bytes_recv,
-                    'packets_sent': stats.packets_sent,
-                    'packets_recv': stats.packets_recv,
-                    'errors_in': stats.errin,
-                    'errors_out': stats.errout
-                }
+            sample = self._latest_sample()
+            if not sample:
+                return read_network_status()
             
-            return network_info
+            rates = self.get_metric_rates().get('network', {})
+            return {
+                interface: dict(counters, **rates.get(interface, {}))
+                for interface, counters in sample['network_status'].items()
+            }
             
         except Exception as e:
             self.logger.error(f"Error getting network status: {e}")
@@ -317,23 +319,7 @@ class SystemMonitor:
     def _get_process_info(self) -> Dict[str, Any]:
         """Get process information"""
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    processes.append(proc.info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort by CPU usage and get top 10
-            top_cpu = sorted(processes, key=lambda x: x.get('cpu_percent', 0), reverse=True)[:10]
-            # Sort by memory usage and get top 10
-            top_memory = sorted(processes, key=lambda x: x.get('memory_percent', 0), reverse=True)[:10]
-            
-            return {
-                'total_processes': len(processes),
-                'top_cpu_processes': top_cpu,
-                'top_memory_processes': top_memory
-            }
+            return self.process_sampler.sample()
             
         except Exception as e:
             self.logger.error(f"Error getting process info: {e}")
@@ -342,23 +328,18 @@ class SystemMonitor:
     def _get_kubernetes_status(self) -> Dict[str, Any]:
         """Get Kubernetes cluster status if available"""
         try:
-            # Check if kubectl is available
-            result = subprocess.run(['which', 'kubectl'], capture_output=True, text=True)
-            if result.returncode != 0:
-                return {'available': False, 'reason': 'kubectl not found'}
+            # Use the shared, pooled API client instead of spawning kubectl
+            if not self.k8s_clients.is_available():
+                return {'available': False, 'reason': 'Kubernetes configuration not found'}
             
-            # Get cluster info
-            cluster_info = subprocess.run(['kubectl', 'cluster-info'], capture_output=True, text=True, timeout=10)
-            if cluster_info.returncode != 0:
-                return {'available': False, 'reason': 'Cannot connect to cluster'}
+            # Counters kept current by the informers' watch events: no LIST, no decode
+            cache = get_cluster_cache()
+            counts = cache.status_counts() if cache else None
+            if counts is not None:
+                return dict({'available': True, 'cluster_accessible': True}, **counts)
             
-            # Get nodes
-            nodes_result = subprocess.run(['kubectl', 'get', 'nodes', '-o', 'json'], 
-                                        capture_output=True, text=True, timeout=10)
-            
-            # Get pods
-            pods_result = subprocess.run(['kubectl', 'get', 'pods', '--all-namespaces', '-o', 'json'], 
-                                       capture_output=True, text=True, timeout=10)
+            # Cache disabled or still syncing: one LIST of each
+            v1 = self.k8s_clients.core_v1
             
             k8s_status = {
                 'available': True,
@@ -369,61 +350,32 @@ class SystemMonitor:
                 'pending_pods': 0
             }
             
-            # Parse nodes info
-            if nodes_result.returncode == 0:
-                try:
-                    nodes_data = json.loads(nodes_result.stdout)
-                    k8s_status['nodes_count'] = len(nodes_data.get('items', []))
-                except json.JSONDecodeError:
-                    pass
+            # Get nodes
+            nodes = v1.list_node(_request_timeout=10)
+            k8s_status['nodes_count'] = len(nodes.items)
+            
+            # Get pods
+            pods = v1.list_pod_for_all_namespaces(_request_timeout=10)
+            k8s_status['pods_count'] = len(pods.items)
             
-            # Parse pods info
-            if pods_result.returncode == 0:
-                try:
-                    pods_data = json.loads(pods_result.stdout)
-                    pods = pods_data.get('items', [])
-                    k8s_status['pods_count'] = len(pods)
-                    
-                    for pod in pods:
-                        status = pod.get('status', {}).get('phase', '')
-                        if status in ['Failed', 'Error']:
-                            k8s_status['failed_pods'] += 1
-                        elif status == 'Pending':
-                            k8s_status['pending_pods'] += 1
-                            
-                except json.JSONDecodeError:
-                    pass
+            for pod in pods.items:
+                status = pod.status.phase if pod.status else ''
+                if status in ['Failed', 'Error']:
+                    k8s_status['failed_pods'] += 1
+                elif status == 'Pending':
+                    k8s_status['pending_pods'] += 1
             
             return k8s_status
             
-        except subprocess.TimeoutExpired:
-            return {'available': True, 'reason': 'Timeout connecting to cluster'}
         except Exception as e:
             self.logger.error(f"Error getting Kubernetes status: {e}")
-            return {'available': False, 'reason': str(e)}
+            return {'available': False, 'reason': f'Cannot connect to cluster: {e}'}
     
     def _get_services_status(self) -> Dict[str, Any]:
         """Get system services status"""
         try:
-            # Check critical services
-            critical_services = ['ssh', 'networking', 'systemd-resolved']
-            services_status = {}
-            
-            for service in critical_services:
-                try:
-                    result = subprocess.run(['systemctl', 'is-active', service], 
-                                          capture_output=True, text=True, timeout=5)
-                    services_status[service] = {
-                        'active': result.stdout.strip() == 'active',
-                        'status': result.stdout.strip()
-                    }
-                except Exception:
-                    services_status[service] = {
-                        'active': False,
-                        'status': 'unknown'
-                    }
-            
-            return services_status
+            # One batched `systemctl show` for every watched unit, cached for a few seconds
+            return self.service_monitor.get_status()
             
         except Exception as e:
             self.logger.error(f"Error getting services status: {e}")
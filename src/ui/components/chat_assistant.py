@@ -3,7 +3,9 @@ Chat Assistant Component - Interactive conversational interface for expert syste
 """
 
 import streamlit as st
+import asyncio
 import logging
+import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import json
@@ -99,12 +101,15 @@ class ChatAssistant:
         
         show_technical_details = st.checkbox("Show Technical Details", value=False)
         enable_auto_actions = st.checkbox("Enable Auto Actions", value=False)
+        stream_responses = st.checkbox("Stream Responses", value=True,
+                                       help="Show the analysis while the model is still generating")
         confidence_threshold = st.slider("Confidence Threshold", 0.0, 1.0, 0.7, 0.1)
         
         # Store settings in session state
         st.session_state.chat_settings = {
             'show_technical_details': show_technical_details,
             'enable_auto_actions': enable_auto_actions,
+            'stream_responses': stream_responses,
             'confidence_threshold': confidence_threshold
         }
         
@@ -196,9 +201,19 @@ class ChatAssistant:
             }
             st.session_state.chat_history.append(user_message)
             
-            # Process query with RAG agent
-            with st.spinner("🤔 Analyzing your query..."):
-                response = self.rag_agent.expert_query(user_input)
+            # kubectl listings typed directly into the chat are rendered while they stream in
+            if user_input.strip().lower().startswith('kubectl get') and hasattr(self.rag_agent, 'stream_command'):
+                response = self._stream_kubectl_output(user_input.strip())
+            elif (st.session_state.get('chat_settings', {}).get('stream_responses', True) and
+                  hasattr(self.rag_agent, 'expert_query_stream')):
+                response = self._stream_expert_response(user_input)
+            else:
+                # Process query with RAG agent (async path gathers context concurrently with per-stage timeouts)
+                with st.spinner("🤔 Analyzing your query..."):
+                    if hasattr(self.rag_agent, 'expert_query_async'):
+                        response = asyncio.run(self.rag_agent.expert_query_async(user_input))
+                    else:
+                        response = self.rag_agent.expert_query(user_input)
             
             # Add assistant response to history
             assistant_message = {
@@ -231,6 +246,70 @@ class ChatAssistant:
             st.session_state.processing = False
             st.rerun()
 
+    def _stream_expert_response(self, user_input: str) -> Dict[str, Any]:
+        """Render the expert response live while the LLM streams it and return the final response"""
+        response = {}
+        
+        with st.chat_message("assistant"):
+            st.write(f"**Expert Assistant** _{datetime.now().strftime('%H:%M:%S')}_")
+            analysis_placeholder = st.empty()
+            recommendations_placeholder = st.empty()
+            status_placeholder = st.empty()
+            status_placeholder.caption("🤔 Gathering system context...")
+            
+            for event in self.rag_agent.expert_query_stream(user_input):
+                if event['type'] == 'token':
+                    if event['field'] == 'analysis' and event['partial']:
+                        analysis_placeholder.markdown(f"**Analysis:** {event['partial']}▌")
+                    status_placeholder.caption(f"✍️ Writing {event['field'] or 'response'}...")
+                
+                elif event['type'] == 'field':
+                    if event['key'] == 'analysis':
+                        analysis_placeholder.markdown(f"**Analysis:** {event['value']}")
+                    elif event['key'] == 'recommendations' and isinstance(event['value'], list):
+                        recommendations_placeholder.markdown(
+                            "**Recommendations:**\n" +
+                            '\n'.join(f"{i}. {rec}" for i, rec in enumerate(event['value'], 1))
+                        )
+                
+                elif event['type'] == 'done':
+                    response = event['response']
+            
+            status_placeholder.empty()
+        
+        return response
+
+    def _stream_kubectl_output(self, command: str, refresh_interval: float = 0.3) -> Dict[str, Any]:
+        """Render kubectl output progressively in the chat and return it as a response"""
+        rows = []
+        
+        with st.chat_message("assistant"):
+            st.write("**Live System Data:**")
+            placeholder = st.empty()
+            last_render = 0.0
+            
+            for row in self.rag_agent.stream_command(command):
+                rows.append(row)
+                # Throttle redraws so long tables do not re-render on every row
+                if time.monotonic() - last_render >= refresh_interval:
+                    placeholder.code('\n'.join(rows) + '\n...', language='bash')
+                    last_render = time.monotonic()
+            
+            result = '\n'.join(rows)
+            placeholder.code(result, language='bash')
+        
+        failed = not rows or rows[0].startswith(('Error', 'Command rejected'))
+        return {
+            'response': f"Executed `{command}` ({max(len(rows) - 1, 0)} rows)",
+            'command_output': result,
+            'kubectl_result': result,
+            'executed_command': command,
+            # Same follow-ups as the non-streamed kubectl path, so auto actions have something to run
+            'next_steps': self.rag_agent._generate_kubectl_next_steps({'type': 'get'}, result),
+            'confidence_level': 'low' if failed else 'high',
+            'intent': 'kubectl_command'
+        }
+
     def _quick_action(self, action_type: str):
         """Handle quick action buttons"""
         try:
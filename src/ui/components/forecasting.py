@@ -1,62 +1,154 @@
-from typing import List, Dict
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from agent.metrics_store import get_metrics_store
+
+# Dashboard resource -> metric in the metrics store
+RESOURCE_METRICS = {
+    "CPU": "cpu_percent",
+    "Memory": "memory_percent",
+    "Storage": "disk_percent",
+    "Network": "network_bytes_per_sec"
+}
+
+PERCENT_METRICS = ("cpu_percent", "memory_percent", "disk_percent")
+
+DAY = 86400
 
 class ForecastingComponent:
-    def __init__(self, history_manager=None):
+    def __init__(self, history_manager=None, metrics_store=None):
         self.forecast_data = []
         self.history_manager = history_manager
+        self.metrics_store = metrics_store
+
+    def _store(self):
+        if self.metrics_store is None:
+            self.metrics_store = get_metrics_store()
+        return self.metrics_store
 
-    def generate_forecast(self, resource_type: str, period: int) -> Dict[str, List[float]]:
-        # Placeholder for generating forecast data based on resource type and period
-        # In a real implementation, this would involve complex calculations and data analysis
+    def load_history(self, resource_type: str, days: int = 30, bucket_seconds: int = 3600) -> Dict[str, np.ndarray]:
+        """Hourly min/max/avg of a resource over the last `days` days from the metrics store"""
+        store = self._store()
+        metric = RESOURCE_METRICS.get(resource_type, resource_type)
+        if store is None:
+            return {'timestamp': np.empty(0, dtype=np.int64), 'min': np.empty(0), 'max': np.empty(0),
+                    'avg': np.empty(0), 'count': np.empty(0, dtype=np.int64)}
+        return store.downsample(metric, bucket_seconds, start=time.time() - days * DAY)
+
+    def generate_forecast(self, resource_type: str, period: int) -> Dict[str, Any]:
+        """Daily usage for the next `period` days from a linear fit over the stored hourly averages"""
+        metric = RESOURCE_METRICS.get(resource_type, resource_type)
+        history = self.load_history(resource_type)
         forecast = {
             "resource_type": resource_type,
             "period": period,
-            "usage": [0.0] * period  # Dummy data for usage over the forecast period
+            "usage": [],
+            "history_points": int(len(history['avg']))
         }
+
+        if len(history['avg']) < 2:
+            forecast["status"] = "insufficient_data"
+            return forecast
+
+        days = (history['timestamp'] - history['timestamp'][-1]) / DAY
+        slope, intercept = np.polyfit(days, history['avg'], 1)
+        projected = intercept + slope * np.arange(1, period + 1)
+        upper = 100.0 if metric in PERCENT_METRICS else None
+        projected = np.clip(projected, 0.0, upper)
+
+        forecast.update({
+            "status": "ok",
+            "usage": [round(float(value), 2) for value in projected],
+            "current": round(float(history['avg'][-1]), 2),
+            "peak": round(float(history['max'].max()), 2),
+            "daily_change": round(float(slope), 3),
+            "history_days": round(float(-days[0]), 1)
+        })
+        if metric in PERCENT_METRICS and slope > 0 and intercept < 90:
+            forecast["days_to_90_percent"] = round(float((90 - intercept) / slope), 1)
+
+        self.forecast_data.append(forecast)
         return forecast
 
     def analyze_trends(self, historical_data: List[float]) -> str:
-        # Placeholder for analyzing trends based on historical data
-        # In a real implementation, this would involve statistical analysis
+        """Direction of a least-squares line through the data, relative to the data's mean"""
         if not historical_data:
             return "No historical data available for analysis."
-        
-        trend = "Stable"  # Dummy trend analysis result
-        return f"Trend analysis indicates a {trend} trend based on historical data."
+        if len(historical_data) < 2:
+            return "Not enough historical data for trend analysis."
+
+        values = np.asarray(historical_data, dtype=np.float64)
+        slope = np.polyfit(np.arange(len(values)), values, 1)[0]
+        change = slope * (len(values) - 1)
+        scale = max(abs(values.mean()), 1e-9)
+
+        if change > 0.1 * scale:
+            trend = "Increasing"
+        elif change < -0.1 * scale:
+            trend = "Decreasing"
+        else:
+            trend = "Stable"
+        return (f"Trend analysis: {trend} trend based on historical data "
+                f"({change / scale * 100:+.1f}% over {len(values)} points).")
 
     def get_forecast_summary(self) -> str:
-        # Placeholder for summarizing the forecast data
-        return "Forecast summary: Data not yet generated."
-    
+        if not self.forecast_data:
+            return "Forecast summary: Data not yet generated."
+
+        forecast = self.forecast_data[-1]
+        unit = "%" if RESOURCE_METRICS.get(forecast['resource_type']) in PERCENT_METRICS else " B/s"
+        summary = (f"Forecast summary: {forecast['resource_type']} is at {forecast['current']}{unit} "
+                   f"(peak {forecast['peak']}{unit} over {forecast['history_days']} days), changing "
+                   f"{forecast['daily_change']:+}{unit} per day; projected {forecast['usage'][-1]}{unit} "
+                   f"in {forecast['period']} days.")
+        if 'days_to_90_percent' in forecast:
+            summary += f" At this rate it reaches 90% in about {forecast['days_to_90_percent']} days."
+        return summary
+
     def render(self):
         """Render the forecasting component UI"""
         import streamlit as st
-        
+        import pandas as pd
+
         st.header("📊 System Resource Forecasting")
         st.write("Predict future resource usage and capacity planning.")
-        
+
         # Resource type selection
         resource_type = st.selectbox(
             "Select Resource Type:",
             ["CPU", "Memory", "Storage", "Network"]
         )
-        
+
         # Forecast period
         period = st.slider("Forecast Period (days):", 1, 30, 7)
-        
+
         if st.button("Generate Forecast"):
             forecast = self.generate_forecast(resource_type, period)
-            st.success(f"Generated {period}-day forecast for {resource_type}")
-            
-            # Display forecast data
-            st.subheader("Forecast Results")
-            st.json(forecast)
-            
-            # Display trend analysis
-            historical_data = [0.5, 0.6, 0.7, 0.6, 0.8]  # Sample data
-            trend_analysis = self.analyze_trends(historical_data)
-            st.info(trend_analysis)
-            
+            if forecast.get("status") != "ok":
+                st.warning(f"Not enough recorded {resource_type} history yet "
+                           f"({forecast['history_points']} hourly points); metrics are recorded while the system runs.")
+            else:
+                st.success(f"Generated {period}-day forecast for {resource_type}")
+
+                # Recorded history (hourly buckets)
+                history = self.load_history(resource_type)
+                st.subheader("Recorded Usage (hourly)")
+                st.line_chart(pd.DataFrame(
+                    {'avg': history['avg'], 'max': history['max']},
+                    index=pd.to_datetime(history['timestamp'], unit='s')
+                ))
+
+                # Display forecast data
+                st.subheader("Forecast Results")
+                st.line_chart(pd.DataFrame({'forecast': forecast['usage']}, index=range(1, period + 1)))
+                st.json(forecast)
+
+                # Display trend analysis over the last week of hourly averages
+                trend_analysis = self.analyze_trends(history['avg'][-7 * 24:].tolist())
+                st.info(trend_analysis)
+
         # Display summary
         st.subheader("Forecast Summary")
-        st.write(self.get_forecast_summary())
\ No newline at end of file
+        st.write(self.get_forecast_summary())
@@ -1,4 +1,5 @@
 import streamlit as st
+import time
 from datetime import datetime
 
 class ManualRemediationComponent:
@@ -34,6 +35,28 @@ class ManualRemediationComponent:
         else:
             raise ValueError("Invalid action name")
     
+    def _stream_command_output(self, command, language='bash', refresh_interval=0.3):
+        """Render command output progressively as rows arrive and return the full output"""
+        if not hasattr(self.rag_agent, 'stream_command'):
+            result = self.rag_agent._execute_safe_command(command)
+            st.code(result, language=language)
+            return result
+        
+        placeholder = st.empty()
+        rows = []
+        last_render = 0.0
+        
+        for row in self.rag_agent.stream_command(command):
+            rows.append(row)
+            # Throttle redraws so long tables do not re-render on every row
+            if time.monotonic() - last_render >= refresh_interval:
+                placeholder.code('\n'.join(rows) + '\n...', language=language)
+                last_render = time.monotonic()
+        
+        result = '\n'.join(rows)
+        placeholder.code(result, language=language)
+        return result
+    
     def render(self):
         """Render the manual remediation component UI"""
         import streamlit as st
@@ -104,18 +127,15 @@ class ManualRemediationComponent:
             st.markdown("**📊 Quick Views**")
             if st.button("All Pods Status", key="all_pods"):
                 if self.rag_agent:
-                    result = self.rag_agent._execute_safe_command("kubectl get pods --all-namespaces")
-                    st.code(result, language='bash')
+                    self._stream_command_output("kubectl get pods --all-namespaces")
             
             if st.button("All Services", key="all_services"):
                 if self.rag_agent:
-                    result = self.rag_agent._execute_safe_command("kubectl get services --all-namespaces")
-                    st.code(result, language='bash')
+                    self._stream_command_output("kubectl get services --all-namespaces")
                     
             if st.button("Cluster Nodes", key="all_nodes"):
                 if self.rag_agent:
-                    result = self.rag_agent._execute_safe_command("kubectl get nodes")
-                    st.code(result, language='bash')
+                    self._stream_command_output("kubectl get nodes")
         
         with col4:
             st.markdown("**🔍 Pod Analysis**")
@@ -246,7 +266,12 @@ class ManualRemediationComponent:
                                     error_pattern = processed_command[8:].strip()
                                     processed_command = f"analyze {error_pattern}"
                             
-                            result = self.rag_agent._execute_safe_command(processed_command)
+                            # kubectl get listings are rendered row by row while they stream in
+                            streamed = processed_command.lower().startswith('kubectl get')
+                            if streamed:
+                                result = self._stream_command_output(processed_command)
+                            else:
+                                result = self.rag_agent._execute_safe_command(processed_command)
                         
                         # Enhanced result display with better formatting
                         if result:
@@ -273,6 +298,7 @@ kubectl get ingress [--all-namespaces]
 kubectl get pv
 kubectl get pvc [--all-namespaces]
 kubectl get all [--all-namespaces]
+kubectl get pods -l app=web --field-selector status.phase!=Running
 
 # Detailed Analysis
 kubectl describe pod <name> [-n <namespace>]
@@ -298,7 +324,9 @@ analyze '<any-error-message>'
                                 formatted_result = result
                                 
                                 # Add syntax highlighting for specific types
-                                if "NAMESPACE" in result and "NAME" in result:
+                                if streamed:
+                                    pass  # Already rendered progressively above
+                                elif "NAMESPACE" in result and "NAME" in result:
                                     # This looks like kubectl get output
                                     st.code(formatted_result, language='bash')
                                 elif "=== ROOT CAUSE ANALYSIS ===" in result:
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from agent.enhanced_rag_agent import EnhancedRAGAgent
 from agent.expert_remediation_engine import ExpertRemediationEngine
 from agent.issue_history_manager import IssueHistoryManager
+from agent.k8s_client import get_k8s_client_factory
 from ui.components.chat_assistant import ChatAssistant
 from ui.components.logs_issues import LogsIssuesComponent
 from ui.components.forecasting import ForecastingComponent
@@ -47,7 +48,7 @@ class ExpertSystemDashboard:
         try:
             self.rag_agent = EnhancedRAGAgent()
             self.remediation_engine = ExpertRemediationEngine()
-            self.history_manager = IssueHistoryManager()
+            self.history_manager = IssueHistoryManager.shared()
             
             # Initialize UI components
             self.chat_assistant = ChatAssistant(self.rag_agent)
@@ -153,38 +154,20 @@ class ExpertSystemDashboard:
                     )
                 
                 with col3:
-                    # Kubernetes status if available
-                    import os
+                    # Kubernetes status if available (shared, pooled API client)
                     k8s_available = False
                     error_msg = ""
                     
                     try:
-                        # First check if we're running in a Kubernetes pod
-                        if os.path.exists('/var/run/secrets/kubernetes.io/serviceaccount/token'):
-                            # We're in a pod, try to use the Kubernetes API
-                            from kubernetes import client, config
-                            config.load_incluster_config()
-                            v1 = client.CoreV1Api()
-                            
-                            # Try to list pods in our namespace
-                            pods = v1.list_namespaced_pod(namespace='expert-llm-system')
-                            running_pods = sum(1 for pod in pods.items if pod.status.phase == 'Running')
-                            
-                            st.success(f"🚀 K8s Pods Running: {running_pods}")
-                            k8s_available = True
-                        else:
-                            # Not in a pod, try local kubectl config
-                            try:
-                                from kubernetes import client, config
-                                config.load_kube_config()
-                                v1 = client.CoreV1Api()
-                                pods = v1.list_namespaced_pod(namespace='expert-llm-system')
-                                running_pods = sum(1 for pod in pods.items if pod.status.phase == 'Running')
-                                st.success(f"🚀 K8s Pods Running: {running_pods}")
-                                k8s_available = True
-                            except:
-                                error_msg = "Local kubeconfig not accessible"
-                                
+                        v1 = get_k8s_client_factory().core_v1
+                        
+                        # Try to list pods in our namespace
+                        pods = v1.list_namespaced_pod(namespace='expert-llm-system')
+                        running_pods = sum(1 for pod in pods.items if pod.status.phase == 'Running')
+                        
+                        st.success(f"🚀 K8s Pods Running: {running_pods}")
+                        k8s_available = True
+
                     except Exception as e:
                         error_msg = str(e)
                     